@@ -79,6 +79,11 @@ from app.modules.intake import models as intake_models  # noqa: F401,E402
 from app.modules.lawyer_profiles import models as lawyer_profile_models  # noqa: F401,E402
 from app.modules.audit_log import models as audit_log_models  # noqa: F401,E402
 from app.modules.queue import models as queue_models  # noqa: F401,E402
+from app.modules.storage import models as storage_models  # noqa: F401,E402
+from app.modules.metrics import models as metrics_models  # noqa: F401,E402
+from app.modules.lawyer_dashboard import models as lawyer_dashboard_models  # noqa: F401,E402
+from app.modules.matching import models as matching_models  # noqa: F401,E402
+from app.modules.notifications import models as notification_models  # noqa: F401,E402
 
 target_metadata = Base.metadata
 
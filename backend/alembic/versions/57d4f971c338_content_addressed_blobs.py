@@ -0,0 +1,71 @@
+"""storage_blobs and blob references from documents / case_documents
+
+Revision ID: 57d4f971c338
+Revises: e460a4c7bad9
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "57d4f971c338"
+down_revision: Union[str, None] = "e460a4c7bad9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing uploads keep their own files (blob_sha256 NULL) and are deleted
+# the old way; only new uploads go through the blob store.
+REFERENCING_TABLES = ("documents", "case_documents")
+
+
+def _column_exists(bind, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(bind).get_columns(table))
+
+
+def _index_exists(bind, table: str, index: str) -> bool:
+    return any(i["name"] == index for i in inspect(bind).get_indexes(table))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    tables = inspect(bind).get_table_names()
+
+    if "storage_blobs" not in tables:
+        op.create_table(
+            "storage_blobs",
+            sa.Column("sha256", sa.String(length=64), nullable=False),
+            sa.Column("path", sa.String(length=500), nullable=False),
+            sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+            sa.Column("ref_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+            sa.PrimaryKeyConstraint("sha256"),
+        )
+
+    for table in REFERENCING_TABLES:
+        if table not in tables:
+            continue
+        if not _column_exists(bind, table, "blob_sha256"):
+            op.add_column(table, sa.Column("blob_sha256", sa.String(length=64), nullable=True))
+            op.create_foreign_key(
+                f"fk_{table}_blob_sha256", table, "storage_blobs", ["blob_sha256"], ["sha256"]
+            )
+        if not _index_exists(bind, table, f"ix_{table}_blob_sha256"):
+            op.create_index(f"ix_{table}_blob_sha256", table, ["blob_sha256"])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    tables = inspect(bind).get_table_names()
+
+    for table in REFERENCING_TABLES:
+        if table in tables and _column_exists(bind, table, "blob_sha256"):
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_blob_sha256")
+            op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS fk_{table}_blob_sha256")
+            op.drop_column(table, "blob_sha256")
+
+    op.execute("DROP TABLE IF EXISTS storage_blobs")
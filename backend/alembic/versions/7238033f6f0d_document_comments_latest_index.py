@@ -0,0 +1,31 @@
+"""composite index document_comments(document_id, created_at DESC)
+
+Revision ID: 7238033f6f0d
+Revises: d772d2c2bd64
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7238033f6f0d"
+down_revision: Union[str, None] = "d772d2c2bd64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if "document_comments" not in inspect(op.get_bind()).get_table_names():
+        return
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_document_comments_document_id_created_at "
+        "ON document_comments (document_id, created_at DESC)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_document_comments_document_id_created_at")
@@ -0,0 +1,44 @@
+"""indexes for the lawyer case feed
+
+(status, created_at, id) for the newest-first open-case page, and pg_trgm
+GIN indexes for the district/category substring filters.
+
+Revision ID: a2c4e6f8b0d1
+Revises: f0b2d4e6a8c9
+Create Date: 2026-10-20 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a2c4e6f8b0d1"
+down_revision: Union[str, None] = "f0b2d4e6a8c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if "cases" not in inspect(bind).get_table_names():
+        return
+    if bind.execute(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).scalar() is None:
+        raise RuntimeError(
+            "the case feed needs the pg_trgm extension for its district/category indexes; "
+            "install the PostgreSQL contrib package (postgres:15 ships it) and rerun the upgrade"
+        )
+
+    op.execute("CREATE INDEX IF NOT EXISTS ix_cases_status_created_at ON cases (status, created_at, id)")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in ("district", "category"):
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_cases_{column}_trgm ON cases USING gin ({column} gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_cases_category_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_cases_district_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_cases_status_created_at")
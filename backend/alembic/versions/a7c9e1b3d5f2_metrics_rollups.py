@@ -0,0 +1,153 @@
+"""metrics rollups: event triggers, hourly/daily/total tables, backfill
+
+Revision ID: a7c9e1b3d5f2
+Revises: f1a3c5e7b9d0
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c9e1b3d5f2"
+down_revision: Union[str, None] = "f1a3c5e7b9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# TG_ARGV: gauge metric, created metric, whether the created metric is split
+# by the column value, transition metric ('' for none), tracked column.
+TRACK_FUNCTION = """
+CREATE OR REPLACE FUNCTION metrics_track() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    gauge text := TG_ARGV[0];
+    created text := TG_ARGV[1];
+    created_split boolean := TG_ARGV[2]::boolean;
+    transitions text := NULLIF(TG_ARGV[3], '');
+    col text := TG_ARGV[4];
+    old_value text;
+    new_value text;
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        old_value := lower(coalesce(to_jsonb(OLD) ->> col, ''));
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        new_value := lower(coalesce(to_jsonb(NEW) ->> col, ''));
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO metric_events (metric, dimension, delta) VALUES
+            (gauge, new_value, 1),
+            (created, CASE WHEN created_split THEN new_value ELSE '' END, 1);
+    ELSIF TG_OP = 'UPDATE' THEN
+        IF old_value IS DISTINCT FROM new_value THEN
+            INSERT INTO metric_events (metric, dimension, delta) VALUES
+                (gauge, old_value, -1),
+                (gauge, new_value, 1);
+            IF transitions IS NOT NULL THEN
+                INSERT INTO metric_events (metric, dimension, delta) VALUES (transitions, new_value, 1);
+            END IF;
+        END IF;
+    ELSE
+        INSERT INTO metric_events (metric, dimension, delta) VALUES (gauge, old_value, -1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+# table -> (gauge, created, created split by value, transitions, column, created_at column)
+TRACKED = {
+    "users": ("users", "signups", True, "", "role", "created_at"),
+    "bookings": ("bookings", "bookings_created", False, "booking_transitions", "status", "created_at"),
+    "disputes": ("disputes", "disputes_opened", False, "dispute_transitions", "status", "created_at"),
+    "kyc_submissions": ("kyc", "kyc_submitted", False, "kyc_transitions", "status", "submitted_at"),
+}
+
+
+def _trigger_name(table: str) -> str:
+    return f"trg_{table}_metrics"
+
+
+def upgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+
+    if "metric_events" not in tables:
+        op.create_table(
+            "metric_events",
+            sa.Column("id", sa.BigInteger(), primary_key=True),
+            sa.Column("occurred_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+            sa.Column("metric", sa.String(length=40), nullable=False),
+            sa.Column("dimension", sa.String(length=40), server_default="", nullable=False),
+            sa.Column("delta", sa.Integer(), nullable=False),
+        )
+    for name in ("metric_rollups_hourly", "metric_rollups_daily"):
+        if name not in tables:
+            op.create_table(
+                name,
+                sa.Column("metric", sa.String(length=40), nullable=False),
+                sa.Column("dimension", sa.String(length=40), nullable=False),
+                sa.Column("bucket", sa.DateTime(timezone=True), nullable=False),
+                sa.Column("value", sa.BigInteger(), nullable=False),
+                sa.PrimaryKeyConstraint("metric", "dimension", "bucket"),
+            )
+    if "metric_totals" not in tables:
+        op.create_table(
+            "metric_totals",
+            sa.Column("metric", sa.String(length=40), nullable=False),
+            sa.Column("dimension", sa.String(length=40), nullable=False),
+            sa.Column("value", sa.BigInteger(), nullable=False),
+            sa.PrimaryKeyConstraint("metric", "dimension"),
+        )
+
+    op.execute(TRACK_FUNCTION)
+    for table, (gauge, created, split, transitions, column, created_at) in TRACKED.items():
+        if table not in tables:
+            continue
+
+        # Lock the table so no change slips between the backfill and the trigger.
+        op.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+        op.execute(f"DROP TRIGGER IF EXISTS {_trigger_name(table)} ON {table}")
+        op.execute(
+            f"CREATE TRIGGER {_trigger_name(table)} "
+            f"AFTER INSERT OR DELETE OR UPDATE OF {column} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION metrics_track("
+            f"'{gauge}', '{created}', '{str(split).lower()}', '{transitions}', '{column}')"
+        )
+
+        # Current counts for the gauge, creation history for the flow.
+        # Past transitions are not recorded anywhere, so they start from zero.
+        value = f"lower(coalesce({column}::text, ''))"
+        created_dim = value if split else "''"
+        op.execute(f"DELETE FROM metric_totals WHERE metric IN ('{gauge}', '{created}')")
+        op.execute(
+            f"INSERT INTO metric_totals (metric, dimension, value) "
+            f"SELECT '{gauge}', {value}, count(*) FROM {table} GROUP BY 2"
+        )
+        op.execute(
+            f"INSERT INTO metric_totals (metric, dimension, value) "
+            f"SELECT '{created}', {created_dim}, count(*) FROM {table} GROUP BY 2"
+        )
+        for rollup, unit in (("metric_rollups_hourly", "hour"), ("metric_rollups_daily", "day")):
+            op.execute(f"DELETE FROM {rollup} WHERE metric = '{created}'")
+            op.execute(
+                f"INSERT INTO {rollup} (metric, dimension, bucket, value) "
+                f"SELECT '{created}', {created_dim}, date_trunc('{unit}', {created_at}, 'UTC'), count(*) "
+                f"FROM {table} WHERE {created_at} IS NOT NULL GROUP BY 2, 3"
+            )
+
+
+def downgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+    for table in TRACKED:
+        if table in tables:
+            op.execute(f"DROP TRIGGER IF EXISTS {_trigger_name(table)} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS metrics_track()")
+    for name in ("metric_totals", "metric_rollups_daily", "metric_rollups_hourly", "metric_events"):
+        if name in tables:
+            op.drop_table(name)
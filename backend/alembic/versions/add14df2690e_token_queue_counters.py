@@ -0,0 +1,49 @@
+"""token_queue_counters for atomic token allocation
+
+Revision ID: add14df2690e
+Revises: ecb995d9e2d2
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add14df2690e"
+down_revision: Union[str, None] = "ecb995d9e2d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    tables = inspect(bind).get_table_names()
+
+    if "token_queue_counters" not in tables:
+        op.create_table(
+            "token_queue_counters",
+            sa.Column("lawyer_id", sa.Integer(), nullable=False),
+            sa.Column("date", sa.Date(), nullable=False),
+            sa.Column("last_token", sa.Integer(), nullable=False, server_default=sa.text("0")),
+            sa.ForeignKeyConstraint(["lawyer_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("lawyer_id", "date"),
+        )
+
+    # Seed counters from tokens already handed out so allocation continues after them.
+    if "token_queue" in tables:
+        op.execute("""
+            INSERT INTO token_queue_counters (lawyer_id, date, last_token)
+            SELECT lawyer_id, date, max(token_number)
+            FROM token_queue
+            GROUP BY lawyer_id, date
+            ON CONFLICT (lawyer_id, date)
+            DO UPDATE SET last_token = GREATEST(token_queue_counters.last_token, EXCLUDED.last_token)
+        """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS token_queue_counters")
@@ -0,0 +1,44 @@
+"""partial indexes for the lawyer dashboard summary
+
+Revision ID: b2d4f6a8c0e1
+Revises: a7c9e1b3d5f2
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2d4f6a8c0e1"
+down_revision: Union[str, None] = "a7c9e1b3d5f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+
+    if "case_requests" in tables:
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_case_requests_lawyer_id_pending "
+            "ON case_requests (lawyer_id) WHERE lower(status) = 'pending'"
+        )
+    if "bookings" in tables:
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_bookings_lawyer_id_incoming "
+            "ON bookings (lawyer_id) WHERE lower(status) IN ('pending', 'requested')"
+        )
+    if "token_queue" in tables:
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_token_queue_lawyer_id_date_waiting "
+            "ON token_queue (lawyer_id, date) WHERE status = 'waiting'"
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_token_queue_lawyer_id_date_waiting")
+    op.execute("DROP INDEX IF EXISTS ix_bookings_lawyer_id_incoming")
+    op.execute("DROP INDEX IF EXISTS ix_case_requests_lawyer_id_pending")
@@ -0,0 +1,64 @@
+"""full-text search: blob content, document titles and comments
+
+Revision ID: b3e1f0a9c2d4
+Revises: 7238033f6f0d
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e1f0a9c2d4"
+down_revision: Union[str, None] = "7238033f6f0d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _column_exists(bind, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(bind).get_columns(table))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    tables = inspect(bind).get_table_names()
+
+    if "storage_blobs" in tables:
+        op.execute("ALTER TABLE storage_blobs ADD COLUMN IF NOT EXISTS content_tsv tsvector")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_storage_blobs_content_tsv "
+            "ON storage_blobs USING gin (content_tsv)"
+        )
+        # index what was uploaded before the extract_text job existed
+        if "storage_jobs" in tables:
+            op.execute(
+                "INSERT INTO storage_jobs (kind, blob_sha256, status, attempts) "
+                "SELECT 'extract_text', sha256, 'pending', 0 FROM storage_blobs "
+                "ON CONFLICT ON CONSTRAINT uq_storage_jobs_kind_blob DO NOTHING"
+            )
+
+    if "documents" in tables and not _column_exists(bind, "documents", "search_tsv"):
+        op.execute(
+            "ALTER TABLE documents ADD COLUMN search_tsv tsvector GENERATED ALWAYS AS "
+            "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(original_filename, ''))) STORED"
+        )
+    if "documents" in tables:
+        op.execute("CREATE INDEX IF NOT EXISTS ix_documents_search_tsv ON documents USING gin (search_tsv)")
+
+    if "document_comments" in tables:
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_document_comments_comment_tsv "
+            "ON document_comments USING gin (to_tsvector('english', comment_text))"
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_document_comments_comment_tsv")
+    op.execute("DROP INDEX IF EXISTS ix_documents_search_tsv")
+    op.execute("ALTER TABLE documents DROP COLUMN IF EXISTS search_tsv")
+    op.execute("DELETE FROM storage_jobs WHERE kind = 'extract_text'")
+    op.execute("DROP INDEX IF EXISTS ix_storage_blobs_content_tsv")
+    op.execute("ALTER TABLE storage_blobs DROP COLUMN IF EXISTS content_tsv")
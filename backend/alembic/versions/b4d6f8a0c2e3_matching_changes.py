@@ -0,0 +1,101 @@
+"""matching_changes log and triggers feeding the in-memory lawyer index
+
+Revision ID: b4d6f8a0c2e3
+Revises: a2c4e6f8b0d1
+Create Date: 2026-10-20 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4d6f8a0c2e3"
+down_revision: Union[str, None] = "a2c4e6f8b0d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# TG_ARGV: target column of matching_changes ('user_id' or 'lawyer_id'),
+# column of the changed row holding that key.
+TRACK_FUNCTION = """
+CREATE OR REPLACE FUNCTION matching_track() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    target text := TG_ARGV[0];
+    col text := TG_ARGV[1];
+    keys int[] := '{}';
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        keys := keys || (to_jsonb(OLD) ->> col)::int;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        keys := keys || (to_jsonb(NEW) ->> col)::int;
+    END IF;
+    IF target = 'user_id' THEN
+        INSERT INTO matching_changes (user_id) SELECT DISTINCT k FROM unnest(keys) k WHERE k IS NOT NULL;
+    ELSE
+        INSERT INTO matching_changes (lawyer_id) SELECT DISTINCT k FROM unnest(keys) k WHERE k IS NOT NULL;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+# table -> (target column, key column, columns an UPDATE must touch; None = any)
+TRACKED = {
+    "users": ("user_id", "id", "role, email"),
+    "lawyers": ("lawyer_id", "id", "email"),
+    "lawyer_profiles": ("user_id", "user_id", None),
+    "service_packages": ("lawyer_id", "lawyer_id", None),
+    "weekly_availability": ("lawyer_id", "lawyer_id", None),
+    "blackout_days": ("user_id", "lawyer_id", None),
+}
+
+
+def _trigger_name(table: str) -> str:
+    return f"trg_{table}_matching"
+
+
+def upgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+
+    if "matching_changes" not in tables:
+        op.create_table(
+            "matching_changes",
+            sa.Column("id", sa.BigInteger(), primary_key=True),
+            sa.Column("changed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=True),
+            sa.Column("lawyer_id", sa.Integer(), nullable=True),
+        )
+        op.create_index("ix_matching_changes_changed_at", "matching_changes", ["changed_at"])
+
+    op.execute(TRACK_FUNCTION)
+    for table, (target, key, columns) in TRACKED.items():
+        if table not in tables:
+            continue
+        update = f"UPDATE OF {columns}" if columns else "UPDATE"
+        op.execute(f"DROP TRIGGER IF EXISTS {_trigger_name(table)} ON {table}")
+        op.execute(
+            f"CREATE TRIGGER {_trigger_name(table)} "
+            f"AFTER INSERT OR DELETE OR {update} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION matching_track('{target}', '{key}')"
+        )
+
+    # per-lawyer lookups when the index loads starting prices
+    if "service_packages" in tables:
+        op.execute("CREATE INDEX IF NOT EXISTS ix_service_packages_lawyer_id ON service_packages (lawyer_id)")
+
+
+def downgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+    op.execute("DROP INDEX IF EXISTS ix_service_packages_lawyer_id")
+    for table in TRACKED:
+        if table in tables:
+            op.execute(f"DROP TRIGGER IF EXISTS {_trigger_name(table)} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS matching_track()")
+    if "matching_changes" in tables:
+        op.drop_table("matching_changes")
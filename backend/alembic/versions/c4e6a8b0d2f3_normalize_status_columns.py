@@ -0,0 +1,127 @@
+"""canonical status values for bookings, case requests and disputes
+
+Backfills each status column to its canonical casing, adds a CHECK
+constraint on the allowed values and replaces the lower(status) partial
+indexes with plain ones.
+
+Revision ID: c4e6a8b0d2f3
+Revises: b2d4f6a8c0e1
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+import logging
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e6a8b0d2f3"
+down_revision: Union[str, None] = "b2d4f6a8c0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+log = logging.getLogger("alembic")
+
+# table -> (canonicalising SQL expression, allowed values, legacy spellings)
+STATUSES = {
+    "bookings": (
+        "lower(btrim(status))",
+        ("pending", "requested", "confirmed", "rejected", "cancelled", "completed"),
+        {"canceled": "cancelled", "accepted": "confirmed", "declined": "rejected", "done": "completed"},
+    ),
+    "case_requests": (
+        "lower(btrim(status))",
+        ("pending", "approved", "rejected"),
+        {"accepted": "approved", "declined": "rejected"},
+    ),
+    "disputes": (
+        "upper(btrim(status))",
+        ("PENDING", "RESOLVED", "REJECTED"),
+        {},
+    ),
+}
+
+PARTIAL_INDEXES = {
+    "bookings": [
+        ("ix_bookings_lawyer_id_incoming", "(lawyer_id)", "status IN ('pending', 'requested')"),
+        ("ix_bookings_lawyer_id_scheduled_at_busy", "(lawyer_id, scheduled_at)", "status IN ('confirmed', 'completed')"),
+    ],
+    "case_requests": [
+        ("ix_case_requests_lawyer_id_pending", "(lawyer_id)", "status = 'pending'"),
+    ],
+    "disputes": [
+        ("ix_disputes_pending_id", "(id)", "status = 'PENDING'"),
+    ],
+}
+
+# metrics flow the row triggers bump on every status change
+TRANSITION_METRICS = {"bookings": "booking_transitions", "disputes": "dispute_transitions"}
+
+# the lower(status) versions from the dashboard summary revision
+LEGACY_INDEXES = {
+    "bookings": [("ix_bookings_lawyer_id_incoming", "(lawyer_id)", "lower(status) IN ('pending', 'requested')")],
+    "case_requests": [("ix_case_requests_lawyer_id_pending", "(lawyer_id)", "lower(status) = 'pending'")],
+}
+
+
+def _constraint_exists(bind, name: str) -> bool:
+    return bind.execute(sa.text("SELECT 1 FROM pg_constraint WHERE conname = :n"), {"n": name}).first() is not None
+
+
+def _quoted(values) -> str:
+    return ", ".join(f"'{v}'" for v in values)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    tables = inspect(bind).get_table_names()
+
+    for table, (canonical, allowed, legacy) in STATUSES.items():
+        if table not in tables:
+            continue
+
+        op.execute(f"UPDATE {table} SET status = {canonical} WHERE status IS DISTINCT FROM {canonical}")
+        for old, new in legacy.items():
+            op.execute(f"UPDATE {table} SET status = '{new}' WHERE status = '{old}'")
+        if table in TRANSITION_METRICS and "metric_events" in tables:
+            # The rewrite moves rows between gauge dimensions, which is right,
+            # but is not a real transition; drop those from this transaction.
+            op.execute(
+                f"DELETE FROM metric_events WHERE metric = '{TRANSITION_METRICS[table]}' AND occurred_at = now()"
+            )
+
+        # NOT VALID first: new writes are checked at once, and a table holding
+        # values outside the list still upgrades instead of failing the deploy.
+        name = f"ck_{table}_status"
+        if not _constraint_exists(bind, name):
+            op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} CHECK (status IN ({_quoted(allowed)})) NOT VALID")
+        unknown = bind.execute(
+            sa.text(f"SELECT DISTINCT status FROM {table} WHERE status NOT IN ({_quoted(allowed)})")
+        ).scalars().all()
+        if unknown:
+            log.warning(
+                "%s: unknown status values %s; fix them, then ALTER TABLE %s VALIDATE CONSTRAINT %s",
+                table, unknown, table, name,
+            )
+        else:
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+        for index, columns, where in PARTIAL_INDEXES[table]:
+            op.execute(f"DROP INDEX IF EXISTS {index}")
+            op.execute(f"CREATE INDEX {index} ON {table} {columns} WHERE {where}")
+
+
+def downgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+
+    for table in STATUSES:
+        if table not in tables:
+            continue
+        for index, _, _ in PARTIAL_INDEXES[table]:
+            op.execute(f"DROP INDEX IF EXISTS {index}")
+        for index, columns, where in LEGACY_INDEXES.get(table, []):
+            op.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} {columns} WHERE {where}")
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS ck_{table}_status")
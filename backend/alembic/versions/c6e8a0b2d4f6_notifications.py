@@ -0,0 +1,76 @@
+"""notification outbox and in-app notifications
+
+Revision ID: c6e8a0b2d4f6
+Revises: b4d6f8a0c2e3
+Create Date: 2026-10-21 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c6e8a0b2d4f6"
+down_revision: Union[str, None] = "b4d6f8a0c2e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+
+    if "notification_outbox" not in tables:
+        op.create_table(
+            "notification_outbox",
+            sa.Column("id", sa.BigInteger(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("channel", sa.String(length=16), nullable=False),
+            sa.Column("kind", sa.String(length=50), nullable=False),
+            sa.Column("title", sa.String(length=200), nullable=False),
+            sa.Column("body", sa.Text(), nullable=False),
+            sa.Column("data", postgresql.JSONB(), nullable=True),
+            sa.Column("status", sa.String(length=16), nullable=False, server_default="pending"),
+            sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("run_after", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        )
+        op.create_index("ix_notification_outbox_user_id", "notification_outbox", ["user_id"])
+        op.create_index(
+            "ix_notification_outbox_pending",
+            "notification_outbox",
+            ["run_after", "id"],
+            postgresql_where=sa.text("status = 'pending'"),
+        )
+
+    if "notifications" not in tables:
+        op.create_table(
+            "notifications",
+            sa.Column("id", sa.BigInteger(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("kind", sa.String(length=50), nullable=False),
+            sa.Column("title", sa.String(length=200), nullable=False),
+            sa.Column("body", sa.Text(), nullable=False),
+            sa.Column("data", postgresql.JSONB(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+            sa.Column("read_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_notifications_user_id_id", "notifications", ["user_id", "id"])
+        op.create_index(
+            "ix_notifications_user_id_unread",
+            "notifications",
+            ["user_id"],
+            postgresql_where=sa.text("read_at IS NULL"),
+        )
+
+
+def downgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+    if "notifications" in tables:
+        op.drop_table("notifications")
+    if "notification_outbox" in tables:
+        op.drop_table("notification_outbox")
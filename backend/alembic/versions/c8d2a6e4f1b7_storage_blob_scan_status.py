@@ -0,0 +1,48 @@
+"""upload scan status on storage_blobs
+
+Revision ID: c8d2a6e4f1b7
+Revises: b3e1f0a9c2d4
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c8d2a6e4f1b7"
+down_revision: Union[str, None] = "b3e1f0a9c2d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _column_exists(bind, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(bind).get_columns(table))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if "storage_blobs" not in inspect(bind).get_table_names():
+        return
+
+    if not _column_exists(bind, "storage_blobs", "scan_status"):
+        # blobs stored before scanning existed stay downloadable
+        op.add_column(
+            "storage_blobs",
+            sa.Column("scan_status", sa.String(length=16), nullable=False, server_default="available"),
+        )
+        op.alter_column("storage_blobs", "scan_status", server_default="pending_scan")
+    if not _column_exists(bind, "storage_blobs", "detected_mime"):
+        op.add_column("storage_blobs", sa.Column("detected_mime", sa.String(length=100), nullable=True))
+    if not _column_exists(bind, "storage_blobs", "scan_detail"):
+        op.add_column("storage_blobs", sa.Column("scan_detail", sa.Text(), nullable=True))
+    if not _column_exists(bind, "storage_blobs", "scanned_at"):
+        op.add_column("storage_blobs", sa.Column("scanned_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    for column in ("scanned_at", "scan_detail", "detected_mime", "scan_status"):
+        op.execute(f"ALTER TABLE storage_blobs DROP COLUMN IF EXISTS {column}")
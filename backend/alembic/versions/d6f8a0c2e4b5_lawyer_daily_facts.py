@@ -0,0 +1,48 @@
+"""lawyer_daily_facts for the lawyer analytics API
+
+Revision ID: d6f8a0c2e4b5
+Revises: c4e6a8b0d2f3
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d6f8a0c2e4b5"
+down_revision: Union[str, None] = "c4e6a8b0d2f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+
+    # Filled by the lawyer_daily_facts_fill scheduler job; nothing to backfill.
+    if "lawyer_daily_facts" not in tables:
+        op.create_table(
+            "lawyer_daily_facts",
+            sa.Column("lawyer_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("available_minutes", sa.Integer(), nullable=False),
+            sa.Column("booked_minutes", sa.Integer(), nullable=False),
+            sa.Column("requests", sa.Integer(), nullable=False),
+            sa.Column("confirmed", sa.Integer(), nullable=False),
+            sa.Column("revenue", sa.Numeric(12, 2), nullable=False),
+            sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+            sa.PrimaryKeyConstraint("lawyer_id", "day"),
+        )
+    # "requests per day" reads bookings by lawyer and creation time
+    if "bookings" in tables:
+        op.execute("CREATE INDEX IF NOT EXISTS ix_bookings_lawyer_id_created_at ON bookings (lawyer_id, created_at)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_bookings_lawyer_id_created_at")
+    tables = inspect(op.get_bind()).get_table_names()
+    if "lawyer_daily_facts" in tables:
+        op.drop_table("lawyer_daily_facts")
@@ -0,0 +1,69 @@
+"""storage_jobs queue and preview renditions on storage_blobs
+
+Revision ID: d772d2c2bd64
+Revises: 57d4f971c338
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d772d2c2bd64"
+down_revision: Union[str, None] = "57d4f971c338"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _column_exists(bind, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(bind).get_columns(table))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    for column in ("thumbnail_path", "preview_path"):
+        if not _column_exists(bind, "storage_blobs", column):
+            op.add_column("storage_blobs", sa.Column(column, sa.String(length=500), nullable=True))
+
+    if "storage_jobs" not in inspect(bind).get_table_names():
+        op.create_table(
+            "storage_jobs",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("kind", sa.String(length=32), nullable=False),
+            sa.Column("blob_sha256", sa.String(length=64), nullable=False),
+            sa.Column("status", sa.String(length=16), nullable=False, server_default="pending"),
+            sa.Column("attempts", sa.Integer(), nullable=False, server_default=sa.text("0")),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("run_after", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+            sa.ForeignKeyConstraint(["blob_sha256"], ["storage_blobs.sha256"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("kind", "blob_sha256", name="uq_storage_jobs_kind_blob"),
+        )
+        op.create_index("ix_storage_jobs_blob_sha256", "storage_jobs", ["blob_sha256"])
+        # workers only ever scan due pending jobs of one kind
+        op.execute(
+            "CREATE INDEX ix_storage_jobs_pending ON storage_jobs (kind, run_after, id) "
+            "WHERE status = 'pending'"
+        )
+
+    # previews for blobs uploaded before the pipeline existed
+    op.execute("""
+        INSERT INTO storage_jobs (kind, blob_sha256)
+        SELECT 'preview', sha256 FROM storage_blobs
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS storage_jobs")
+    bind = op.get_bind()
+    for column in ("thumbnail_path", "preview_path"):
+        if _column_exists(bind, "storage_blobs", column):
+            op.drop_column("storage_blobs", column)
@@ -0,0 +1,45 @@
+"""kyc_submissions.submitted_at NOT NULL (keyset cursor of the review queue)
+
+Revision ID: d8f0a2c4e6b8
+Revises: c6e8a0b2d4f6
+Create Date: 2026-10-22 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d8f0a2c4e6b8"
+down_revision: Union[str, None] = "c6e8a0b2d4f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if "kyc_submissions" not in inspect(op.get_bind()).get_table_names():
+        return
+    # rows inserted with an explicit NULL have no better timestamp to recover
+    op.execute("UPDATE kyc_submissions SET submitted_at = now() WHERE submitted_at IS NULL")
+    op.alter_column(
+        "kyc_submissions",
+        "submitted_at",
+        existing_type=sa.DateTime(timezone=True),
+        existing_server_default=sa.text("now()"),
+        nullable=False,
+    )
+
+
+def downgrade() -> None:
+    if "kyc_submissions" not in inspect(op.get_bind()).get_table_names():
+        return
+    op.alter_column(
+        "kyc_submissions",
+        "submitted_at",
+        existing_type=sa.DateTime(timezone=True),
+        existing_server_default=sa.text("now()"),
+        nullable=True,
+    )
@@ -0,0 +1,47 @@
+"""audit_logs trigram indexes on databases that upgraded without pg_trgm
+
+An earlier version of the audit_logs partitioning revision skipped the
+pg_trgm GIN indexes when the extension was missing, while the model always
+declares them. pg_trgm is now required and the indexes are created here
+where they are absent.
+
+Revision ID: e0b2d4f6a8c1
+Revises: d8f0a2c4e6b8
+Create Date: 2026-10-23 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e0b2d4f6a8c1"
+down_revision: Union[str, None] = "d8f0a2c4e6b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ("user_email", "action", "description")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if "audit_logs" not in inspect(bind).get_table_names():
+        return
+    if bind.execute(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).scalar() is None:
+        raise RuntimeError(
+            "audit_logs needs the pg_trgm extension for its search indexes; "
+            "install the PostgreSQL contrib package (postgres:15 ships it) and rerun the upgrade"
+        )
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in COLUMNS:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_audit_logs_{column}_trgm ON audit_logs USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    # the indexes belong to the partitioning revision; nothing to undo here
+    pass
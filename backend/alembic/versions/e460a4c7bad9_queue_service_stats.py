@@ -0,0 +1,98 @@
+"""queue_service_stats for wait-time estimates
+
+Revision ID: e460a4c7bad9
+Revises: add14df2690e
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e460a4c7bad9"
+down_revision: Union[str, None] = "add14df2690e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BUCKET_SECONDS = 60
+BUCKETS = 121
+MAX_GAP_SECONDS = 4 * 60 * 60
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    tables = inspect(bind).get_table_names()
+
+    if "queue_service_stats" not in tables:
+        op.create_table(
+            "queue_service_stats",
+            sa.Column("lawyer_id", sa.Integer(), nullable=False),
+            sa.Column("samples", sa.Integer(), nullable=False, server_default=sa.text("0")),
+            sa.Column("ewma_seconds", sa.Float(), nullable=True),
+            sa.Column("histogram", sa.JSON(), nullable=True),
+            sa.Column("last_served_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+            sa.ForeignKeyConstraint(["lawyer_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("lawyer_id"),
+        )
+
+    if "token_queue" not in tables:
+        return
+
+    # Seed from the last 30 days of history: plain mean instead of EWMA,
+    # undecayed histogram. Live updates take over from here.
+    rows = bind.execute(sa.text("""
+        WITH gaps AS (
+            SELECT lawyer_id,
+                   EXTRACT(EPOCH FROM served_at - lag(served_at) OVER (
+                       PARTITION BY lawyer_id, date ORDER BY served_at
+                   )) AS gap
+            FROM token_queue
+            WHERE served_at IS NOT NULL
+              AND served_at >= now() - interval '30 days'
+        )
+        SELECT lawyer_id,
+               LEAST(FLOOR(gap / :bucket)::int, :last_bucket) AS bucket,
+               count(*) AS n,
+               sum(gap) AS total
+        FROM gaps
+        WHERE gap > 0 AND gap <= :max_gap
+        GROUP BY lawyer_id, bucket
+    """), {"bucket": BUCKET_SECONDS, "last_bucket": BUCKETS - 1, "max_gap": MAX_GAP_SECONDS}).all()
+
+    stats = {}
+    for lawyer_id, bucket, n, total in rows:
+        entry = stats.setdefault(lawyer_id, {"hist": [0.0] * BUCKETS, "n": 0, "total": 0.0})
+        entry["hist"][bucket] += float(n)
+        entry["n"] += int(n)
+        entry["total"] += float(total)
+
+    last_served = dict(bind.execute(sa.text(
+        "SELECT lawyer_id, max(served_at) FROM token_queue WHERE served_at IS NOT NULL GROUP BY lawyer_id"
+    )).all())
+
+    for lawyer_id, served_at in last_served.items():
+        entry = stats.get(lawyer_id)
+        bind.execute(
+            sa.text("""
+                INSERT INTO queue_service_stats (lawyer_id, samples, ewma_seconds, histogram, last_served_at)
+                VALUES (:lawyer_id, :samples, :ewma, CAST(:histogram AS json), :last_served_at)
+                ON CONFLICT (lawyer_id) DO NOTHING
+            """),
+            {
+                "lawyer_id": lawyer_id,
+                "samples": entry["n"] if entry else 0,
+                "ewma": entry["total"] / entry["n"] if entry else None,
+                "histogram": json.dumps(entry["hist"]) if entry else None,
+                "last_served_at": served_at,
+            },
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS queue_service_stats")
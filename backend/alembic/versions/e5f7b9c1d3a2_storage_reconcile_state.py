@@ -0,0 +1,50 @@
+"""storage_reconcile_state checkpoints and path indexes for the reconcile job
+
+Revision ID: e5f7b9c1d3a2
+Revises: c8d2a6e4f1b7
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f7b9c1d3a2"
+down_revision: Union[str, None] = "c8d2a6e4f1b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+
+    if "storage_reconcile_state" not in tables:
+        op.create_table(
+            "storage_reconcile_state",
+            sa.Column("name", sa.String(length=32), primary_key=True),
+            sa.Column("cursor", sa.Text(), nullable=True),
+            sa.Column("scanned", sa.BigInteger(), nullable=False, server_default="0"),
+            sa.Column("orphans", sa.BigInteger(), nullable=False, server_default="0"),
+            sa.Column("removed", sa.BigInteger(), nullable=False, server_default="0"),
+            sa.Column("pass_started_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("last_completed_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("last_pass", postgresql.JSONB(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+
+    # reference lookups by storage key
+    if "documents" in tables:
+        op.execute("CREATE INDEX IF NOT EXISTS ix_documents_file_path ON documents (file_path)")
+    if "case_documents" in tables:
+        op.execute("CREATE INDEX IF NOT EXISTS ix_case_documents_stored_path ON case_documents (stored_path)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_case_documents_stored_path")
+    op.execute("DROP INDEX IF EXISTS ix_documents_file_path")
+    op.execute("DROP TABLE IF EXISTS storage_reconcile_state")
@@ -0,0 +1,32 @@
+"""index for the admin KYC review queue
+
+Revision ID: e8a0c2e4f6b7
+Revises: d6f8a0c2e4b5
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8a0c2e4f6b7"
+down_revision: Union[str, None] = "d6f8a0c2e4b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+
+    if "kyc_submissions" in tables:
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_kyc_submissions_status_submitted_at "
+            "ON kyc_submissions (status, submitted_at, id)"
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_kyc_submissions_status_submitted_at")
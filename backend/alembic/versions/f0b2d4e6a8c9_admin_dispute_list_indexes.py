@@ -0,0 +1,39 @@
+"""indexes for the paged admin dispute list
+
+Replaces the PENDING-only partial index with (status, id), which serves the
+newest-first page for every status, and adds (client_id, id).
+
+Revision ID: f0b2d4e6a8c9
+Revises: e8a0c2e4f6b7
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f0b2d4e6a8c9"
+down_revision: Union[str, None] = "e8a0c2e4f6b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+
+    if "disputes" in tables:
+        op.execute("CREATE INDEX IF NOT EXISTS ix_disputes_status_id ON disputes (status, id)")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_disputes_client_id_id ON disputes (client_id, id)")
+        op.execute("DROP INDEX IF EXISTS ix_disputes_pending_id")
+
+
+def downgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+
+    if "disputes" in tables:
+        op.execute("CREATE INDEX IF NOT EXISTS ix_disputes_pending_id ON disputes (id) WHERE status = 'PENDING'")
+    op.execute("DROP INDEX IF EXISTS ix_disputes_client_id_id")
+    op.execute("DROP INDEX IF EXISTS ix_disputes_status_id")
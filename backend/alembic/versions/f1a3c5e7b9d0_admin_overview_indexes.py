@@ -0,0 +1,38 @@
+"""indexes for the admin overview: latest KYC per lawyer, recent bookings, lawyers by id
+
+Revision ID: f1a3c5e7b9d0
+Revises: e5f7b9c1d3a2
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f1a3c5e7b9d0"
+down_revision: Union[str, None] = "e5f7b9c1d3a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tables = inspect(op.get_bind()).get_table_names()
+
+    if "kyc_submissions" in tables:
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_kyc_submissions_lawyer_id_submitted_at "
+            "ON kyc_submissions (lawyer_id, submitted_at DESC)"
+        )
+    if "bookings" in tables:
+        op.execute("CREATE INDEX IF NOT EXISTS ix_bookings_created_at ON bookings (created_at DESC)")
+    if "users" in tables:
+        op.execute("CREATE INDEX IF NOT EXISTS ix_users_role_id ON users (role, id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_role_id")
+    op.execute("DROP INDEX IF EXISTS ix_bookings_created_at")
+    op.execute("DROP INDEX IF EXISTS ix_kyc_submissions_lawyer_id_submitted_at")
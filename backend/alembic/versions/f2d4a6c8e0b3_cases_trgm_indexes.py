@@ -0,0 +1,43 @@
+"""cases trigram indexes on databases that upgraded without pg_trgm
+
+An earlier version of the case feed revision skipped the district/category
+pg_trgm GIN indexes when the extension was missing, while the model always
+declares them. pg_trgm is now required and the indexes are created here
+where they are absent.
+
+Revision ID: f2d4a6c8e0b3
+Revises: e0b2d4f6a8c1
+Create Date: 2026-10-24 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2d4a6c8e0b3"
+down_revision: Union[str, None] = "e0b2d4f6a8c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if "cases" not in inspect(bind).get_table_names():
+        return
+    if bind.execute(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).scalar() is None:
+        raise RuntimeError(
+            "the case feed needs the pg_trgm extension for its district/category indexes; "
+            "install the PostgreSQL contrib package (postgres:15 ships it) and rerun the upgrade"
+        )
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in ("district", "category"):
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_cases_{column}_trgm ON cases USING gin ({column} gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    # the indexes belong to the case feed revision; nothing to undo here
+    pass
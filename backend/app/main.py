@@ -10,7 +10,6 @@ import time
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse, Response
 from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
@@ -64,6 +63,8 @@ from app.modules.lawyer_profiles.routes import router as lawyer_profiles_router
 from app.routers.lawyer_availability import router as lawyer_availability_router
 from app.modules.audit_log.routes import router as audit_log_router
 from app.modules.cases.routes import router as cases_router
+from app.modules.metrics.routes import router as metrics_router
+from app.modules.notifications.routes import router as notifications_router
 
 # API v1 routers
 from .api.v1 import admin as admin_v1, booking as booking_v1
@@ -71,6 +72,23 @@ from .api.v1 import admin as admin_v1, booking as booking_v1
 # Seed
 from app.seed import seed_all
 
+# File storage
+
+# Background jobs
+from app.scheduler import register_job, scheduler_enabled, start_scheduler, stop_scheduler
+from app.modules.audit_log.partitions import maintain_audit_log_partitions
+from app.modules.lawyer_dashboard.analytics import fill_all_daily_facts
+from app.modules.metrics.service import rollup_metrics
+from app.modules.matching.service import prune_matching_changes
+from app.modules.notifications.service import dispatch_notifications
+from app.modules.queue import events as queue_events
+from app.modules.queue.service import pregenerate_next_day_queues
+from app.modules.storage.jobs import shutdown_worker_pool
+from app.modules.storage.previews import process_preview_jobs
+from app.modules.storage.reconcile import reconcile_storage
+from app.modules.storage.scan import process_scan_jobs
+from app.modules.storage.text_index import process_text_jobs
+
 
 # FastAPI app
 app = FastAPI(
@@ -79,9 +97,8 @@ app = FastAPI(
     swagger_ui_parameters={"persistAuthorization": True},
 )
 
-# OK Serve uploaded files so frontend can open PDFs/images in browser
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-
+# Uploads have no public mount: every download goes through an authorised
+# route (app/modules/storage/serving.py).
 
 # =============================================================================
 # OK CORS (DEV-SAFE) - Fixes "blocked by CORS policy" + frontend "Network Error"
@@ -129,6 +146,30 @@ def startup():
     finally:
         db.close()
 
+    if scheduler_enabled():
+        register_job("audit_log_partitions", 6 * 60 * 60, maintain_audit_log_partitions)
+        # Idempotent, so hourly runs also pick up bookings made during the day.
+        register_job("queue_pregenerate_next_day", 60 * 60, pregenerate_next_day_queues)
+        register_job("storage_scan", 5, process_scan_jobs)
+        register_job("storage_previews", 15, process_preview_jobs)
+        register_job("storage_text_index", 15, process_text_jobs)
+        register_job("storage_reconcile", 5 * 60, reconcile_storage)
+        register_job("metrics_rollup", 60, rollup_metrics)
+        register_job("lawyer_daily_facts_fill", 60 * 60, fill_all_daily_facts)
+        register_job("matching_changes_prune", 60 * 60, prune_matching_changes)
+        register_job("notifications_dispatch", 5, dispatch_notifications)
+        start_scheduler()
+
+    if queue_events.events_backend() == "postgres":
+        queue_events.start_listener(engine)
+
+
+@app.on_event("shutdown")
+def shutdown():
+    stop_scheduler()
+    shutdown_worker_pool()
+    queue_events.stop_listener()
+
 
 # ---- Health check ----
 @app.get("/health")
@@ -190,6 +231,8 @@ for module_router in (
     admin_kyc_router,
     audit_log_router,
     lawyer_profiles_router,
+    metrics_router,
+    notifications_router,
 ):
     app.include_router(module_router)
 
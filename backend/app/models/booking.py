@@ -1,9 +1,25 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, func
+from enum import Enum
+
+from sqlalchemy import CheckConstraint, Column, DateTime, ForeignKey, Index, Integer, String, Text, func, text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
 
 
+class BookingStatus(str, Enum):
+    pending = "pending"
+    requested = "requested"
+    confirmed = "confirmed"
+    rejected = "rejected"
+    cancelled = "cancelled"
+    completed = "completed"
+
+
+# bookings awaiting the lawyer / occupying the lawyer's time
+INCOMING_BOOKING_STATUSES = (BookingStatus.pending.value, BookingStatus.requested.value)
+BUSY_BOOKING_STATUSES = (BookingStatus.confirmed.value, BookingStatus.completed.value)
+
+
 class Booking(Base):
     __tablename__ = "bookings"
 
@@ -15,7 +31,7 @@ class Booking(Base):
     case_id = Column(Integer, ForeignKey("cases.id"), nullable=True, index=True)
     scheduled_at = Column(DateTime(timezone=True), nullable=True)
     note = Column(Text, nullable=True)
-    status = Column(String, nullable=False, default="pending")
+    status = Column(String, nullable=False, default=BookingStatus.pending.value)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -24,3 +40,27 @@ class Booking(Base):
     branch = relationship("Branch", foreign_keys=[branch_id])
     service_package = relationship("ServicePackage", foreign_keys=[service_package_id])
     case = relationship("Case", foreign_keys=[case_id])
+
+    __table_args__ = (
+        # newest-first listings (admin overview "recent bookings")
+        Index("ix_bookings_created_at", created_at.desc()),
+        # lawyer dashboard "incoming bookings"
+        Index(
+            "ix_bookings_lawyer_id_incoming",
+            lawyer_id,
+            postgresql_where=text("status IN ('pending', 'requested')"),
+        ),
+        # lawyer analytics "requests per day"
+        Index("ix_bookings_lawyer_id_created_at", lawyer_id, created_at),
+        # busy slots and "cases handled"
+        Index(
+            "ix_bookings_lawyer_id_scheduled_at_busy",
+            lawyer_id,
+            scheduled_at,
+            postgresql_where=text("status IN ('confirmed', 'completed')"),
+        ),
+        CheckConstraint(
+            "status IN (%s)" % ", ".join(f"'{s.value}'" for s in BookingStatus),
+            name="ck_bookings_status",
+        ),
+    )
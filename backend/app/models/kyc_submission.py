@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -18,4 +18,11 @@ class KYCSubmission(Base):
     bar_certificate_url = Column(String, nullable=True)
 
     status = Column(String, default="pending")
-    submitted_at = Column(DateTime(timezone=True), server_default=func.now())
+    submitted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # latest submission per lawyer (DISTINCT ON lawyer_id ... submitted_at DESC)
+        Index("ix_kyc_submissions_lawyer_id_submitted_at", "lawyer_id", submitted_at.desc()),
+        # admin review queue, keyset-paged oldest first within a status
+        Index("ix_kyc_submissions_status_submitted_at", "status", "submitted_at", "id"),
+    )
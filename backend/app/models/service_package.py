@@ -6,7 +6,7 @@ class ServicePackage(Base):
     __tablename__ = "service_packages"
 
     id = Column(Integer, primary_key=True, index=True)
-    lawyer_id = Column(Integer, ForeignKey("lawyers.id", ondelete="CASCADE"), nullable=False)
+    lawyer_id = Column(Integer, ForeignKey("lawyers.id", ondelete="CASCADE"), nullable=False, index=True)
 
     name = Column(String, nullable=False)
     description = Column(String, nullable=False)
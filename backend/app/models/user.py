@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, Enum as SQLEnum, Integer, String, func
+from sqlalchemy import Column, DateTime, Enum as SQLEnum, Index, Integer, String, func
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -25,6 +25,11 @@ class User(Base):
     role = Column(SQLEnum(UserRole), nullable=False, default=UserRole.client)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        # per-role listings paged by id (admin overview lawyers)
+        Index("ix_users_role_id", "role", "id"),
+    )
+
     bookings = relationship(
         "Booking",
         back_populates="client",
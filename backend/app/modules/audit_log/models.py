@@ -1,14 +1,54 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, func
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, JSON, func
 from app.database import Base
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class AuditLog(Base):
+    """Audit trail, range-partitioned by month on created_at (see partitions.py).
+
+    Postgres requires the partition key in the primary key, so created_at is
+    part of it and also gets a client-side default.
+    """
+
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_created_at", "created_at"),
+        Index(
+            "ix_audit_logs_user_email_trgm",
+            "user_email",
+            postgresql_using="gin",
+            postgresql_ops={"user_email": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_audit_logs_action_trgm",
+            "action",
+            postgresql_using="gin",
+            postgresql_ops={"action": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_audit_logs_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     user_email = Column(String, nullable=True, index=True)
     action = Column(String, nullable=False, index=True)
     description = Column(Text, nullable=False)
     meta = Column(JSON, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=_utcnow,
+        server_default=func.now(),
+        nullable=False,
+    )
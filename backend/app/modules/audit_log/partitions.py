@@ -0,0 +1,139 @@
+# backend/app/modules/audit_log/partitions.py
+
+"""Monthly range partitions for audit_logs.
+
+Partitions are named ``audit_logs_yYYYYmMM`` and cover one calendar month of
+``created_at``. ``audit_logs_default`` catches anything outside the managed
+range; when a partition is created for a month the default already holds rows
+for, those rows move into the new partition. Retention is a ``DROP TABLE`` on
+whole partitions, never a DELETE.
+"""
+
+import os
+import re
+from datetime import date, datetime, timezone
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+PARENT_TABLE = "audit_logs"
+DEFAULT_PARTITION = "audit_logs_default"
+_PARTITION_RE = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+
+
+def _month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def _add_months(d: date, months: int) -> date:
+    index = d.year * 12 + (d.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def retention_months() -> int:
+    return int(os.getenv("AUDIT_LOG_RETENTION_MONTHS", "12"))
+
+
+def list_partitions(db: Session) -> List[str]:
+    rows = db.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE parent.relname = :parent
+            ORDER BY child.relname
+            """
+        ),
+        {"parent": PARENT_TABLE},
+    ).scalars()
+    return list(rows)
+
+
+def ensure_partition(db: Session, month: date) -> bool:
+    """Create the partition for ``month`` if missing. Returns True if created.
+
+    Postgres refuses to create a partition while the default partition holds
+    rows in its range, so those rows are moved over in the same transaction:
+    detach the default, create the partition, copy the rows in through the
+    parent, delete them from the default and attach it again. Caller commits.
+    """
+    start = _month_start(month)
+    name = partition_name(start)
+    partitions = list_partitions(db)
+    if name in partitions:
+        return False
+
+    end = _add_months(start, 1)
+    bounds = {"start": start, "end": end}
+    stray = DEFAULT_PARTITION in partitions and db.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :start AND created_at < :end)"
+        ),
+        bounds,
+    ).scalar()
+    if stray:
+        db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+
+    db.execute(
+        text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT_TABLE} '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    )
+
+    if stray:
+        db.execute(
+            text(
+                f"INSERT INTO {PARENT_TABLE} SELECT * FROM {DEFAULT_PARTITION} "
+                "WHERE created_at >= :start AND created_at < :end"
+            ),
+            bounds,
+        )
+        db.execute(
+            text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end"),
+            bounds,
+        )
+        db.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+    return True
+
+
+def ensure_partitions(db: Session, months_ahead: int = 3, today: date | None = None) -> List[str]:
+    """Make sure the current month and the next ``months_ahead`` months exist."""
+    current = _month_start(today or datetime.now(timezone.utc).date())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = _add_months(current, offset)
+        if ensure_partition(db, month):
+            created.append(partition_name(month))
+    return created
+
+
+def drop_expired_partitions(db: Session, keep_months: int | None = None, today: date | None = None) -> List[str]:
+    """Drop monthly partitions that end before the retention cutoff."""
+    keep = retention_months() if keep_months is None else keep_months
+    cutoff = _add_months(_month_start(today or datetime.now(timezone.utc).date()), -keep)
+
+    dropped = []
+    for name in list_partitions(db):
+        match = _PARTITION_RE.match(name)
+        if not match:
+            continue
+        month = date(int(match.group(1)), int(match.group(2)), 1)
+        if _add_months(month, 1) <= cutoff:
+            db.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+            dropped.append(name)
+    return dropped
+
+
+def maintain_audit_log_partitions(db: Session) -> None:
+    """Scheduled job: pre-create upcoming partitions and apply retention."""
+    ensure_partitions(db)
+    drop_expired_partitions(db)
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -31,7 +31,8 @@ def list_audit_logs(
 ):
     _require_admin(current_user)
 
-    cutoff = datetime.utcnow() - timedelta(days=days)
+    # Literal lower bound on created_at lets Postgres prune audit_logs partitions.
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
     query = db.query(AuditLog).filter(AuditLog.created_at >= cutoff)
 
     if action:
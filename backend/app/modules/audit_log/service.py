@@ -12,6 +12,7 @@ def log_event(
     action: str,
     description: str,
     meta: Optional[Any] = None,
+    commit: bool = True,
 ) -> AuditLog:
     entry = AuditLog(
         user_id=getattr(user, "id", None),
@@ -21,6 +22,7 @@ def log_event(
         meta=meta,
     )
     db.add(entry)
-    db.commit()
-    db.refresh(entry)
+    if commit:
+        db.commit()
+        db.refresh(entry)
     return entry
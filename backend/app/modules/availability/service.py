@@ -1,7 +1,7 @@
 from datetime import date, datetime, time, timedelta
 
 from fastapi import HTTPException, status
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.modules.availability.models import AvailabilityTemplate
@@ -9,7 +9,7 @@ from app.modules.availability.schemas import (
     AvailabilityTemplateCreate,
     AvailabilityTemplateUpdate,
 )
-from app.models.booking import Booking
+from app.models.booking import BUSY_BOOKING_STATUSES, Booking
 from app.models.branch import Branch
 from app.models.lawyer_availability import WeeklyAvailability
 from app.models.service_package import ServicePackage
@@ -184,7 +184,7 @@ def _build_busy_map(
             Booking.scheduled_at.isnot(None),
             Booking.scheduled_at >= start_dt,
             Booking.scheduled_at <= end_dt,
-            func.lower(Booking.status).in_(["confirmed", "completed"]),
+            Booking.status.in_(BUSY_BOOKING_STATUSES),
         )
         .all()
     )
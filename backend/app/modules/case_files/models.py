@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, BigInteger
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, ForeignKey
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -11,7 +11,9 @@ class CaseDocument(Base):
     case_id = Column(Integer, nullable=False, index=True)
 
     filename = Column(String(255), nullable=False)
-    stored_path = Column(String, nullable=False)
+    stored_path = Column(String, nullable=False, index=True)
+    # Content hash of the shared blob behind stored_path (NULL for legacy uploads)
+    blob_sha256 = Column(String(64), ForeignKey("storage_blobs.sha256"), nullable=True, index=True)
 
     mime_type = Column(String(255), nullable=True)
     size_bytes = Column(BigInteger, nullable=True)
@@ -2,10 +2,14 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.models.user import User
+from app.modules.cases.service import can_access_case, get_case
+from app.modules.storage.serving import ensure_servable, rendition_key, serve_stored_file
+from app.routers.auth import get_current_user
 from app.modules.case_files.schemas import (
     CaseIntakeCreate,
     CaseIntakeOut,
@@ -15,6 +19,7 @@ from app.modules.case_files.schemas import (
     CaseChecklistIsCompleteOut,
 )
 
+from app.modules.case_files.models import CaseDocument
 from app.modules.case_files.service import CaseIntakeService, CaseDocumentsService, CaseChecklistService
 
 router = APIRouter(tags=["Case Files"])
@@ -69,6 +74,59 @@ def delete_case_document(case_id: int, doc_id: int, db: Session = Depends(get_db
     CaseDocumentsService.delete_document(db=db, case_id=case_id, doc_id=doc_id)
     return {"detail": "Deleted"}
 
+
+def _get_accessible_case_document(db: Session, current_user: User, case_id: int, doc_id: int) -> CaseDocument:
+    doc = (
+        db.query(CaseDocument)
+        .filter(CaseDocument.id == doc_id, CaseDocument.case_id == case_id)
+        .first()
+    )
+    if not doc:
+        raise HTTPException(status_code=404, detail="Case document not found")
+    case = get_case(db, case_id)
+    if case is None or not can_access_case(db, current_user, case):
+        raise HTTPException(status_code=403, detail="Not allowed")
+    return doc
+
+
+@router.get("/cases/{case_id}/documents/{doc_id}/content")
+def get_case_document_content(
+    case_id: int,
+    doc_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    doc = _get_accessible_case_document(db, current_user, case_id, doc_id)
+    ensure_servable(db, doc.blob_sha256)
+    return serve_stored_file(request, doc.stored_path, filename=doc.filename, immutable_tag=doc.blob_sha256)
+
+
+@router.get("/cases/{case_id}/documents/{doc_id}/thumbnail")
+def get_case_document_thumbnail(
+    case_id: int,
+    doc_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    doc = _get_accessible_case_document(db, current_user, case_id, doc_id)
+    key = rendition_key(ensure_servable(db, doc.blob_sha256), "thumbnail")
+    return serve_stored_file(request, key, filename=key.rsplit("/", 1)[-1], immutable_tag=f"{doc.blob_sha256}-thumbnail")
+
+
+@router.get("/cases/{case_id}/documents/{doc_id}/preview")
+def get_case_document_preview(
+    case_id: int,
+    doc_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    doc = _get_accessible_case_document(db, current_user, case_id, doc_id)
+    key = rendition_key(ensure_servable(db, doc.blob_sha256), "preview")
+    return serve_stored_file(request, key, filename=key.rsplit("/", 1)[-1], immutable_tag=f"{doc.blob_sha256}-preview")
+
 # ---------------------------
 # Case Checklist Endpoints
 # ---------------------------
@@ -9,6 +9,11 @@ class CaseDocumentOut(BaseModel):
     case_id: int
     filename: str
     stored_path: str
+    # pending_scan / available / quarantined; URLs are only set when available
+    scan_status: str = "available"
+    download_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    preview_url: Optional[str] = None
     mime_type: Optional[str] = None
     size_bytes: Optional[int] = None
     uploaded_by_user_id: Optional[int] = None
@@ -3,15 +3,13 @@
 from __future__ import annotations
 
 import os
-import uuid
-from pathlib import Path
 from typing import List, Optional
 
 from fastapi import HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
 from app.modules.case_files.models import CaseChecklist, CaseDocument, CaseIntake
-
+from app.modules.storage.blobs import attach_file_urls, delete_after_commit, release_blob, store_upload
 
 
 # ---------------------------
@@ -64,26 +62,10 @@ class CaseIntakeService:
 # ---------------------------
 class CaseDocumentsService:
     """
-    Stores files on disk and metadata in case_documents table.
-    Storage base: uploads/case_documents/<case_id>/
+    Stores files in the shared content-addressed blob store (uploads/blobs/)
+    and metadata in case_documents table.
     """
 
-    BASE_DIR = Path("uploads") / "case_documents"
-
-    @staticmethod
-    def _ensure_case_dir(case_id: int) -> Path:
-        case_dir = CaseDocumentsService.BASE_DIR / str(case_id)
-        case_dir.mkdir(parents=True, exist_ok=True)
-        return case_dir
-
-    @staticmethod
-    def _safe_filename(original_name: str) -> str:
-        # keep extension if possible
-        ext = ""
-        if "." in original_name:
-            ext = "." + original_name.split(".")[-1]
-        return f"{uuid.uuid4().hex}{ext}"
-
     @staticmethod
     def upload_document(
         db: Session,
@@ -94,39 +76,47 @@ class CaseDocumentsService:
         if file is None:
             raise HTTPException(status_code=400, detail="File is required")
 
-        case_dir = CaseDocumentsService._ensure_case_dir(case_id)
-        stored_name = CaseDocumentsService._safe_filename(file.filename or "file")
-        stored_path = case_dir / stored_name
-
-        # Save file to disk
+        # Stream to the blob store; oversize uploads are rejected with 413 and leave nothing behind
         try:
-            with open(stored_path, "wb") as f:
-                f.write(file.file.read())
+            stored = store_upload(db, file)
+        except HTTPException:
+            raise
         except Exception as e:
+            db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to save file: {e}")
 
         doc = CaseDocument(
             case_id=case_id,
-            filename=file.filename or stored_name,
-            stored_path=str(stored_path).replace("\\", "/"),
+            filename=file.filename or os.path.basename(stored.path),
+            stored_path=stored.path,
+            blob_sha256=stored.sha256,
             mime_type=file.content_type,
-            size_bytes=os.path.getsize(stored_path),
+            size_bytes=stored.size_bytes,
             uploaded_by_user_id=uploaded_by_user_id,
         )
 
         db.add(doc)
         db.commit()
         db.refresh(doc)
-        return doc
+        return CaseDocumentsService.attach_file_urls(db, [doc])[0]
 
     @staticmethod
     def list_documents(db: Session, case_id: int) -> List[CaseDocument]:
-        return (
+        docs = (
             db.query(CaseDocument)
             .filter(CaseDocument.case_id == case_id)
             .order_by(CaseDocument.uploaded_at.desc())
             .all()
         )
+        return CaseDocumentsService.attach_file_urls(db, docs)
+
+    @staticmethod
+    def attach_file_urls(db: Session, docs: List[CaseDocument]) -> List[CaseDocument]:
+        if not docs:
+            return docs
+        # every listing is for one case; the files are served by case_files/router.py
+        route = f"/cases/{docs[0].case_id}/documents"
+        return attach_file_urls(db, docs, path_attr="stored_path", filename_attr="filename", route=route)
 
     @staticmethod
     def delete_document(db: Session, case_id: int, doc_id: int) -> None:
@@ -138,13 +128,11 @@ class CaseDocumentsService:
         if not doc:
             raise HTTPException(status_code=404, detail="Case document not found")
 
-        # remove file if exists
-        try:
-            if doc.stored_path and os.path.exists(doc.stored_path):
-                os.remove(doc.stored_path)
-        except Exception:
-            # don't block DB delete if file delete fails
-            pass
+        # shared blobs are only unlinked with their last reference
+        if doc.blob_sha256:
+            release_blob(db, doc.blob_sha256)
+        else:
+            delete_after_commit(db, doc.stored_path)
 
         db.delete(doc)
         db.commit()
@@ -1,11 +1,36 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, func
+from enum import Enum
+
+from sqlalchemy import CheckConstraint, Column, Integer, String, Text, DateTime, ForeignKey, Index, func, text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
 
 
+class CaseRequestStatus(str, Enum):
+    pending = "pending"
+    approved = "approved"
+    rejected = "rejected"
+
+
 class Case(Base):
     __tablename__ = "cases"
+    __table_args__ = (
+        # lawyer case feed: open cases newest first (keyset on created_at, id)
+        Index("ix_cases_status_created_at", "status", "created_at", "id"),
+        # substring district/category filters on the feed
+        Index(
+            "ix_cases_district_trgm",
+            "district",
+            postgresql_using="gin",
+            postgresql_ops={"district": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_cases_category_trgm",
+            "category",
+            postgresql_using="gin",
+            postgresql_ops={"category": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     client_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -31,6 +56,14 @@ class Case(Base):
 
 class CaseRequest(Base):
     __tablename__ = "case_requests"
+    __table_args__ = (
+        # lawyer dashboard "pending requests"
+        Index("ix_case_requests_lawyer_id_pending", "lawyer_id", postgresql_where=text("status = 'pending'")),
+        CheckConstraint(
+            "status IN (%s)" % ", ".join(f"'{s.value}'" for s in CaseRequestStatus),
+            name="ck_case_requests_status",
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     case_id = Column(Integer, ForeignKey("cases.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -1,3 +1,4 @@
+import logging
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -7,10 +8,16 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.user import UserRole, User
+from app.modules.matching import service as matching
+from app.modules.matching.schemas import LawyerMatchOut
+from app.modules.notifications.service import notify
 from app.routers.auth import get_current_user
+from . import service
 from .models import Case, CaseRequest
 from .schemas import (
     CaseCreate,
+    CaseCreatedOut,
+    CaseFeedPage,
     CaseOut,
     CaseRequestCreate,
     CaseRequestOut,
@@ -18,6 +25,7 @@ from .schemas import (
 )
 
 router = APIRouter(prefix="/cases", tags=["Cases"])
+logger = logging.getLogger(__name__)
 
 
 def _is_role(user: User, role: str) -> bool:
@@ -53,7 +61,7 @@ class RequestStatusUpdate(BaseModel):
     status: str = Field(..., pattern="^(approved|rejected)$")
 
 
-@router.post("", response_model=CaseOut, status_code=status.HTTP_201_CREATED)
+@router.post("", response_model=CaseCreatedOut, status_code=status.HTTP_201_CREATED)
 def create_case(
     payload: CaseCreate,
     db: Session = Depends(get_db),
@@ -72,7 +80,17 @@ def create_case(
     db.add(new_case)
     db.commit()
     db.refresh(new_case)
-    return new_case
+
+    created = CaseCreatedOut.model_validate(new_case)
+    try:
+        found = matching.match_lawyers_for_case(
+            db, new_case, languages=payload.languages, max_price=payload.max_price
+        )
+        created.matches = matching.describe_matches(db, found)
+    except Exception:
+        # the case is saved; matches can be fetched again from /matches
+        logger.exception("Matching failed for case %s", new_case.id)
+    return created
 
 
 @router.get("/my", response_model=List[CaseOut])
@@ -90,20 +108,25 @@ def list_my_cases(
     return cases
 
 
-@router.get("/feed", response_model=List[CaseOut])
+@router.get("/feed", response_model=CaseFeedPage)
 def list_open_cases(
     district: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     _ensure_lawyer(current_user)
-    q = db.query(Case).filter(Case.status == "open")
-    if district:
-        q = q.filter(Case.district.ilike(f"%{district}%"))
-    if category:
-        q = q.filter(Case.category.ilike(f"%{category}%"))
-    return q.order_by(Case.created_at.desc()).all()
+    items, next_cursor = service.list_case_feed(
+        db,
+        current_user.id,
+        district=district,
+        category=category,
+        limit=limit,
+        cursor=cursor,
+    )
+    return CaseFeedPage(items=items, next_cursor=next_cursor)
 
 
 @router.post(
@@ -163,6 +186,22 @@ def list_case_requests(
     )
 
 
+@router.get("/{case_id}/matches", response_model=List[LawyerMatchOut])
+def list_case_matches(
+    case_id: int,
+    k: int = Query(10, ge=1, le=50),
+    languages: List[str] = Query([]),
+    max_price: Optional[float] = Query(None, ge=0),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    case = _get_case_or_404(db, case_id)
+    _ensure_client(current_user)
+    _ensure_case_owner(current_user, case)
+    found = matching.match_lawyers_for_case(db, case, languages=languages, max_price=max_price, k=k)
+    return matching.describe_matches(db, found)
+
+
 @router.patch("/{case_id}/requests/{request_id}", response_model=CaseRequestOut)
 def update_case_request_status(
     case_id: int,
@@ -183,10 +222,21 @@ def update_case_request_status(
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
 
+    previous_status = request.status
     request.status = payload.status
     if payload.status == "approved":
         case.selected_lawyer_id = request.lawyer_id
 
+    if payload.status != previous_status and payload.status in ("approved", "rejected"):
+        notify(
+            db,
+            user_ids=[request.lawyer_id],
+            kind=f"case_request.{payload.status}",
+            title=f"Case request {payload.status}",
+            body=f"Your request for case \"{case.title}\" was {payload.status} by the client.",
+            data={"case_id": case.id, "request_id": request.id},
+        )
+
     db.commit()
     db.refresh(request)
     return request
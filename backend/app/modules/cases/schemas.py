@@ -1,7 +1,9 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.modules.matching.schemas import LawyerMatchOut
 
 
 class CaseCreate(BaseModel):
@@ -10,6 +12,9 @@ class CaseCreate(BaseModel):
     district: str
     summary_public: str
     summary_private: Optional[str] = None
+    # preferences for the lawyer matches returned on creation (not stored)
+    languages: List[str] = Field(default_factory=list)
+    max_price: Optional[float] = Field(None, ge=0)
 
 
 class CaseOut(BaseModel):
@@ -27,6 +32,15 @@ class CaseOut(BaseModel):
     updated_at: datetime
 
 
+class CaseCreatedOut(CaseOut):
+    matches: List[LawyerMatchOut] = Field(default_factory=list)
+
+
+class CaseFeedPage(BaseModel):
+    items: List[CaseOut]
+    next_cursor: Optional[str] = None
+
+
 class CaseRequestCreate(BaseModel):
     message: Optional[str] = None
 
@@ -1,10 +1,13 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+import sqlalchemy as sa
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.models.booking import Booking
 from app.models.user import User, UserRole
 from app.modules.cases.models import Case, CaseRequest
+from app.pagination import decode_cursor, encode_cursor
 
 
 def create_case(db: Session, client: User, data) -> Case:
@@ -33,10 +36,55 @@ def list_client_cases(db: Session, client: User) -> List[Case]:
     )
 
 
+def list_case_feed(
+    db: Session,
+    lawyer_id: int,
+    *,
+    district: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Case], Optional[str]]:
+    """Open cases the lawyer has not requested yet, newest first, one page at
+    a time, with the cursor of the next page.
+
+    The page walks ``ix_cases_status_created_at``; the district and category
+    substring filters use the trigram indexes, and already-requested cases
+    are dropped by an anti-join on ``ux_case_requests_case_lawyer``.
+    """
+    requested = sa.exists().where(CaseRequest.case_id == Case.id, CaseRequest.lawyer_id == lawyer_id)
+    q = db.query(Case).filter(Case.status == "open", ~requested)
+    if district:
+        q = q.filter(Case.district.ilike(f"%{district}%"))
+    if category:
+        q = q.filter(Case.category.ilike(f"%{category}%"))
+    if cursor:
+        q = q.filter(sa.tuple_(Case.created_at, Case.id) < decode_cursor(cursor))
+
+    cases = q.order_by(Case.created_at.desc(), Case.id.desc()).limit(limit + 1).all()
+    if len(cases) <= limit:
+        return cases, None
+    cases = cases[:limit]
+    return cases, encode_cursor(cases[-1].created_at, cases[-1].id)
+
+
 def get_case(db: Session, case_id: int) -> Optional[Case]:
     return db.query(Case).filter(Case.id == case_id).first()
 
 
+def can_access_case(db: Session, user: User, case: Case) -> bool:
+    """Admins, the case's client and lawyers with a booking on the case."""
+    if user.role == UserRole.admin:
+        return True
+    if user.role == UserRole.client:
+        return case.client_id == user.id
+    if user.role == UserRole.lawyer:
+        return db.query(
+            sa.exists().where(Booking.case_id == case.id, Booking.lawyer_id == user.id)
+        ).scalar()
+    return False
+
+
 def list_requests_for_case(db: Session, case_id: int) -> List[CaseRequest]:
     return (
         db.query(CaseRequest)
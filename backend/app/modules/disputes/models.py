@@ -1,11 +1,29 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, func
+from enum import Enum
+
+from sqlalchemy import CheckConstraint, Column, DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import relationship
 
 from app.database import Base
 
 
+class DisputeStatus(str, Enum):
+    PENDING = "PENDING"
+    RESOLVED = "RESOLVED"
+    REJECTED = "REJECTED"
+
+
 class Dispute(Base):
     __tablename__ = "disputes"
+    __table_args__ = (
+        # admin list, newest first within a status (keyset on id)
+        Index("ix_disputes_status_id", "status", "id"),
+        # admin list filtered by client, and the client's own list
+        Index("ix_disputes_client_id_id", "client_id", "id"),
+        CheckConstraint(
+            "status IN (%s)" % ", ".join(f"'{s.value}'" for s in DisputeStatus),
+            name="ck_disputes_status",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -15,8 +33,8 @@ class Dispute(Base):
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
 
-    # keep as string (matches your migrations using "PENDING")
-    status = Column(String(20), nullable=False, server_default="PENDING")
+    # string column with a CHECK on the canonical (upper-case) values
+    status = Column(String(20), nullable=False, server_default=DisputeStatus.PENDING.value)
     admin_note = Column(Text, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,5 +1,6 @@
 # backend/app/modules/disputes/routes.py
 
+from datetime import date
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -9,10 +10,12 @@ from app.database import get_db
 from app.routers.auth import get_current_user
 from app.models.user import UserRole
 from app.modules.audit_log.service import log_event
+from app.modules.notifications.service import notify
 
-from .models import Dispute
-from .schemas import DisputeCreate, DisputeOut, DisputeUpdate, DisputeAdminUpdate
+from .models import Dispute, DisputeStatus
+from .schemas import AdminDisputePage, DisputeCreate, DisputeOut, DisputeUpdate, DisputeAdminUpdate
 from .service import create_dispute as create_dispute_service
+from .service import list_disputes_for_admin
 
 
 router = APIRouter(prefix="/api/disputes", tags=["Disputes"])
@@ -149,7 +152,7 @@ def client_update_dispute(
     if dispute.client_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not allowed to update this dispute")
 
-    if str(dispute.status).upper() != "PENDING":
+    if dispute.status != DisputeStatus.PENDING.value:
         raise HTTPException(
             status_code=400,
             detail="Only PENDING disputes can be updated by client",
@@ -168,20 +171,37 @@ def client_update_dispute(
 # -------------------------
 # ADMIN
 # -------------------------
-@admin_router.get("", response_model=List[DisputeOut])
+@admin_router.get("", response_model=AdminDisputePage)
 def admin_list_disputes(
     status: Optional[str] = Query(None, description="PENDING or RESOLVED or REJECTED"),
+    client_id: Optional[int] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    cursor: Optional[int] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     if not _is_admin(current_user):
         raise HTTPException(status_code=403, detail="Admin only")
 
-    q = db.query(Dispute)
     if status:
-        q = q.filter(Dispute.status == status.upper())
+        status = status.upper()
+        if status not in DisputeStatus.__members__:
+            raise HTTPException(status_code=400, detail="Invalid status")
+    if created_from and created_to and created_from > created_to:
+        raise HTTPException(status_code=400, detail="created_from must be on or before created_to")
 
-    return q.order_by(Dispute.id.desc()).all()
+    items, next_cursor, counts = list_disputes_for_admin(
+        db,
+        status=status,
+        client_id=client_id,
+        created_from=created_from,
+        created_to=created_to,
+        cursor=cursor,
+        limit=limit,
+    )
+    return AdminDisputePage(items=items, next_cursor=next_cursor, counts=counts)
 
 
 @admin_router.get("/{dispute_id}", response_model=DisputeOut)
@@ -210,11 +230,24 @@ def admin_resolve_dispute(
 
     dispute = _get_dispute_or_404(db, dispute_id)
 
+    previous_status, previous_note = dispute.status, dispute.admin_note
     if payload.status is not None:
         dispute.status = payload.status.upper()
     if payload.admin_note is not None:
         dispute.admin_note = payload.admin_note
 
+    # only tell the client when something they can see actually changed
+    note_changed = bool(dispute.admin_note) and dispute.admin_note != previous_note
+    if dispute.status != previous_status or note_changed:
+        notify(
+            db,
+            user_ids=[dispute.client_id],
+            kind="dispute.updated",
+            title=f"Dispute {dispute.status.lower()}",
+            body=f"Your dispute \"{dispute.title}\" is now {dispute.status.lower()}."
+            + (f" Note from the admin: {dispute.admin_note}" if note_changed else ""),
+            data={"dispute_id": dispute.id, "status": dispute.status},
+        )
     db.commit()
     db.refresh(dispute)
     log_event(
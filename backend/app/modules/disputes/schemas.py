@@ -1,7 +1,7 @@
 # backend/app/modules/disputes/schemas.py
 
 from datetime import datetime
-from typing import Optional, Literal
+from typing import Dict, List, Optional, Literal
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -52,3 +52,19 @@ class DisputeOut(BaseModel):
     admin_note: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+
+
+class AdminDisputeOut(DisputeOut):
+    """Dispute with the client, booking and lawyer details the admin list shows."""
+    client_name: Optional[str] = None
+    client_email: Optional[str] = None
+    booking_status: Optional[str] = None
+    booking_scheduled_at: Optional[datetime] = None
+    lawyer_id: Optional[int] = None
+    lawyer_name: Optional[str] = None
+
+
+class AdminDisputePage(BaseModel):
+    items: List[AdminDisputeOut]
+    next_cursor: Optional[int] = None
+    counts: Dict[str, int]
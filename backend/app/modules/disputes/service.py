@@ -1,9 +1,14 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import sqlalchemy as sa
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 
 from app.models.booking import Booking
+from app.models.user import User
 
-from .models import Dispute
+from .models import Dispute, DisputeStatus
 
 
 def create_dispute(db: Session, client_id: int, booking_id: int, title: str, description: str) -> Dispute:
@@ -34,3 +39,66 @@ def create_dispute(db: Session, client_id: int, booking_id: int, title: str, des
     db.commit()
     db.refresh(dispute)
     return dispute
+
+
+def list_disputes_for_admin(
+    db: Session,
+    *,
+    status: Optional[str] = None,
+    client_id: Optional[int] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    cursor: Optional[int] = None,
+    limit: int = 50,
+) -> Tuple[List[sa.Row], Optional[int], Dict[str, int]]:
+    """One page of disputes (newest first) with client, booking and lawyer
+    columns, the next page's cursor, and per-status counts.
+
+    The page is keyset-paged on ``id`` (``ix_disputes_status_id``). The counts
+    apply every filter except ``status`` so the admin UI can label its tabs.
+    """
+    filters = []
+    if client_id is not None:
+        filters.append(Dispute.client_id == client_id)
+    if created_from is not None:
+        filters.append(Dispute.created_at >= created_from)
+    if created_to is not None:
+        filters.append(Dispute.created_at < created_to + timedelta(days=1))
+
+    counts = {s.value: 0 for s in DisputeStatus}
+    counts.update(
+        db.execute(
+            sa.select(Dispute.status, sa.func.count()).where(*filters).group_by(Dispute.status)
+        ).all()
+    )
+
+    page_filters = list(filters)
+    if status:
+        page_filters.append(Dispute.status == status)
+    if cursor is not None:
+        page_filters.append(Dispute.id < cursor)
+
+    client = aliased(User)
+    lawyer = aliased(User)
+    rows = db.execute(
+        sa.select(
+            *Dispute.__table__.columns,
+            client.full_name.label("client_name"),
+            client.email.label("client_email"),
+            Booking.status.label("booking_status"),
+            Booking.scheduled_at.label("booking_scheduled_at"),
+            Booking.lawyer_id,
+            lawyer.full_name.label("lawyer_name"),
+        )
+        .join(client, client.id == Dispute.client_id)
+        .outerjoin(Booking, Booking.id == Dispute.booking_id)
+        .outerjoin(lawyer, lawyer.id == Booking.lawyer_id)
+        .where(*page_filters)
+        .order_by(Dispute.id.desc())
+        .limit(limit + 1)
+    ).all()
+
+    if len(rows) <= limit:
+        return rows, None, counts
+    rows = rows[:limit]
+    return rows, rows[-1].id, counts
@@ -1,8 +1,11 @@
 # backend/app/modules/documents/models.py
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Computed, Integer, String, DateTime, ForeignKey, Index, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.database import Base
+from app.modules.storage.models import SEARCH_CONFIG
 
 
 class Document(Base):
@@ -27,10 +30,27 @@ class Document(Base):
     # Keep nullable unless you changed DB to NOT NULL.
     original_filename = Column(String(255), nullable=True)
 
-    file_path = Column(String(500), nullable=False)
+    file_path = Column(String(500), nullable=False, index=True)
+    # Content hash of the shared blob behind file_path (NULL for legacy uploads)
+    blob_sha256 = Column(String(64), ForeignKey("storage_blobs.sha256"), nullable=True, index=True)
 
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    # Title + filename for search; the file content is indexed on its blob
+    search_tsv = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"to_tsvector('{SEARCH_CONFIG}', coalesce(title, '') || ' ' || coalesce(original_filename, ''))",
+                persisted=True,
+            ),
+        )
+    )
+
+    __table_args__ = (
+        Index("ix_documents_search_tsv", "search_tsv", postgresql_using="gin"),
+    )
+
 
 class DocumentComment(Base):
     __tablename__ = "document_comments"
@@ -41,3 +61,13 @@ class DocumentComment(Base):
     created_by_user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
     created_by_role = Column(String(32), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # latest-comment lookups and per-document counts in document listings
+        Index("ix_document_comments_document_id_created_at", "document_id", created_at.desc()),
+        Index(
+            "ix_document_comments_comment_tsv",
+            func.to_tsvector(SEARCH_CONFIG, comment_text),
+            postgresql_using="gin",
+        ),
+    )
@@ -1,29 +1,38 @@
 # backend/app/modules/documents/routes.py
 
-from typing import Optional, List
+import os
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, status
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.routers.auth import get_current_user
 from app.modules.cases.models import Case
+from app.modules.cases.service import can_access_case
 from app.models.booking import Booking
+from app.modules.storage.backends import get_storage
+from app.modules.storage.blobs import attach_file_urls
+from app.modules.storage.models import SCAN_AVAILABLE
+from app.modules.storage.serving import ensure_servable, rendition_key, serve_stored_file
+from app.modules.storage.zipstream import stream_zip, unique_arcnames
 
 from .schema import DocumentOut, DocumentCommentOut, DocumentCommentCreate
 from .service import (
     save_upload,
     create_document,
     create_document_for_case,
-    list_documents,
+    create_documents_for_case_bulk,
+    list_documents_with_meta,
     get_documents_by_case,
     get_document,
     list_document_comments,
     create_document_comment,
-    get_document_comment_meta,
     delete_document,
     resolve_case_id_from_booking,
+    search_documents,
 )
 
 router = APIRouter(prefix="/api/documents", tags=["Documents"])
@@ -78,37 +87,17 @@ def _ensure_can_access_booking_docs(current_user: User, booking: Booking):
     raise HTTPException(status_code=403, detail="Not allowed")
 
 
-def _can_access_case(user: User, case: Case, db: Session) -> bool:
-    if _is_admin(user):
-        return True
-
-    if _is_client(user) and getattr(case, "client_id", None) == user.id:
-        return True
-
-    if _is_lawyer(user):
-        linked = (
-            db.query(Booking)
-            .filter(Booking.case_id == case.id, Booking.lawyer_id == user.id)
-            .first()
-        )
-        if linked:
-            return True
-
-    return False
-
-
 def _attach_comment_meta(db: Session, docs: List):
     if not docs:
         return docs
 
-    doc_ids = [d.id for d in docs]
-    counts, latest = get_document_comment_meta(db, doc_ids)
+    # the query annotates the same identity-mapped instances
+    list_documents_with_meta(db, doc_ids=[d.id for d in docs])
+    return docs
 
-    for d in docs:
-        setattr(d, "comment_count", counts.get(d.id, 0))
-        setattr(d, "latest_comment", latest.get(d.id))
 
-    return docs
+def _attach_file_urls(db: Session, docs: List):
+    return attach_file_urls(db, docs, path_attr="file_path", filename_attr="original_filename", route=router.prefix)
 
 
 # -------------------------
@@ -124,11 +113,10 @@ def list_case_documents(
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
 
-    if not _can_access_case(current_user, case, db):
+    if not can_access_case(db, current_user, case):
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    docs = get_documents_by_case(db, case_id)
-    return _attach_comment_meta(db, docs)
+    return _attach_file_urls(db, list_documents_with_meta(db, case_id=case_id))
 
 
 @router.post("/by-case/{case_id}", response_model=DocumentOut, status_code=status.HTTP_201_CREATED)
@@ -144,26 +132,82 @@ def upload_case_document(
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
 
-    if not _can_access_case(current_user, case, db):
+    if not can_access_case(db, current_user, case):
         raise HTTPException(status_code=403, detail="Not allowed")
 
     safe_title = (title or file_name or file.filename or "Untitled").strip()
-    file_path = save_upload(file)
+    stored = save_upload(db, file)
 
     doc = create_document_for_case(
         db,
         case_id=case_id,
         title=safe_title,
-        file_path=file_path,
+        file_path=stored.path,
+        blob_sha256=stored.sha256,
         uploaded_by_user_id=current_user.id,
         uploaded_by_role=_role_str(current_user),
         original_filename=file.filename or safe_title,
     )
 
-    _attach_comment_meta(db, [doc])
+    _attach_file_urls(db, _attach_comment_meta(db, [doc]))
     return doc
 
 
+MAX_BULK_FILES = 50
+
+
+@router.post("/by-case/{case_id}/bulk", response_model=List[DocumentOut], status_code=status.HTTP_201_CREATED)
+def upload_case_documents_bulk(
+    case_id: int,
+    files: List[UploadFile] = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if len(files) > MAX_BULK_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_FILES} files per upload")
+
+    case = db.query(Case).filter(Case.id == case_id).first()
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
+
+    if not can_access_case(db, current_user, case):
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    docs = create_documents_for_case_bulk(
+        db,
+        case_id=case_id,
+        files=files,
+        uploaded_by_user_id=current_user.id,
+        uploaded_by_role=_role_str(current_user),
+    )
+    return _attach_file_urls(db, _attach_comment_meta(db, docs))
+
+
+@router.get("/by-case/{case_id}/zip")
+def download_case_documents_zip(
+    case_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    case = db.query(Case).filter(Case.id == case_id).first()
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
+
+    if not can_access_case(db, current_user, case):
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    # files still being scanned or quarantined are left out of the bundle
+    docs = [d for d in _attach_file_urls(db, get_documents_by_case(db, case_id)) if d.scan_status == SCAN_AVAILABLE]
+    names = unique_arcnames(d.original_filename or os.path.basename(d.file_path) for d in docs)
+    entries = [(name, d.file_path) for name, d in zip(names, docs)]
+
+    return StreamingResponse(
+        stream_zip(get_storage(), entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="case-{case_id}-documents.zip"'},
+    )
+
+
 # -------------------------
 # BOOKING upload/list
 # -------------------------
@@ -180,7 +224,7 @@ def upload_document(
     _ensure_can_access_booking_docs(current_user, booking)
 
     safe_title = (title or file_name or file.filename or "Untitled").strip()
-    file_path = save_upload(file)
+    stored = save_upload(db, file)
     case_id = resolve_case_id_from_booking(db, booking_id)
 
     doc = create_document(
@@ -191,10 +235,11 @@ def upload_document(
         uploaded_by_role=_role_str(current_user),
         title=safe_title,
         original_filename=file.filename or safe_title,
-        file_path=file_path,
+        file_path=stored.path,
+        blob_sha256=stored.sha256,
     )
 
-    _attach_comment_meta(db, [doc])
+    _attach_file_urls(db, _attach_comment_meta(db, [doc]))
     return doc
 
 
@@ -207,8 +252,18 @@ def get_documents(
     booking = _get_booking_or_404(db, booking_id)
     _ensure_can_access_booking_docs(current_user, booking)
 
-    docs = list_documents(db, booking_id=booking_id)
-    return _attach_comment_meta(db, docs)
+    return _attach_file_urls(db, list_documents_with_meta(db, booking_id=booking_id))
+
+
+@router.get("/search", response_model=List[DocumentOut])
+def search_documents_route(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Full-text search over titles, extracted file text and comments."""
+    return _attach_file_urls(db, search_documents(db, current_user, q, limit=limit))
 
 
 @router.get("/{doc_id}", response_model=DocumentOut)
@@ -224,10 +279,76 @@ def get_document_by_id(
     booking = _get_booking_or_404(db, doc.booking_id)
     _ensure_can_access_booking_docs(current_user, booking)
 
-    _attach_comment_meta(db, [doc])
+    _attach_file_urls(db, _attach_comment_meta(db, [doc]))
+    return doc
+
+
+def _ensure_can_access_document(db: Session, current_user: User, doc) -> None:
+    if doc.booking_id is not None:
+        _ensure_can_access_booking_docs(current_user, _get_booking_or_404(db, doc.booking_id))
+        return
+
+    case = db.query(Case).filter(Case.id == doc.case_id).first() if doc.case_id is not None else None
+    if case is not None and can_access_case(db, current_user, case):
+        return
+    if _is_admin(current_user) or doc.uploaded_by_user_id == current_user.id:
+        return
+    raise HTTPException(status_code=403, detail="Not allowed")
+
+
+def _get_accessible_document(db: Session, current_user: User, doc_id: int):
+    doc = get_document(db, doc_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    _ensure_can_access_document(db, current_user, doc)
     return doc
 
 
+@router.get("/{doc_id}/content")
+def get_document_content(
+    doc_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Authorised download. Range/If-Range come from FileResponse; the file
+    itself is streamed by the server (pathsend where supported), not read here."""
+    doc = _get_accessible_document(db, current_user, doc_id)
+    ensure_servable(db, doc.blob_sha256)
+    filename = doc.original_filename or doc.title or os.path.basename(doc.file_path)
+    return serve_stored_file(request, doc.file_path, filename=filename, immutable_tag=doc.blob_sha256)
+
+
+def _serve_rendition(db: Session, current_user: User, request: Request, doc_id: int, rendition: str):
+    doc = _get_accessible_document(db, current_user, doc_id)
+    key = rendition_key(ensure_servable(db, doc.blob_sha256), rendition)
+    return serve_stored_file(
+        request, key, filename=os.path.basename(key), immutable_tag=f"{doc.blob_sha256}-{rendition}"
+    )
+
+
+@router.get("/{doc_id}/thumbnail")
+def get_document_thumbnail(
+    doc_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Thumbnail rendered by the background preview job."""
+    return _serve_rendition(db, current_user, request, doc_id, "thumbnail")
+
+
+@router.get("/{doc_id}/preview")
+def get_document_preview(
+    doc_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """First-page preview rendered by the background preview job."""
+    return _serve_rendition(db, current_user, request, doc_id, "preview")
+
+
 @router.get("/{doc_id}/comments", response_model=List[DocumentCommentOut])
 def get_document_comments(
     doc_id: int,
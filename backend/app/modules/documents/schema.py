@@ -27,6 +27,11 @@ class DocumentOut(BaseModel):
     case_id: Optional[int] = None
     title: Optional[str] = None
     file_path: str
+    # pending_scan / available / quarantined; URLs are only set when available
+    scan_status: str = "available"
+    download_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    preview_url: Optional[str] = None
     uploaded_at: datetime
     comment_count: int = 0
     latest_comment: Optional[DocumentCommentOut] = None
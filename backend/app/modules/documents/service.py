@@ -1,16 +1,19 @@
 # backend/app/modules/documents/service.py
 
-import os
-from uuid import uuid4
 from typing import Optional
 
 from fastapi import UploadFile
-from sqlalchemy import and_, func
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, exists, false, func, or_, select, true, union_all
+from sqlalchemy.orm import Session, aliased
 
-from .models import Document, DocumentComment
+from app.models.booking import Booking
+from app.models.user import User, UserRole
+from app.modules.cases.models import Case
+from app.modules.storage.blobs import delete_after_commit, release_blob, store_upload
+from app.modules.storage.models import SCAN_AVAILABLE, SEARCH_CONFIG, StorageBlob
+from app.modules.storage.writer import StoredFile
 
-UPLOAD_DIR = "uploads/documents"
+from .models import Document, DocumentComment
 
 
 def _norm_path(p: str) -> str:
@@ -18,17 +21,9 @@ def _norm_path(p: str) -> str:
     return p.replace("\\", "/")
 
 
-def save_upload(file: UploadFile) -> str:
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-    ext = os.path.splitext(file.filename or "")[1]
-    filename = f"{uuid4().hex}{ext}"
-    path = os.path.join(UPLOAD_DIR, filename)
-
-    with open(path, "wb") as f:
-        f.write(file.file.read())
-
-    return _norm_path(path)
+def save_upload(db: Session, file: UploadFile) -> StoredFile:
+    """Store the upload as a shared blob and take a reference on it. Committed with the document row."""
+    return store_upload(db, file)
 
 
 def create_document(
@@ -40,6 +35,7 @@ def create_document(
     title: str,
     original_filename: str | None,
     file_path: str,
+    blob_sha256: str | None = None,
 ) -> Document:
     doc = Document(
         booking_id=booking_id,
@@ -49,6 +45,7 @@ def create_document(
         title=title,
         original_filename=original_filename,
         file_path=_norm_path(file_path),
+        blob_sha256=blob_sha256,
     )
     db.add(doc)
     db.commit()
@@ -90,11 +87,10 @@ def delete_document(db: Session, doc_id: int) -> bool:
     if not doc:
         return False
 
-    if doc.file_path and os.path.exists(doc.file_path):
-        try:
-            os.remove(doc.file_path)
-        except OSError:
-            pass
+    if doc.blob_sha256:
+        release_blob(db, doc.blob_sha256)
+    else:
+        delete_after_commit(db, doc.file_path)
 
     db.delete(doc)
     db.commit()
@@ -110,6 +106,7 @@ def create_document_for_case(
     uploaded_by_user_id: int | None = None,
     uploaded_by_role: str | None = None,
     original_filename: str | None = None,
+    blob_sha256: str | None = None,
 ) -> Document:
     doc = Document(
         case_id=case_id,
@@ -119,6 +116,7 @@ def create_document_for_case(
         title=title,
         original_filename=original_filename,
         file_path=_norm_path(file_path),
+        blob_sha256=blob_sha256,
     )
     db.add(doc)
     db.commit()
@@ -126,6 +124,42 @@ def create_document_for_case(
     return doc
 
 
+def create_documents_for_case_bulk(
+    db: Session,
+    case_id: int,
+    files: list[UploadFile],
+    uploaded_by_user_id: int | None = None,
+    uploaded_by_role: str | None = None,
+) -> list[Document]:
+    """Store every file and insert all document rows in one transaction."""
+    docs = []
+    try:
+        for file in files:
+            stored = save_upload(db, file)
+            title = (file.filename or "Untitled").strip()
+            doc = Document(
+                case_id=case_id,
+                uploaded_by_user_id=uploaded_by_user_id,
+                uploaded_by_role=uploaded_by_role,
+                title=title,
+                original_filename=file.filename or title,
+                file_path=_norm_path(stored.path),
+                blob_sha256=stored.sha256,
+            )
+            db.add(doc)
+            docs.append(doc)
+        db.flush()
+        ids = [d.id for d in docs]
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    # one SELECT reloads every row (server defaults) instead of a refresh per row
+    by_id = {d.id: d for d in db.query(Document).filter(Document.id.in_(ids)).all()}
+    return [by_id[i] for i in ids]
+
+
 def list_document_comments(db: Session, document_id: int):
     return (
         db.query(DocumentComment)
@@ -154,43 +188,127 @@ def create_document_comment(
     return comment
 
 
-def get_document_comment_meta(db: Session, doc_ids: list[int]):
-    if not doc_ids:
-        return {}, {}
-
-    counts = dict(
-        db.query(DocumentComment.document_id, func.count(DocumentComment.id))
-        .filter(DocumentComment.document_id.in_(doc_ids))
-        .group_by(DocumentComment.document_id)
-        .all()
+def list_documents_with_meta(
+    db: Session,
+    *,
+    booking_id: Optional[int] = None,
+    case_id: Optional[int] = None,
+    doc_ids: Optional[list[int]] = None,
+) -> list[Document]:
+    """Documents plus comment_count, latest_comment and their blob in one query.
+
+    Latest comment comes from a LATERAL ``ORDER BY created_at DESC LIMIT 1``
+    and the count from a correlated subquery; both are served by
+    ix_document_comments_document_id_created_at. The results are set as
+    attributes on the Document instances.
+    """
+    latest = (
+        select(DocumentComment)
+        .where(DocumentComment.document_id == Document.id)
+        .order_by(DocumentComment.created_at.desc(), DocumentComment.id.desc())
+        .limit(1)
+        .lateral("latest_comment")
+    )
+    LatestComment = aliased(DocumentComment, latest)
+    comment_count = (
+        select(func.count())
+        .select_from(DocumentComment)
+        .where(DocumentComment.document_id == Document.id)
+        .correlate(Document)
+        .scalar_subquery()
     )
 
-    latest_subq = (
-        db.query(
-            DocumentComment.document_id.label("document_id"),
-            func.max(DocumentComment.created_at).label("max_created_at"),
-        )
-        .filter(DocumentComment.document_id.in_(doc_ids))
-        .group_by(DocumentComment.document_id)
-        .subquery()
+    stmt = (
+        select(Document, comment_count, LatestComment, StorageBlob)
+        .select_from(Document)
+        .outerjoin(LatestComment, true())
+        .outerjoin(StorageBlob, StorageBlob.sha256 == Document.blob_sha256)
+    )
+    if booking_id is not None:
+        stmt = stmt.where(Document.booking_id == booking_id).order_by(Document.id.desc())
+    elif case_id is not None:
+        stmt = stmt.where(Document.case_id == case_id).order_by(Document.uploaded_at.desc())
+    if doc_ids is not None:
+        stmt = stmt.where(Document.id.in_(doc_ids)).order_by(Document.id.desc())
+
+    docs = []
+    for doc, count, latest_comment, blob in db.execute(stmt).all():
+        setattr(doc, "comment_count", count or 0)
+        setattr(doc, "latest_comment", latest_comment)
+        setattr(doc, "storage_blob", blob)
+        docs.append(doc)
+    return docs
+
+
+def _visible_to(user: User):
+    """SQL form of the document access rules in the routes."""
+    if user.role == UserRole.admin:
+        return true()
+
+    if user.role == UserRole.client:
+        booking_ok = Booking.client_id == user.id
+        case_ok = Case.client_id == user.id
+    elif user.role == UserRole.lawyer:
+        CaseBooking = aliased(Booking)
+        booking_ok = Booking.lawyer_id == user.id
+        case_ok = exists().where(CaseBooking.case_id == Document.case_id, CaseBooking.lawyer_id == user.id)
+    else:
+        booking_ok = case_ok = false()
+
+    return or_(
+        and_(Document.booking_id.is_not(None), booking_ok),
+        and_(Document.booking_id.is_(None), or_(case_ok, Document.uploaded_by_user_id == user.id)),
     )
 
-    latest_rows = (
-        db.query(DocumentComment)
-        .join(
-            latest_subq,
-            and_(
-                DocumentComment.document_id == latest_subq.c.document_id,
-                DocumentComment.created_at == latest_subq.c.max_created_at,
-            ),
-        )
-        .order_by(DocumentComment.id.desc())
-        .all()
+
+def _scan_cleared_for(user: User):
+    """Files still being scanned or quarantined are only listed for their uploader."""
+    return or_(
+        Document.uploaded_by_user_id == user.id,
+        Document.blob_sha256.is_(None),
+        StorageBlob.scan_status == SCAN_AVAILABLE,
     )
 
-    latest = {}
-    for row in latest_rows:
-        if row.document_id not in latest:
-            latest[row.document_id] = row
 
-    return counts, latest
+def search_documents(db: Session, user: User, query: str, *, limit: int = 20) -> list[Document]:
+    """Documents the user may see whose title, content or comments match ``query``.
+
+    ``query`` uses web-search syntax (quotes, ``or``, ``-word``). Each source
+    is matched through its own GIN index, the hits are summed per document
+    and the access and scan rules are applied in the same statement, so only
+    the requested page ever leaves the database.
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    comment_tsv = func.to_tsvector(SEARCH_CONFIG, DocumentComment.comment_text)
+
+    hits = union_all(
+        # a title hit is worth more than the same words deep in the content
+        select(Document.id.label("document_id"), (func.ts_rank(Document.search_tsv, tsquery) * 2).label("rank"))
+        .where(Document.search_tsv.op("@@")(tsquery)),
+        select(Document.id, func.ts_rank(StorageBlob.content_tsv, tsquery))
+        .join(StorageBlob, StorageBlob.sha256 == Document.blob_sha256)
+        .where(StorageBlob.content_tsv.op("@@")(tsquery)),
+        select(DocumentComment.document_id, func.ts_rank(comment_tsv, tsquery))
+        .where(comment_tsv.op("@@")(tsquery)),
+    ).subquery("hits")
+    ranked = (
+        select(hits.c.document_id, func.sum(hits.c.rank).label("rank"))
+        .group_by(hits.c.document_id)
+        .subquery("ranked")
+    )
+
+    rows = db.execute(
+        select(Document.id)
+        .join(ranked, ranked.c.document_id == Document.id)
+        .outerjoin(Booking, Booking.id == Document.booking_id)
+        .outerjoin(Case, Case.id == Document.case_id)
+        .outerjoin(StorageBlob, StorageBlob.sha256 == Document.blob_sha256)
+        .where(_visible_to(user), _scan_cleared_for(user))
+        .order_by(ranked.c.rank.desc(), Document.id.desc())
+        .limit(limit)
+    ).scalars().all()
+    if not rows:
+        return []
+
+    by_id = {doc.id: doc for doc in list_documents_with_meta(db, doc_ids=rows)}
+    return [by_id[doc_id] for doc_id in rows if doc_id in by_id]
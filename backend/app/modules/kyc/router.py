@@ -1,13 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.kyc_submission import KYCSubmission
-from app.modules.kyc.schemas import KYCSubmitRequest, KYCResponse
+from app.modules.kyc.schemas import (
+    KYCBulkDecisionRequest,
+    KYCBulkDecisionResponse,
+    KYCQueuePage,
+    KYCResponse,
+    KYCSubmitRequest,
+)
+from app.modules.kyc import service as kyc_service
 from app.routers.auth import get_current_user
 from app.models.user import User, UserRole
 from app.models.lawyer import Lawyer
-from app.modules.audit_log.service import log_event
 
 
 router = APIRouter(prefix="/api/kyc", tags=["KYC"])
@@ -130,6 +138,47 @@ def _get_submission_or_404(db: Session, submission_id: int) -> KYCSubmission:
     return submission
 
 
+@admin_router.get("/queue", response_model=KYCQueuePage)
+def kyc_review_queue(
+    status: str = "pending",
+    min_age_hours: Optional[int] = Query(None, ge=0),
+    max_age_hours: Optional[int] = Query(None, ge=0),
+    limit: int = Query(50, ge=1, le=kyc_service.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    _require_admin(current_user)
+
+    status = status.lower()
+    if status != "all" and status not in kyc_service.STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status")
+
+    items, next_cursor = kyc_service.review_queue(
+        db,
+        status=None if status == "all" else status,
+        min_age_hours=min_age_hours,
+        max_age_hours=max_age_hours,
+        limit=limit,
+        cursor=cursor,
+    )
+    return KYCQueuePage(items=items, next_cursor=next_cursor)
+
+
+@admin_router.post("/bulk", response_model=KYCBulkDecisionResponse)
+def bulk_decide_submissions(
+    payload: KYCBulkDecisionRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    _require_admin(current_user)
+    updated = kyc_service.decide_submissions(
+        db, submission_ids=payload.submission_ids, decision=payload.decision, admin=current_user
+    )
+    skipped = sorted(set(payload.submission_ids) - set(updated))
+    return KYCBulkDecisionResponse(decision=payload.decision, updated=updated, skipped=skipped)
+
+
 @admin_router.patch("/{submission_id}/approve", response_model=KYCResponse)
 def approve_submission(
     submission_id: int,
@@ -138,16 +187,8 @@ def approve_submission(
 ):
     _require_admin(current_user)
     submission = _get_submission_or_404(db, submission_id)
-    submission.status = "approved"
-    db.commit()
+    kyc_service.decide_submissions(db, submission_ids=[submission.id], decision="approve", admin=current_user)
     db.refresh(submission)
-    log_event(
-        db,
-        user=current_user,
-        action="KYC_APPROVED",
-        description=f"KYC submission {submission.id} approved",
-        meta={"submission_id": submission.id, "lawyer_id": submission.lawyer_id},
-    )
     return submission
 
 
@@ -159,14 +200,6 @@ def reject_submission(
 ):
     _require_admin(current_user)
     submission = _get_submission_or_404(db, submission_id)
-    submission.status = "rejected"
-    db.commit()
+    kyc_service.decide_submissions(db, submission_ids=[submission.id], decision="reject", admin=current_user)
     db.refresh(submission)
-    log_event(
-        db,
-        user=current_user,
-        action="KYC_REJECTED",
-        description=f"KYC submission {submission.id} rejected",
-        meta={"submission_id": submission.id, "lawyer_id": submission.lawyer_id},
-    )
     return submission
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 from datetime import datetime
 
 
@@ -28,3 +28,19 @@ class KYCResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class KYCQueuePage(BaseModel):
+    items: List[KYCResponse]
+    next_cursor: Optional[str] = None
+
+
+class KYCBulkDecisionRequest(BaseModel):
+    submission_ids: List[int] = Field(..., min_length=1, max_length=500)
+    decision: Literal["approve", "reject"]
+
+
+class KYCBulkDecisionResponse(BaseModel):
+    decision: str
+    updated: List[int]
+    skipped: List[int]
@@ -0,0 +1,121 @@
+"""Admin KYC review: keyset-paged queue and batched decisions.
+
+The queue is read oldest first by ``(submitted_at, id)``, which
+``ix_kyc_submissions_status_submitted_at`` serves for a status filter, so a
+page costs the same at the end of an onboarding wave as at the start. The
+cursor is the last row's sort key, opaque to clients.
+
+A decision (one submission or a batch) is a single transaction: the status
+update, the matching ``lawyer_profiles.is_verified`` flag and one audit row
+per changed submission are committed together. A rejection un-verifies a
+lawyer only if none of their submissions is still approved.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.models.kyc_submission import KYCSubmission
+from app.models.lawyer import Lawyer
+from app.models.user import User
+from app.pagination import decode_cursor, encode_cursor
+from app.modules.audit_log.service import log_event
+from app.modules.lawyer_profiles.models import LawyerProfile
+
+STATUSES = ("pending", "approved", "rejected")
+MAX_PAGE_SIZE = 200
+
+# decision -> (new status, is_verified, audit action)
+DECISIONS = {
+    "approve": ("approved", True, "KYC_APPROVED"),
+    "reject": ("rejected", False, "KYC_REJECTED"),
+}
+
+
+def review_queue(
+    db: Session,
+    *,
+    status: Optional[str] = "pending",
+    min_age_hours: Optional[int] = None,
+    max_age_hours: Optional[int] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Tuple[List[KYCSubmission], Optional[str]]:
+    """One page of submissions, oldest first, and the cursor of the next page."""
+    query = db.query(KYCSubmission)
+    if status:
+        query = query.filter(KYCSubmission.status == status)
+
+    now = datetime.now(timezone.utc)
+    if min_age_hours is not None:
+        query = query.filter(KYCSubmission.submitted_at <= now - timedelta(hours=min_age_hours))
+    if max_age_hours is not None:
+        query = query.filter(KYCSubmission.submitted_at >= now - timedelta(hours=max_age_hours))
+    if cursor:
+        after = decode_cursor(cursor)
+        query = query.filter(sa.tuple_(KYCSubmission.submitted_at, KYCSubmission.id) > after)
+
+    rows = query.order_by(KYCSubmission.submitted_at, KYCSubmission.id).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].submitted_at, rows[-1].id)
+
+
+def decide_submissions(
+    db: Session, *, submission_ids: Iterable[int], decision: str, admin: User
+) -> List[int]:
+    """Apply ``decision`` to the submissions and return the ids that changed.
+
+    Ids that do not exist or already carry the target status are left alone
+    and get no audit entry.
+    """
+    new_status, verified, action = DECISIONS[decision]
+    ids = sorted(set(submission_ids))
+    if not ids:
+        return []
+
+    # lock in id order so two overlapping batches cannot deadlock
+    locked = (
+        sa.select(KYCSubmission.id)
+        .where(KYCSubmission.id.in_(ids), KYCSubmission.status.is_distinct_from(new_status))
+        .order_by(KYCSubmission.id)
+        .with_for_update()
+    )
+    changed = db.execute(
+        sa.update(KYCSubmission)
+        .where(KYCSubmission.id.in_(locked.scalar_subquery()))
+        .values(status=new_status)
+        .returning(KYCSubmission.id, KYCSubmission.lawyer_id)
+        .execution_options(synchronize_session="fetch")
+    ).all()
+    if not changed:
+        db.commit()
+        return []
+
+    # kyc_submissions.lawyer_id is lawyers.id; profiles are keyed by users.id
+    lawyer_ids = {lawyer_id for _, lawyer_id in changed}
+    users = sa.select(User.id).join(Lawyer, Lawyer.email == User.email).where(Lawyer.id.in_(lawyer_ids))
+    if not verified:
+        approved = sa.exists().where(KYCSubmission.lawyer_id == Lawyer.id, KYCSubmission.status == "approved")
+        users = users.where(~approved)
+    db.execute(
+        sa.update(LawyerProfile)
+        .where(LawyerProfile.user_id.in_(users))
+        .values(is_verified=verified)
+        .execution_options(synchronize_session=False)
+    )
+
+    for submission_id, lawyer_id in changed:
+        log_event(
+            db,
+            user=admin,
+            action=action,
+            description=f"KYC submission {submission_id} {new_status}",
+            meta={"submission_id": submission_id, "lawyer_id": lawyer_id},
+            commit=False,
+        )
+    db.commit()
+    return sorted(submission_id for submission_id, _ in changed)
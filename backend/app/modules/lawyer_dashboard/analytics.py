@@ -0,0 +1,256 @@
+"""Lawyer analytics: calendar utilization, request conversion and revenue.
+
+Per-day facts for one lawyer:
+
+- ``available_minutes``: active ``weekly_availability`` windows for that
+  weekday, zero on a blackout day.
+- ``booked_minutes`` / ``revenue``: confirmed or completed bookings
+  scheduled that day, using the service package's duration and price
+  (``FALLBACK_BOOKING_MINUTES`` without a package).
+- ``requests`` / ``confirmed``: bookings created that day, and how many of
+  them are now confirmed or completed.
+
+Finished days (before today) are stored in ``lawyer_daily_facts`` by the
+``lawyer_daily_facts_fill`` scheduler job, one set-based INSERT per lawyer
+for the days that have no row yet. A booking change for a past day deletes
+that day's row (flush hook below) so the job rebuilds it. Reads never
+write: days without a stored row (today, the future, and past days the job
+has not filled yet) are computed live in the same statement. Bucketing,
+trailing rates, running revenue and totals are window functions over the
+days, so no Python loop touches the rows.
+
+Stored facts are a snapshot: they keep the availability and the package
+prices they were computed with. Bookings do not record what was charged,
+so a price edit changes the revenue of today, the future and any past day
+rebuilt after the edit, but not of days already stored.
+"""
+
+import os
+from datetime import date, timedelta
+from typing import List
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.booking import BUSY_BOOKING_STATUSES, Booking
+from app.models.user import User, UserRole
+from app.modules.lawyer_dashboard.cache import dashboard_cache
+from app.modules.lawyer_dashboard.models import LawyerDailyFact
+
+GRANULARITIES = ("day", "week", "month")
+MAX_RANGE_DAYS = 731
+TRAILING_BUCKETS = 7
+FALLBACK_BOOKING_MINUTES = 30
+
+_BUSY = ", ".join(f"'{s}'" for s in BUSY_BOOKING_STATUSES)
+
+# Facts for the days selected by {days}. lawyer_row maps users.id to the
+# lawyers.id that weekly_availability is keyed on (by email, as elsewhere).
+_FACTS_CTES = """
+days AS ({days}),
+lawyer_row AS (
+    SELECT l.id FROM lawyers l JOIN users u ON u.email = l.email WHERE u.id = :lawyer_id
+),
+available AS (
+    SELECT days.day, sum(EXTRACT(EPOCH FROM w.end_time - w.start_time) / 60)::int AS minutes
+    FROM days
+    JOIN weekly_availability w
+      ON w.lawyer_id IN (SELECT id FROM lawyer_row)
+     AND w.is_active
+     AND w.day_of_week::text = to_char(days.day, 'FMDAY')
+    WHERE NOT EXISTS (
+        SELECT 1 FROM blackout_days bd WHERE bd.lawyer_id = :lawyer_id AND bd.date = days.day
+    )
+    GROUP BY days.day
+),
+scheduled AS (
+    SELECT CAST(b.scheduled_at AS date) AS day,
+           sum(CASE WHEN sp.duration > 0 THEN sp.duration ELSE :fallback_minutes END) AS minutes,
+           sum(coalesce(sp.price, 0)) AS revenue
+    FROM bookings b
+    LEFT JOIN service_packages sp ON sp.id = b.service_package_id
+    WHERE b.lawyer_id = :lawyer_id
+      AND b.status IN ({busy})
+      AND b.scheduled_at >= (SELECT min(day) FROM days)
+      AND b.scheduled_at < (SELECT max(day) FROM days) + 1
+    GROUP BY 1
+),
+requested AS (
+    SELECT CAST(b.created_at AS date) AS day,
+           count(*) AS requests,
+           count(*) FILTER (WHERE b.status IN ({busy})) AS confirmed
+    FROM bookings b
+    WHERE b.lawyer_id = :lawyer_id
+      AND b.created_at >= (SELECT min(day) FROM days)
+      AND b.created_at < (SELECT max(day) FROM days) + 1
+    GROUP BY 1
+),
+facts AS (
+    SELECT days.day,
+           coalesce(a.minutes, 0) AS available_minutes,
+           coalesce(s.minutes, 0) AS booked_minutes,
+           coalesce(r.requests, 0) AS requests,
+           coalesce(r.confirmed, 0) AS confirmed,
+           coalesce(s.revenue, 0) AS revenue
+    FROM days
+    LEFT JOIN available a ON a.day = days.day
+    LEFT JOIN scheduled s ON s.day = days.day
+    LEFT JOIN requested r ON r.day = days.day
+)
+"""
+
+# Days of [:start, :end] the fill job stores: finished and not stored yet.
+_UNSTORED_PAST_DAYS = """
+    SELECT d::date AS day
+    FROM generate_series(CAST(:start AS date), LEAST(CAST(:end AS date), current_date - 1), interval '1 day') AS d
+    WHERE NOT EXISTS (
+        SELECT 1 FROM lawyer_daily_facts f WHERE f.lawyer_id = :lawyer_id AND f.day = d::date
+    )
+"""
+
+_FILL_SQL = sa.text(
+    "WITH "
+    + _FACTS_CTES.format(busy=_BUSY, days=_UNSTORED_PAST_DAYS)
+    + """
+INSERT INTO lawyer_daily_facts (lawyer_id, day, available_minutes, booked_minutes, requests, confirmed, revenue)
+SELECT :lawyer_id, day, available_minutes, booked_minutes, requests, confirmed, revenue FROM facts
+ON CONFLICT (lawyer_id, day) DO NOTHING
+"""
+)
+
+_SERIES_SQL = sa.text(
+    "WITH "
+    + _FACTS_CTES.format(
+        busy=_BUSY,
+        days="""
+    SELECT d::date AS day
+    FROM generate_series(CAST(:start AS date), CAST(:end AS date), interval '1 day') AS d
+    WHERE d >= current_date
+       OR NOT EXISTS (
+           SELECT 1 FROM lawyer_daily_facts f WHERE f.lawyer_id = :lawyer_id AND f.day = d::date
+       )
+""",
+    )
+    + f""",
+all_days AS (
+    SELECT day, available_minutes, booked_minutes, requests, confirmed, revenue
+    FROM lawyer_daily_facts
+    WHERE lawyer_id = :lawyer_id AND day BETWEEN :start AND LEAST(CAST(:end AS date), current_date - 1)
+    UNION ALL
+    SELECT day, available_minutes, booked_minutes, requests, confirmed, revenue FROM facts
+),
+buckets AS (
+    SELECT CAST(date_trunc(:granularity, day) AS date) AS bucket,
+           sum(available_minutes) AS available_minutes,
+           sum(booked_minutes) AS booked_minutes,
+           sum(requests) AS requests,
+           sum(confirmed) AS confirmed,
+           sum(revenue) AS revenue
+    FROM all_days
+    GROUP BY 1
+)
+SELECT bucket, available_minutes, booked_minutes, requests, confirmed, revenue,
+       booked_minutes::float / NULLIF(available_minutes, 0) AS utilization,
+       confirmed::float / NULLIF(requests, 0) AS conversion,
+       CAST(sum(booked_minutes) OVER recent AS float)
+           / NULLIF(sum(available_minutes) OVER recent, 0) AS rolling_utilization,
+       CAST(sum(confirmed) OVER recent AS float) / NULLIF(sum(requests) OVER recent, 0) AS rolling_conversion,
+       sum(revenue) OVER (ORDER BY bucket) AS cumulative_revenue,
+       revenue - lag(revenue) OVER (ORDER BY bucket) AS revenue_change,
+       sum(available_minutes) OVER () AS total_available_minutes,
+       sum(booked_minutes) OVER () AS total_booked_minutes,
+       sum(requests) OVER () AS total_requests,
+       sum(confirmed) OVER () AS total_confirmed,
+       sum(revenue) OVER () AS total_revenue
+FROM buckets
+WINDOW recent AS (ORDER BY bucket ROWS BETWEEN {TRAILING_BUCKETS - 1} PRECEDING AND CURRENT ROW)
+ORDER BY bucket
+"""
+)
+
+
+def _ttl_seconds() -> float:
+    return float(os.getenv("LAWYER_ANALYTICS_CACHE_SECONDS", "300"))
+
+
+def fill_daily_facts(db: Session, lawyer_id: int, start: date, end: date) -> None:
+    """Store facts for the finished days of ``[start, end]`` that have none yet. Caller commits."""
+    db.execute(
+        _FILL_SQL,
+        {"lawyer_id": lawyer_id, "start": start, "end": end, "fallback_minutes": FALLBACK_BOOKING_MINUTES},
+    )
+
+
+def fill_all_daily_facts(db: Session) -> None:
+    """Scheduler job: store the missing finished days of every lawyer's largest range.
+
+    After the first run this is about one day per lawyer, plus the days a
+    booking change invalidated. Commits per lawyer so locks stay short.
+    """
+    today = date.today()
+    start = today - timedelta(days=MAX_RANGE_DAYS)
+    lawyer_ids = db.execute(sa.select(User.id).where(User.role == UserRole.lawyer).order_by(User.id)).scalars().all()
+    for lawyer_id in lawyer_ids:
+        fill_daily_facts(db, lawyer_id, start, today)
+        db.commit()
+
+
+def get_lawyer_analytics(
+    db: Session, lawyer_id: int, start: date, end: date, granularity: str = "day"
+) -> List[sa.Row]:
+    """One row per bucket of ``[start, end]`` (inclusive), oldest first.
+
+    Besides the bucket's own numbers each row carries the trailing
+    ``TRAILING_BUCKETS`` rates, running revenue and the whole-range totals.
+    """
+    key = ("analytics", start, end, granularity)
+    ttl = _ttl_seconds()
+    if ttl > 0:
+        cached = dashboard_cache.get(lawyer_id, key)
+        if cached is not None:
+            return cached
+    generation = dashboard_cache.generation(lawyer_id)
+
+    rows = db.execute(
+        _SERIES_SQL,
+        {
+            "lawyer_id": lawyer_id,
+            "start": start,
+            "end": end,
+            "granularity": granularity,
+            "fallback_minutes": FALLBACK_BOOKING_MINUTES,
+        },
+    ).all()
+    if ttl > 0:
+        dashboard_cache.put(lawyer_id, key, rows, generation, ttl)
+    return rows
+
+
+@event.listens_for(Session, "after_flush")
+def _drop_stale_facts(session: Session, flush_context) -> None:
+    """Delete stored facts for the days a booking write touched."""
+    pairs = set()
+    deleted = set(session.deleted)
+    for obj in (*session.new, *session.dirty, *deleted):
+        if not isinstance(obj, Booking):
+            continue
+        state = sa.inspect(obj)
+        # a deleted row cannot be reloaded; use whatever was loaded before
+        get = state.dict.get if obj in deleted else lambda name: getattr(obj, name)
+        lawyer_ids = {get("lawyer_id"), *(state.attrs.lawyer_id.history.deleted or ())}
+        moments = {get("scheduled_at"), get("created_at")}
+        moments.update(state.attrs.scheduled_at.history.deleted or ())
+        for moment in moments:
+            if moment is None:
+                continue
+            # the row's day depends on the DB session time zone; cover both neighbours
+            for offset in (-1, 0, 1):
+                day = moment.date() + timedelta(days=offset)
+                pairs.update((lawyer_id, day) for lawyer_id in lawyer_ids if lawyer_id is not None)
+    if pairs:
+        session.execute(
+            sa.delete(LawyerDailyFact).where(
+                sa.tuple_(LawyerDailyFact.lawyer_id, LawyerDailyFact.day).in_(sorted(pairs))
+            )
+        )
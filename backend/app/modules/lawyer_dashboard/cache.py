@@ -0,0 +1,135 @@
+"""Short-lived per-lawyer cache for dashboard reads (summary, analytics).
+
+Entries live in the API worker for a TTL and are dropped for a lawyer once
+a transaction that touched their bookings, case requests, queue entries,
+weekly availability, blackout days or KYC commits. ORM writes are picked up by a flush hook; code that writes with
+raw SQL calls ``mark_dashboard_stale``. Other API workers keep their copy
+until it expires, which bounds the staleness to the TTL.
+"""
+
+import threading
+import time
+from typing import Any, Hashable, Iterable, Optional
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking
+from app.models.lawyer import Lawyer
+from app.models.lawyer_availability import WeeklyAvailability
+from app.models.lawyer_kyc import LawyerKYC
+from app.models.user import User
+from app.modules.blackouts.models import BlackoutDay
+from app.modules.cases.models import CaseRequest
+from app.modules.queue.models import QueueEntry
+
+_STALE_KEY = "stale_lawyer_dashboards"
+MAX_ENTRIES = 10_000
+
+# model -> attribute holding the lawyer's user id
+_TRACKED = {
+    Booking: "lawyer_id",
+    CaseRequest: "lawyer_id",
+    QueueEntry: "lawyer_id",
+    LawyerKYC: "user_id",
+    BlackoutDay: "lawyer_id",
+}
+# model -> attribute holding a lawyers.id, mapped to the user id by email
+_TRACKED_BY_PROFILE = {
+    WeeklyAvailability: "lawyer_id",
+}
+
+
+class LawyerCache:
+    """(lawyer id, key) -> value with an expiry, plus a per-lawyer generation
+    so a read that raced an invalidation is not stored."""
+
+    def __init__(self):
+        self._entries: dict[tuple[int, Hashable], tuple[float, Any]] = {}
+        self._generations: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, lawyer_id: int, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            hit = self._entries.get((lawyer_id, key))
+        if hit is None or hit[0] < time.monotonic():
+            return None
+        return hit[1]
+
+    def generation(self, lawyer_id: int) -> int:
+        with self._lock:
+            return self._generations.get(lawyer_id, 0)
+
+    def put(self, lawyer_id: int, key: Hashable, value: Any, generation: int, ttl: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._generations.get(lawyer_id, 0) != generation:
+                return
+            if len(self._entries) >= MAX_ENTRIES:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] >= now}
+                if len(self._entries) >= MAX_ENTRIES:
+                    self._entries.clear()
+            self._entries[(lawyer_id, key)] = (now + ttl, value)
+
+    def invalidate(self, lawyer_ids: Iterable[int]) -> None:
+        lawyer_ids = set(lawyer_ids)
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if k[0] not in lawyer_ids}
+            for lawyer_id in lawyer_ids:
+                self._generations[lawyer_id] = self._generations.get(lawyer_id, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+dashboard_cache = LawyerCache()
+
+
+def mark_dashboard_stale(db: Session, *lawyer_ids: int) -> None:
+    """Drop the lawyers' cached dashboard reads once ``db`` commits."""
+    db.info.setdefault(_STALE_KEY, set()).update(int(i) for i in lawyer_ids if i is not None)
+
+
+def _touched(obj, attr: str, deleted: bool) -> set:
+    state = sa.inspect(obj)
+    # a deleted row cannot be reloaded; use whatever was loaded before
+    ids = {state.dict.get(attr) if deleted else getattr(obj, attr)}
+    # a reassigned row also changes the previous lawyer's numbers
+    ids.update(state.attrs[attr].history.deleted or ())
+    return ids
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_lawyers(session: Session, flush_context) -> None:
+    stale, profiles = set(), set()
+    deleted = set(session.deleted)
+    for obj in (*session.new, *session.dirty, *deleted):
+        if type(obj) in _TRACKED:
+            stale |= _touched(obj, _TRACKED[type(obj)], obj in deleted)
+        elif type(obj) in _TRACKED_BY_PROFILE:
+            profiles |= _touched(obj, _TRACKED_BY_PROFILE[type(obj)], obj in deleted)
+    profiles.discard(None)
+    if profiles:
+        stale.update(
+            session.execute(
+                sa.select(User.id).join(Lawyer, Lawyer.email == User.email).where(Lawyer.id.in_(profiles))
+            ).scalars()
+        )
+    stale.discard(None)
+    if stale:
+        mark_dashboard_stale(session, *stale)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    stale = session.info.pop(_STALE_KEY, None)
+    if stale:
+        dashboard_cache.invalidate(stale)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_STALE_KEY, None)
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric, PrimaryKeyConstraint
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class LawyerDailyFact(Base):
+    """One finished day of a lawyer's calendar, as the analytics API sees it.
+
+    Written by the ``lawyer_daily_facts_fill`` scheduler job for days before
+    today; a booking change for a past day deletes that day's row so the job
+    rebuilds it.
+    """
+
+    __tablename__ = "lawyer_daily_facts"
+    __table_args__ = (PrimaryKeyConstraint("lawyer_id", "day"),)
+
+    lawyer_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)
+    available_minutes = Column(Integer, nullable=False, default=0)
+    booked_minutes = Column(Integer, nullable=False, default=0)
+    requests = Column(Integer, nullable=False, default=0)  # bookings created that day
+    confirmed = Column(Integer, nullable=False, default=0)  # ... of which confirmed/completed
+    revenue = Column(Numeric(12, 2), nullable=False, default=0)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
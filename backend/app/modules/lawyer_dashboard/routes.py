@@ -1,7 +1,7 @@
-from datetime import date
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from app.database import get_db
 
@@ -14,14 +14,12 @@ from app.routers.auth import get_current_user
 # ✅ Change these model imports to your actual model locations
 # (Search in backend/app/modules for these)
 from app.models.user import User
-from app.models.lawyer_kyc import LawyerKYC
-from app.models.booking import Booking
-from app.modules.queue.models import QueueEntry, QueueEntryStatus
-from app.modules.cases.models import CaseRequest
 from app.modules.lawyer_profiles.models import LawyerProfile
+from app.modules.lawyer_dashboard.summary import get_dashboard_summary
+from app.modules.lawyer_dashboard import analytics
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 router = APIRouter(prefix="/lawyer", tags=["Lawyer Dashboard"])
@@ -35,6 +33,40 @@ class DashboardSummaryOut(BaseModel):
     kycStatus: str
 
 
+class AnalyticsTotalsOut(BaseModel):
+    availableMinutes: int
+    bookedMinutes: int
+    utilization: Optional[float] = None
+    requests: int
+    confirmed: int
+    conversion: Optional[float] = None
+    revenue: float
+
+
+class AnalyticsBucketOut(BaseModel):
+    bucket: date
+    availableMinutes: int
+    bookedMinutes: int
+    utilization: Optional[float] = None
+    requests: int
+    confirmed: int
+    conversion: Optional[float] = None
+    revenue: float
+    # trailing window of analytics.TRAILING_BUCKETS buckets
+    rollingUtilization: Optional[float] = None
+    rollingConversion: Optional[float] = None
+    cumulativeRevenue: float
+    revenueChange: Optional[float] = None
+
+
+class LawyerAnalyticsOut(BaseModel):
+    start: date
+    end: date
+    granularity: str
+    totals: AnalyticsTotalsOut
+    series: List[AnalyticsBucketOut]
+
+
 class LawyerProfileOut(BaseModel):
     name: str
     email: str
@@ -62,53 +94,65 @@ def get_lawyer_dashboard_summary(
 ):
     _require_lawyer_user(user)
 
-    lawyer_id = user.id
-
-    # 1) Pending Case Access Requests
-    pending_requests = (
-        db.query(func.count(CaseRequest.id))
-        .filter(CaseRequest.lawyer_id == lawyer_id)
-        .filter(func.lower(CaseRequest.status) == "pending")
-        .scalar()
-        or 0
-    )
-
-    # 2) Incoming Bookings (pending/requested)
-    incoming_bookings = (
-        db.query(func.count(Booking.id))
-        .filter(Booking.lawyer_id == lawyer_id)
-        .filter(func.lower(Booking.status).in_(["pending", "requested"]))
-        .scalar()
-        or 0
+    summary = get_dashboard_summary(db, user.id)
+    return DashboardSummaryOut(
+        pendingRequests=summary.pending_requests,
+        incomingBookings=summary.incoming_bookings,
+        tokenQueueToday=summary.token_queue_today,
+        kycStatus=summary.kyc_status,
     )
 
-    # 3) Token Queue Today
-    today = date.today()
-    token_queue_today = (
-        db.query(func.count(QueueEntry.id))
-        .filter(QueueEntry.lawyer_id == lawyer_id)
-        .filter(QueueEntry.date == today)
-        .filter(QueueEntry.status.in_([QueueEntryStatus.waiting]))
-        .scalar()
-        or 0
-    )
 
-    # 4) KYC Status
-    kyc = (
-        db.query(LawyerKYC)
-        .filter(LawyerKYC.user_id == lawyer_id)
-        .order_by(LawyerKYC.id.desc())
-        .first()
-    )
-    kyc_value = getattr(kyc, "status", None) or "not_submitted"
-    kyc_status = (getattr(kyc_value, "value", kyc_value) or "not_submitted").lower()
+@router.get("/analytics", response_model=LawyerAnalyticsOut)
+def get_lawyer_analytics(
+    start: Optional[date] = Query(None, description="First day (default: 29 days before end)"),
+    end: Optional[date] = Query(None, description="Last day, inclusive (default: today)"),
+    granularity: str = Query("day", pattern="^(day|week|month)$"),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    _require_lawyer_user(user)
 
-    return DashboardSummaryOut(
-        pendingRequests=pending_requests,
-        incomingBookings=incoming_bookings,
-        tokenQueueToday=token_queue_today,
-        kycStatus=kyc_status,
+    end = end or date.today()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days >= analytics.MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range too large (max {analytics.MAX_RANGE_DAYS} days)")
+
+    rows = analytics.get_lawyer_analytics(db, user.id, start, end, granularity)
+    first = rows[0] if rows else None
+
+    def ratio(part, whole):
+        return part / whole if whole else None
+
+    totals = AnalyticsTotalsOut(
+        availableMinutes=first.total_available_minutes if first else 0,
+        bookedMinutes=first.total_booked_minutes if first else 0,
+        utilization=ratio(first.total_booked_minutes, first.total_available_minutes) if first else None,
+        requests=first.total_requests if first else 0,
+        confirmed=first.total_confirmed if first else 0,
+        conversion=ratio(first.total_confirmed, first.total_requests) if first else None,
+        revenue=first.total_revenue if first else 0,
     )
+    series = [
+        AnalyticsBucketOut(
+            bucket=r.bucket,
+            availableMinutes=r.available_minutes,
+            bookedMinutes=r.booked_minutes,
+            utilization=r.utilization,
+            requests=r.requests,
+            confirmed=r.confirmed,
+            conversion=r.conversion,
+            revenue=r.revenue,
+            rollingUtilization=r.rolling_utilization,
+            rollingConversion=r.rolling_conversion,
+            cumulativeRevenue=r.cumulative_revenue,
+            revenueChange=r.revenue_change,
+        )
+        for r in rows
+    ]
+    return LawyerAnalyticsOut(start=start, end=end, granularity=granularity, totals=totals, series=series)
 
 
 @router.get("/profile/me", response_model=LawyerProfileOut)
@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class MatchingChange(Base):
+    """A lawyer whose matching features changed, written by row triggers.
+
+    Exactly one of ``user_id`` (users.id) and ``lawyer_id`` (lawyers.id) is
+    set, depending on how the changed table is keyed. API workers read the
+    rows stamped since their last sync; ``prune_matching_changes`` drops old
+    ones.
+    """
+
+    __tablename__ = "matching_changes"
+
+    id = Column(BigInteger, primary_key=True)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    user_id = Column(Integer, nullable=True)
+    lawyer_id = Column(Integer, nullable=True)
@@ -0,0 +1,14 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+class LawyerMatchOut(BaseModel):
+    lawyer_id: int  # users.id
+    name: str
+    specialization: Optional[str] = None
+    district: Optional[str] = None
+    score: float
+    components: Dict[str, float]
+    starting_price: Optional[float] = None
+    available_in_days: Optional[int] = None
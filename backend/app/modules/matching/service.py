@@ -0,0 +1,220 @@
+"""Case-to-lawyer matching over the in-memory ``LawyerIndex``.
+
+Every API worker holds its own index, built on first use. Row triggers on
+users, lawyers, lawyer_profiles, service_packages, weekly_availability and
+blackout_days append to ``matching_changes``; at most every
+``MATCHING_REFRESH_SECONDS`` a read reloads just the lawyers logged since
+this worker's last sync. The window reaches back ``SYNC_GRACE`` further,
+because a row is stamped with its transaction's start time and may commit
+later; reloading a lawyer twice is harmless. The index is rebuilt from
+scratch when its availability horizon runs out (about weekly), or when the
+worker has been idle long enough that the change log may have been pruned.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.modules.cases.models import Case
+from app.modules.lawyer_profiles.models import LawyerProfile
+from app.modules.matching.engine import (
+    HORIZON_DAYS,
+    LawyerFeatures,
+    LawyerIndex,
+    Match,
+    MatchQuery,
+    specialization_terms,
+)
+from app.modules.matching.schemas import LawyerMatchOut
+
+logger = logging.getLogger(__name__)
+
+CHANGE_RETENTION = timedelta(days=1)
+SYNC_GRACE = timedelta(minutes=5)
+
+_WEEKDAYS = ("MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY")
+
+# One row per lawyer user; lawyers.id (packages, weekly availability) is
+# reached by email as elsewhere.
+_FEATURES_SQL = sa.text(
+    """
+SELECT u.id AS user_id,
+       lp.specialization,
+       lp.district,
+       lp.languages,
+       lp.rating,
+       (SELECT min(sp.price) FROM service_packages sp WHERE sp.lawyer_id = l.id AND sp.active) AS price,
+       ARRAY(
+           SELECT DISTINCT w.day_of_week::text FROM weekly_availability w WHERE w.lawyer_id = l.id AND w.is_active
+       ) AS weekdays,
+       ARRAY(
+           SELECT bd.date FROM blackout_days bd
+           WHERE bd.lawyer_id = u.id AND bd.date >= :origin AND bd.date < :horizon_end
+       ) AS blackouts
+FROM users u
+LEFT JOIN lawyer_profiles lp ON lp.user_id = u.id
+LEFT JOIN lawyers l ON l.email = u.email
+WHERE u.role = 'lawyer'
+  AND (:everyone OR u.id = ANY(CAST(:user_ids AS int[])) OR l.id = ANY(CAST(:lawyer_ids AS int[])))
+"""
+)
+
+_index: Optional[LawyerIndex] = None
+_synced_at = None  # database clock at the last sync
+_checked_at = 0.0
+_refresh_lock = threading.Lock()
+
+
+def _refresh_seconds() -> float:
+    return float(os.getenv("MATCHING_REFRESH_SECONDS", "30"))
+
+
+def default_top_k() -> int:
+    return int(os.getenv("MATCHING_TOP_K", "10"))
+
+
+def _features(row, origin: date) -> LawyerFeatures:
+    weekdays = {_WEEKDAYS.index(name) for name in row.weekdays if name in _WEEKDAYS}
+    blackouts = set(row.blackouts)
+    open_days = [
+        offset
+        for offset in range(HORIZON_DAYS)
+        if (origin + timedelta(days=offset)).weekday() in weekdays
+        and origin + timedelta(days=offset) not in blackouts
+    ]
+    languages = row.languages if isinstance(row.languages, list) else []
+    return LawyerFeatures(
+        lawyer_id=row.user_id,
+        specializations=specialization_terms(row.specialization),
+        district=row.district,
+        languages=[str(language) for language in languages],
+        rating=float(row.rating) if row.rating is not None else None,
+        price=float(row.price) if row.price is not None else None,
+        open_days=open_days,
+    )
+
+
+def load_features(
+    db: Session,
+    origin: date,
+    *,
+    user_ids: Optional[Iterable[int]] = None,
+    lawyer_ids: Iterable[int] = (),
+) -> List[LawyerFeatures]:
+    """Features of every lawyer, or only of the given users / lawyers rows."""
+    rows = db.execute(
+        _FEATURES_SQL,
+        {
+            "origin": origin,
+            "horizon_end": origin + timedelta(days=HORIZON_DAYS),
+            "everyone": user_ids is None,
+            "user_ids": list(user_ids or ()),
+            "lawyer_ids": list(lawyer_ids),
+        },
+    ).all()
+    return [_features(row, origin) for row in rows]
+
+
+def _rebuild(db: Session, today: date) -> None:
+    global _index, _synced_at, _checked_at
+    # take the clock first so changes committed during the load are replayed
+    synced_at = db.execute(sa.text("SELECT clock_timestamp()")).scalar()
+    features = load_features(db, today)
+    index = LawyerIndex(today, capacity=max(1024, len(features)))
+    index.upsert(features)
+    _index, _synced_at, _checked_at = index, synced_at, time.monotonic()
+    logger.info("Matching index rebuilt: %d lawyers", len(index))
+
+
+def _apply_changes(db: Session) -> None:
+    global _synced_at, _checked_at
+    synced_at = db.execute(sa.text("SELECT clock_timestamp()")).scalar()
+    changes = db.execute(
+        sa.text("SELECT DISTINCT user_id, lawyer_id FROM matching_changes WHERE changed_at >= :since"),
+        {"since": _synced_at - SYNC_GRACE},
+    ).all()
+    _synced_at, _checked_at = synced_at, time.monotonic()
+    if not changes:
+        return
+
+    user_ids = {c.user_id for c in changes if c.user_id is not None}
+    lawyer_ids = {c.lawyer_id for c in changes if c.lawyer_id is not None}
+    features = load_features(db, _index.origin, user_ids=user_ids, lawyer_ids=lawyer_ids)
+    _index.upsert(features)
+    # users that are gone or no longer lawyers
+    _index.remove(user_ids - {f.lawyer_id for f in features})
+
+
+def get_lawyer_index(db: Session, today: Optional[date] = None) -> LawyerIndex:
+    """This worker's index, rebuilt or caught up with the change log as needed."""
+    today = today or date.today()
+    with _refresh_lock:
+        idle = time.monotonic() - _checked_at
+        if _index is None or _index.needs_rebuild(today) or idle > CHANGE_RETENTION.total_seconds() / 2:
+            _rebuild(db, today)
+        elif idle >= _refresh_seconds():
+            _apply_changes(db)
+        return _index
+
+
+def match_lawyers_for_case(
+    db: Session,
+    case: Case,
+    *,
+    languages: Sequence[str] = (),
+    max_price: Optional[float] = None,
+    k: Optional[int] = None,
+    exclude: Sequence[int] = (),
+) -> List[Match]:
+    today = date.today()
+    query = MatchQuery(
+        category=case.category,
+        district=case.district,
+        languages=tuple(languages),
+        max_price=max_price,
+        exclude=tuple(exclude),
+    )
+    return get_lawyer_index(db, today).top_k(query, k or default_top_k(), today)
+
+
+def prune_matching_changes(db: Session) -> None:
+    """Scheduler job: drop change rows every worker has had time to apply."""
+    db.execute(
+        sa.text("DELETE FROM matching_changes WHERE changed_at < now() - :retention"),
+        {"retention": CHANGE_RETENTION},
+    )
+    db.commit()
+
+
+def describe_matches(db: Session, matches: List[Match]) -> List[LawyerMatchOut]:
+    """Attach name, specialization and district to ``matches`` (one query)."""
+    if not matches:
+        return []
+    profiles = {
+        row.id: row
+        for row in db.query(User.id, User.full_name, LawyerProfile.specialization, LawyerProfile.district)
+        .outerjoin(LawyerProfile, LawyerProfile.user_id == User.id)
+        .filter(User.id.in_([m.lawyer_id for m in matches]))
+    }
+    return [
+        LawyerMatchOut(
+            lawyer_id=m.lawyer_id,
+            name=profiles[m.lawyer_id].full_name,
+            specialization=profiles[m.lawyer_id].specialization,
+            district=profiles[m.lawyer_id].district,
+            score=m.score,
+            components=m.components,
+            starting_price=m.price,
+            available_in_days=m.available_in_days,
+        )
+        for m in matches
+        # deleted since the index last synced
+        if m.lawyer_id in profiles
+    ]
@@ -0,0 +1,47 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, PrimaryKeyConstraint, String
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class MetricEvent(Base):
+    """One +/- delta written by the metrics triggers, drained by the rollup job."""
+
+    __tablename__ = "metric_events"
+
+    id = Column(BigInteger, primary_key=True)
+    occurred_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    metric = Column(String(40), nullable=False)
+    dimension = Column(String(40), nullable=False, server_default="")
+    delta = Column(Integer, nullable=False)
+
+
+class MetricRollupHourly(Base):
+    __tablename__ = "metric_rollups_hourly"
+    __table_args__ = (PrimaryKeyConstraint("metric", "dimension", "bucket"),)
+
+    metric = Column(String(40), nullable=False)
+    dimension = Column(String(40), nullable=False)
+    bucket = Column(DateTime(timezone=True), nullable=False)  # UTC hour
+    value = Column(BigInteger, nullable=False)
+
+
+class MetricRollupDaily(Base):
+    __tablename__ = "metric_rollups_daily"
+    __table_args__ = (PrimaryKeyConstraint("metric", "dimension", "bucket"),)
+
+    metric = Column(String(40), nullable=False)
+    dimension = Column(String(40), nullable=False)
+    bucket = Column(DateTime(timezone=True), nullable=False)  # UTC midnight
+    value = Column(BigInteger, nullable=False)
+
+
+class MetricTotal(Base):
+    """All-time sum per metric/dimension; for gauges this is the current count."""
+
+    __tablename__ = "metric_totals"
+    __table_args__ = (PrimaryKeyConstraint("metric", "dimension"),)
+
+    metric = Column(String(40), nullable=False)
+    dimension = Column(String(40), nullable=False)
+    value = Column(BigInteger, nullable=False)
@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.user import User, UserRole
+from app.routers.auth import get_current_user
+from . import service
+from .schemas import MetricPoint, MetricSeriesOut, MetricTotalsOut
+
+router = APIRouter(prefix="/api/admin/metrics", tags=["Admin Metrics"])
+
+
+def _require_admin(user: User):
+    role = getattr(user, "role", None)
+    if role != UserRole.admin:
+        raise HTTPException(status_code=403, detail="Admin only")
+
+
+def _check_metric(metric: str):
+    if metric not in service.METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric '{metric}'")
+
+
+@router.get("/totals", response_model=MetricTotalsOut)
+def metric_totals(
+    metric: Optional[List[str]] = Query(None, description="Metrics to return (default: all)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    _require_admin(current_user)
+    for name in metric or ():
+        _check_metric(name)
+    return MetricTotalsOut(totals=service.get_totals(db, metric))
+
+
+@router.get("/series", response_model=MetricSeriesOut)
+def metric_series(
+    metric: str = Query(..., description="e.g. signups, bookings_created, kyc_transitions"),
+    granularity: str = Query("day", pattern="^(hour|day)$"),
+    start: Optional[datetime] = Query(None, description="Inclusive; floored to the bucket"),
+    end: Optional[datetime] = Query(None, description="Exclusive; default now"),
+    dimension: Optional[str] = Query(None, description="Only this role / status"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    _require_admin(current_user)
+    _check_metric(metric)
+
+    end = end or datetime.now(timezone.utc)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    start = service.bucket_start(start or end - service.DEFAULT_RANGE[granularity], granularity)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if end - start > service.MAX_RANGE[granularity]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large for {granularity} buckets (max {service.MAX_RANGE[granularity].days} days)",
+        )
+
+    rows = service.get_series(db, metric, granularity, start, end, dimension)
+    return MetricSeriesOut(
+        metric=metric,
+        granularity=granularity,
+        start=start,
+        end=end,
+        points=[MetricPoint(bucket=r.bucket, dimension=r.dimension, value=r.value) for r in rows],
+    )
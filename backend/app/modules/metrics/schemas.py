@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+
+class MetricPoint(BaseModel):
+    bucket: datetime
+    dimension: str
+    value: int
+
+
+class MetricSeriesOut(BaseModel):
+    metric: str
+    granularity: str
+    start: datetime
+    end: datetime
+    points: List[MetricPoint]
+
+
+class MetricTotalsOut(BaseModel):
+    # metric -> dimension -> value
+    totals: Dict[str, Dict[str, int]]
@@ -0,0 +1,156 @@
+"""Pre-aggregated counters for the admin dashboards.
+
+Triggers on ``users``, ``bookings``, ``disputes`` and ``kyc_submissions``
+(see the ``metrics rollups`` migration) append a +/-1 row to
+``metric_events`` in the same transaction as the change. The
+``metrics_rollup`` scheduler job drains that table into hourly, daily and
+all-time rows, so dashboards read a few small tables instead of counting
+the source tables.
+
+Two kinds of metric:
+
+- gauges (``users``, ``bookings``, ``disputes``, ``kyc``): current count per
+  role / status; the total is the live value, buckets hold net changes.
+- flows (``signups``, ``bookings_created``, ...): things that happened; the
+  buckets are the time series.
+
+Reads add the events the job has not drained yet, so the numbers are exact
+as of the last commit, not as of the last rollup.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.modules.metrics.models import MetricEvent, MetricRollupDaily, MetricRollupHourly, MetricTotal
+
+GAUGES = ("users", "bookings", "disputes", "kyc")
+FLOWS = (
+    "signups",
+    "bookings_created",
+    "booking_transitions",
+    "disputes_opened",
+    "dispute_transitions",
+    "kyc_submitted",
+    "kyc_transitions",
+)
+METRICS = GAUGES + FLOWS
+
+GRANULARITIES = {"hour": MetricRollupHourly, "day": MetricRollupDaily}
+# widest window a single series request may cover
+MAX_RANGE = {"hour": timedelta(days=31), "day": timedelta(days=3 * 366)}
+DEFAULT_RANGE = {"hour": timedelta(hours=48), "day": timedelta(days=30)}
+
+BATCH_SIZE = 5000
+MAX_BATCHES = 20
+
+# Drain one batch of events into all three rollups in a single statement.
+# SKIP LOCKED keeps concurrent runs (several API nodes) off the same rows.
+_ROLLUP_SQL = sa.text(
+    """
+    WITH batch AS (
+        DELETE FROM metric_events
+        WHERE id IN (
+            SELECT id FROM metric_events ORDER BY id LIMIT :limit FOR UPDATE SKIP LOCKED
+        )
+        RETURNING occurred_at, metric, dimension, delta
+    ), hourly AS (
+        INSERT INTO metric_rollups_hourly AS r (metric, dimension, bucket, value)
+        SELECT metric, dimension, date_trunc('hour', occurred_at, 'UTC'), sum(delta)
+        FROM batch GROUP BY 1, 2, 3
+        ON CONFLICT (metric, dimension, bucket) DO UPDATE SET value = r.value + EXCLUDED.value
+    ), daily AS (
+        INSERT INTO metric_rollups_daily AS r (metric, dimension, bucket, value)
+        SELECT metric, dimension, date_trunc('day', occurred_at, 'UTC'), sum(delta)
+        FROM batch GROUP BY 1, 2, 3
+        ON CONFLICT (metric, dimension, bucket) DO UPDATE SET value = r.value + EXCLUDED.value
+    ), totals AS (
+        INSERT INTO metric_totals AS t (metric, dimension, value)
+        SELECT metric, dimension, sum(delta)
+        FROM batch GROUP BY 1, 2
+        ON CONFLICT (metric, dimension) DO UPDATE SET value = t.value + EXCLUDED.value
+    )
+    SELECT count(*) FROM batch
+    """
+)
+
+
+def rollup_metrics(db: Session, limit: int = BATCH_SIZE) -> int:
+    """Scheduler job: fold pending metric events into the rollups. Returns events handled."""
+    handled = 0
+    for _ in range(MAX_BATCHES):
+        count = db.execute(_ROLLUP_SQL, {"limit": limit}).scalar_one()
+        db.commit()
+        handled += count
+        if count < limit:
+            break
+    return handled
+
+
+def get_totals(db: Session, metrics: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+    """metric -> dimension -> all-time value (current count for gauges)."""
+    names = list(metrics) if metrics is not None else list(METRICS)
+    rows = sa.union_all(
+        sa.select(MetricTotal.metric, MetricTotal.dimension, MetricTotal.value).where(
+            MetricTotal.metric.in_(names)
+        ),
+        sa.select(MetricEvent.metric, MetricEvent.dimension, MetricEvent.delta).where(
+            MetricEvent.metric.in_(names)
+        ),
+    ).subquery()
+    result = db.execute(
+        sa.select(rows.c.metric, rows.c.dimension, sa.func.sum(rows.c.value)).group_by(
+            rows.c.metric, rows.c.dimension
+        )
+    ).all()
+
+    totals: Dict[str, Dict[str, int]] = {name: {} for name in names}
+    for metric, dimension, value in result:
+        if value:
+            totals[metric][dimension] = int(value)
+    return totals
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """Floor ``moment`` to its UTC hour / day."""
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0) if granularity == "day" else moment
+
+
+def get_series(
+    db: Session,
+    metric: str,
+    granularity: str,
+    start: datetime,
+    end: datetime,
+    dimension: Optional[str] = None,
+) -> List[sa.Row]:
+    """(bucket, dimension, value) rows for ``[start, end)``; empty buckets are omitted.
+
+    ``start`` should be a bucket boundary (see ``bucket_start``) so the rolled
+    up and the pending part cover the same buckets.
+    """
+    table = GRANULARITIES[granularity]
+    rolled = sa.select(table.bucket, table.dimension, table.value).where(
+        table.metric == metric, table.bucket >= start, table.bucket < end
+    )
+    pending = sa.select(
+        sa.func.date_trunc(granularity, MetricEvent.occurred_at, "UTC").label("bucket"),
+        MetricEvent.dimension,
+        MetricEvent.delta,
+    ).where(MetricEvent.metric == metric, MetricEvent.occurred_at >= start, MetricEvent.occurred_at < end)
+    if dimension is not None:
+        rolled = rolled.where(table.dimension == dimension)
+        pending = pending.where(MetricEvent.dimension == dimension)
+
+    rows = sa.union_all(rolled, pending).subquery()
+    value = sa.func.sum(rows.c.value)
+    return db.execute(
+        sa.select(rows.c.bucket, rows.c.dimension, value.label("value"))
+        .group_by(rows.c.bucket, rows.c.dimension)
+        .having(value != 0)
+        .order_by(rows.c.bucket, rows.c.dimension)
+    ).all()
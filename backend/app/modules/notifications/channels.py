@@ -0,0 +1,147 @@
+"""Delivery channels for the notification dispatcher.
+
+A channel takes a batch of deliveries and returns ``{delivery id: error}``
+for the ones that failed; raising fails the whole batch. Everything else in
+the batch counts as delivered. Channels are looked up by name in
+``CHANNELS``, so another one (SMS, push) is a class plus a
+``register_channel`` call; ``NOTIFICATION_CHANNELS`` picks the ones new
+notifications are queued on.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import smtplib
+import urllib.request
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Dict, List, Optional, Protocol
+
+from sqlalchemy.orm import Session
+
+from app.modules.notifications.models import Notification
+
+
+@dataclass
+class Delivery:
+    id: int
+    user_id: int
+    email: Optional[str]
+    full_name: Optional[str]
+    kind: str
+    title: str
+    body: str
+    data: Dict = field(default_factory=dict)
+
+
+class Channel(Protocol):
+    def deliver(self, db: Session, batch: List[Delivery]) -> Dict[int, str]: ...
+
+
+class InAppChannel:
+    """Rows in ``notifications``, committed with the dispatcher's transaction."""
+
+    def deliver(self, db: Session, batch: List[Delivery]) -> Dict[int, str]:
+        db.add_all(
+            Notification(user_id=d.user_id, kind=d.kind, title=d.title, body=d.body, data=d.data) for d in batch
+        )
+        return {}
+
+
+class EmailChannel:
+    """Plain-text mail over one SMTP connection per batch.
+
+    Defaults to an unauthenticated server on localhost:1025, the mailpit
+    stand-in from docker-compose.
+    """
+
+    def config(self) -> dict:
+        return {
+            "host": os.getenv("SMTP_HOST", "localhost"),
+            "port": int(os.getenv("SMTP_PORT", "1025")),
+            "username": os.getenv("SMTP_USERNAME") or None,
+            "password": os.getenv("SMTP_PASSWORD") or None,
+            "starttls": os.getenv("SMTP_STARTTLS", "false").lower() == "true",
+            "sender": os.getenv("SMTP_FROM", "LexiConnect <no-reply@lexiconnect.local>"),
+        }
+
+    def deliver(self, db: Session, batch: List[Delivery]) -> Dict[int, str]:
+        # users without an address have nothing to retry
+        batch = [d for d in batch if d.email]
+        if not batch:
+            return {}
+
+        cfg = self.config()
+        errors = {}
+        with smtplib.SMTP(cfg["host"], cfg["port"], timeout=10) as smtp:
+            if cfg["starttls"]:
+                smtp.starttls()
+            if cfg["username"]:
+                smtp.login(cfg["username"], cfg["password"] or "")
+            for d in batch:
+                message = EmailMessage()
+                message["From"] = cfg["sender"]
+                message["To"] = d.email
+                message["Subject"] = d.title
+                message.set_content(f"Hi {d.full_name or 'there'},\n\n{d.body}\n\n- LexiConnect")
+                try:
+                    smtp.send_message(message)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPSenderRefused) as exc:
+                    errors[d.id] = str(exc)
+        return errors
+
+
+def sign_payload(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class WebhookChannel:
+    """One JSON POST per batch to ``NOTIFICATION_WEBHOOK_URL``.
+
+    With ``NOTIFICATION_WEBHOOK_SECRET`` set, the body is signed in the
+    ``X-LexiConnect-Signature`` header (HMAC-SHA256, hex).
+    """
+
+    def deliver(self, db: Session, batch: List[Delivery]) -> Dict[int, str]:
+        url = os.getenv("NOTIFICATION_WEBHOOK_URL")
+        if not url:
+            raise RuntimeError("NOTIFICATION_WEBHOOK_URL is not set")
+
+        body = json.dumps(
+            {
+                "notifications": [
+                    {"id": d.id, "user_id": d.user_id, "kind": d.kind, "title": d.title, "body": d.body, "data": d.data}
+                    for d in batch
+                ]
+            }
+        ).encode()
+        request = urllib.request.Request(url, data=body, method="POST", headers={"Content-Type": "application/json"})
+        secret = os.getenv("NOTIFICATION_WEBHOOK_SECRET")
+        if secret:
+            request.add_header("X-LexiConnect-Signature", sign_payload(secret, body))
+        # non-2xx raises HTTPError, failing the batch
+        with urllib.request.urlopen(request, timeout=10):
+            pass
+        return {}
+
+
+CHANNELS: Dict[str, Channel] = {
+    "in_app": InAppChannel(),
+    "email": EmailChannel(),
+    "webhook": WebhookChannel(),
+}
+
+
+def register_channel(name: str, channel: Channel) -> None:
+    CHANNELS[name] = channel
+
+
+def enabled_channels() -> List[str]:
+    """Channels new notifications are queued on (unknown names are ignored)."""
+    names = os.getenv("NOTIFICATION_CHANNELS", "in_app").split(",")
+    enabled = []
+    for name in (n.strip() for n in names):
+        if name in CHANNELS and name not in enabled:
+            enabled.append(name)
+    return enabled
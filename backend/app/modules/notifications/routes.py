@@ -0,0 +1,44 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.user import User
+from app.routers.auth import get_current_user
+
+from . import service
+from .schemas import MarkReadOut, MarkReadRequest, NotificationPage, UnreadCountOut
+
+router = APIRouter(prefix="/api/notifications", tags=["Notifications"])
+
+
+@router.get("", response_model=NotificationPage)
+def list_my_notifications(
+    unread_only: bool = False,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    items, next_cursor = service.list_notifications(
+        db, current_user.id, unread_only=unread_only, cursor=cursor, limit=limit
+    )
+    return {"items": items, "next_cursor": next_cursor, "unread": service.unread_count(db, current_user.id)}
+
+
+@router.get("/unread-count", response_model=UnreadCountOut)
+def my_unread_count(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return {"unread": service.unread_count(db, current_user.id)}
+
+
+@router.post("/read", response_model=MarkReadOut)
+def mark_my_notifications_read(
+    payload: MarkReadRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return {"updated": service.mark_read(db, current_user.id, payload.ids)}
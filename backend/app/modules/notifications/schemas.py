@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class NotificationOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: str
+    title: str
+    body: str
+    data: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    read_at: Optional[datetime] = None
+
+
+class NotificationPage(BaseModel):
+    items: List[NotificationOut]
+    next_cursor: Optional[int] = None
+    unread: int
+
+
+class UnreadCountOut(BaseModel):
+    unread: int
+
+
+class MarkReadRequest(BaseModel):
+    """Ids to mark read; omit to mark every unread notification."""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=500)
+
+
+class MarkReadOut(BaseModel):
+    updated: int
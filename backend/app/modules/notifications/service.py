@@ -0,0 +1,184 @@
+"""Notification outbox and its dispatcher.
+
+``notify`` adds one outbox row per recipient and enabled channel to the
+caller's session, so the notification commits (or rolls back) with the
+booking, case request, dispute or queue change it announces. The
+``notifications_dispatch`` scheduler job claims due rows with
+``FOR UPDATE SKIP LOCKED``, hands them to their channel in batches and
+deletes the delivered ones in the same transaction. Failed rows are retried
+with exponential backoff and kept as ``failed`` after ``MAX_ATTEMPTS``.
+
+Delivery is at least once: if the commit after a batch fails, the email or
+webhook already sent goes out again on the next run.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.modules.notifications.channels import CHANNELS, Delivery, enabled_channels
+from app.modules.notifications.models import Notification, NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+FAILED = "failed"
+
+BATCH_SIZE = 100
+# batches per scheduler run, so a burst drains without starving other jobs
+MAX_BATCHES = 10
+MAX_ATTEMPTS = 6
+RETRY_BASE_SECONDS = 30
+
+
+def notify(
+    db: Session,
+    *,
+    user_ids: Iterable[Optional[int]],
+    kind: str,
+    title: str,
+    body: str,
+    data: Optional[dict] = None,
+) -> None:
+    """Queue a notification for each user on every enabled channel. Caller commits."""
+    channels = enabled_channels()
+    for user_id in dict.fromkeys(u for u in user_ids if u is not None):
+        for channel in channels:
+            db.add(
+                NotificationOutbox(
+                    user_id=user_id,
+                    channel=channel,
+                    kind=kind,
+                    title=title,
+                    body=body,
+                    data=data or {},
+                    status=PENDING,
+                    attempts=0,
+                )
+            )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+def fail_delivery(row: NotificationOutbox, error: str) -> None:
+    """Retry with exponential backoff; give up after MAX_ATTEMPTS."""
+    row.attempts = (row.attempts or 0) + 1
+    row.last_error = error[:2000]
+    if row.attempts >= MAX_ATTEMPTS:
+        row.status = FAILED
+    else:
+        row.run_after = datetime.now(timezone.utc) + retry_delay(row.attempts)
+
+
+def claim_outbox(db: Session, limit: int) -> List[NotificationOutbox]:
+    """Lock up to ``limit`` due rows; other workers skip them until we commit."""
+    stmt = (
+        sa.select(NotificationOutbox)
+        .where(NotificationOutbox.status == PENDING, NotificationOutbox.run_after <= sa.func.now())
+        .order_by(NotificationOutbox.run_after, NotificationOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return list(db.execute(stmt).scalars().all())
+
+
+def deliver_batch(db: Session, rows: List[NotificationOutbox]) -> Dict[int, str]:
+    """Hand ``rows`` to their channels; returns ``{row id: error}`` for failures."""
+    users = {
+        u.id: u
+        for u in db.query(User.id, User.email, User.full_name).filter(User.id.in_({r.user_id for r in rows}))
+    }
+    by_channel: Dict[str, List[Delivery]] = defaultdict(list)
+    for r in rows:
+        user = users.get(r.user_id)
+        by_channel[r.channel].append(
+            Delivery(
+                id=r.id,
+                user_id=r.user_id,
+                email=getattr(user, "email", None),
+                full_name=getattr(user, "full_name", None),
+                kind=r.kind,
+                title=r.title,
+                body=r.body,
+                data=r.data or {},
+            )
+        )
+
+    errors: Dict[int, str] = {}
+    for name, batch in by_channel.items():
+        channel = CHANNELS.get(name)
+        if channel is None:
+            errors.update({d.id: f"Unknown channel: {name}" for d in batch})
+            continue
+        try:
+            errors.update(channel.deliver(db, batch))
+        except Exception as exc:
+            logger.warning("Notification channel %s failed for %d deliveries: %s", name, len(batch), exc)
+            errors.update({d.id: f"{type(exc).__name__}: {exc}" for d in batch})
+    return errors
+
+
+def dispatch_notifications(db: Session, limit: int = BATCH_SIZE) -> int:
+    """Scheduler job: deliver due outbox rows, one committed batch at a time. Returns rows handled."""
+    handled = 0
+    for _ in range(MAX_BATCHES):
+        rows = claim_outbox(db, limit)
+        if not rows:
+            break
+        errors = deliver_batch(db, rows)
+        for row in rows:
+            if row.id in errors:
+                fail_delivery(row, errors[row.id])
+        delivered = [row.id for row in rows if row.id not in errors]
+        if delivered:
+            db.execute(
+                sa.delete(NotificationOutbox)
+                .where(NotificationOutbox.id.in_(delivered))
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+        handled += len(rows)
+        if len(rows) < limit:
+            break
+    return handled
+
+
+def list_notifications(
+    db: Session, user_id: int, *, unread_only: bool = False, cursor: Optional[int] = None, limit: int = 20
+):
+    """One page of the user's notifications, newest first, and the cursor of the next page."""
+    query = db.query(Notification).filter(Notification.user_id == user_id)
+    if unread_only:
+        query = query.filter(Notification.read_at.is_(None))
+    if cursor is not None:
+        query = query.filter(Notification.id < cursor)
+    rows = query.order_by(Notification.id.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, rows[-1].id
+
+
+def unread_count(db: Session, user_id: int) -> int:
+    return (
+        db.query(sa.func.count(Notification.id))
+        .filter(Notification.user_id == user_id, Notification.read_at.is_(None))
+        .scalar()
+    )
+
+
+def mark_read(db: Session, user_id: int, notification_ids: Optional[Iterable[int]] = None) -> int:
+    """Mark the user's notifications read (all unread ones without ids). Returns rows changed."""
+    stmt = sa.update(Notification).where(Notification.user_id == user_id, Notification.read_at.is_(None))
+    if notification_ids is not None:
+        stmt = stmt.where(Notification.id.in_(list(notification_ids)))
+    result = db.execute(stmt.values(read_at=sa.func.now()).execution_options(synchronize_session=False))
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,186 @@
+"""Push channel for token queue changes.
+
+Sync request handlers publish events for a (lawyer_id, date) queue; SSE
+subscribers (asyncio) receive them. Two delivery modes, picked with
+``QUEUE_EVENTS_BACKEND``:
+
+- ``local`` (default): events are handed to this process's subscribers
+  after the DB transaction commits.
+- ``postgres``: events go out through ``pg_notify`` inside the transaction,
+  and a LISTEN thread in every API worker fans them out to local
+  subscribers, so all workers see every change.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from collections import defaultdict
+from datetime import date
+from typing import Any, Optional
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "token_queue_events"
+_PENDING_KEY = "pending_queue_events"
+
+QueueKey = tuple[int, str]
+
+
+def events_backend() -> str:
+    return os.getenv("QUEUE_EVENTS_BACKEND", "local").lower()
+
+
+def _key(lawyer_id: int, day: date | str) -> QueueKey:
+    return int(lawyer_id), day.isoformat() if isinstance(day, date) else str(day)
+
+
+class QueueEventBroker:
+    """In-process pub/sub keyed by (lawyer_id, date)."""
+
+    def __init__(self, max_queue: int = 100):
+        self._subscribers: dict[QueueKey, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._max_queue = max_queue
+
+    def subscribe(self, lawyer_id: int, day: date | str) -> asyncio.Queue:
+        """Must be called from the subscriber's event loop."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._max_queue)
+        with self._lock:
+            self._subscribers[_key(lawyer_id, day)].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, lawyer_id: int, day: date | str, queue: asyncio.Queue) -> None:
+        key = _key(lawyer_id, day)
+        with self._lock:
+            subs = self._subscribers.get(key)
+            if not subs:
+                return
+            subs.difference_update({s for s in subs if s[1] is queue})
+            if not subs:
+                del self._subscribers[key]
+
+    def subscriber_count(self, lawyer_id: int, day: date | str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(_key(lawyer_id, day), ()))
+
+    def publish_local(self, message: dict[str, Any]) -> None:
+        """Thread-safe delivery to every subscriber of the message's queue."""
+        key = _key(message["lawyer_id"], message["date"])
+        with self._lock:
+            subs = list(self._subscribers.get(key, ()))
+        for loop, queue in subs:
+            loop.call_soon_threadsafe(_offer, queue, message)
+
+
+def _offer(queue: asyncio.Queue, message: dict[str, Any]) -> None:
+    # Slow consumers drop their oldest event rather than blocking publishers.
+    if queue.full():
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+    queue.put_nowait(message)
+
+
+broker = QueueEventBroker()
+
+
+def queue_event(*, event_type: str, lawyer_id: int, day: date, entry: Optional[dict] = None) -> dict[str, Any]:
+    return {"type": event_type, "lawyer_id": lawyer_id, "date": day.isoformat(), "entry": entry}
+
+
+def publish_queue_event(db: Session, *, event_type: str, lawyer_id: int, day: date, entry: Optional[dict] = None) -> None:
+    """Queue an event on the caller's transaction; it is delivered only on commit."""
+    publish_queue_events(db, [queue_event(event_type=event_type, lawyer_id=lawyer_id, day=day, entry=entry)])
+
+
+def publish_queue_events(db: Session, messages: list[dict[str, Any]]) -> None:
+    """Batch variant: one pg_notify round trip however many messages there are."""
+    if not messages:
+        return
+
+    if events_backend() == "postgres":
+        db.execute(
+            sa.text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+            {"channel": NOTIFY_CHANNEL, "payloads": [json.dumps(m, default=str) for m in messages]},
+        )
+        return
+
+    db.info.setdefault(_PENDING_KEY, []).extend(messages)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_pending_events(session: Session) -> None:
+    for message in session.info.pop(_PENDING_KEY, []):
+        broker.publish_local(message)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_events(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# -------------------------
+# LISTEN/NOTIFY fan-out
+# -------------------------
+_listener_stop = threading.Event()
+_listener_thread: Optional[threading.Thread] = None
+
+
+def _listen_loop(engine: sa.engine.Engine) -> None:
+    while not _listener_stop.is_set():
+        raw = None
+        try:
+            raw = engine.raw_connection()
+            conn = raw.driver_connection
+            raw.detach()
+            conn.rollback()
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {NOTIFY_CHANNEL}")
+
+            while not _listener_stop.is_set():
+                if select.select([conn], [], [], 5.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        broker.publish_local(json.loads(notify.payload))
+                    except (ValueError, KeyError):
+                        logger.warning("Ignoring malformed queue event: %r", notify.payload)
+        except Exception:
+            logger.exception("Queue event listener lost its connection; reconnecting")
+            _listener_stop.wait(2.0)
+        finally:
+            if raw is not None:
+                try:
+                    raw.close()
+                except Exception:
+                    pass
+
+
+def start_listener(engine: sa.engine.Engine) -> None:
+    global _listener_thread
+    if _listener_thread is not None and _listener_thread.is_alive():
+        return
+    _listener_stop.clear()
+    _listener_thread = threading.Thread(
+        target=_listen_loop, args=(engine,), name="token-queue-listener", daemon=True
+    )
+    _listener_thread.start()
+
+
+def stop_listener() -> None:
+    global _listener_thread
+    _listener_stop.set()
+    if _listener_thread is not None:
+        _listener_thread.join(timeout=10)
+    _listener_thread = None
@@ -2,7 +2,19 @@ import uuid
 from datetime import date, datetime
 from enum import Enum
 
-from sqlalchemy import Date, DateTime, Enum as SQLEnum, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import (
+    JSON,
+    Date,
+    DateTime,
+    Enum as SQLEnum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -23,6 +35,8 @@ class QueueEntry(Base):
             "token_number",
             name="uq_token_queue_lawyer_date_token_number",
         ),
+        # lawyer dashboard "token queue today"
+        Index("ix_token_queue_lawyer_id_date_waiting", "lawyer_id", "date", postgresql_where=text("status = 'waiting'")),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -46,3 +60,35 @@ class QueueEntry(Base):
         default=QueueEntryStatus.waiting,
     )
     served_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class QueueTokenCounter(Base):
+    """Last token handed out per (lawyer, date); bumped atomically by the allocator."""
+
+    __tablename__ = "token_queue_counters"
+
+    lawyer_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), primary_key=True)
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    last_token: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class QueueServiceStats(Base):
+    """Rolling per-lawyer service-time statistics, updated as entries are served.
+
+    ``histogram`` holds exponentially decayed counts in one-minute buckets,
+    so percentiles are read in constant time without touching token_queue.
+    """
+
+    __tablename__ = "queue_service_stats"
+
+    lawyer_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), primary_key=True)
+    samples: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ewma_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    histogram: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    last_served_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
@@ -17,6 +17,7 @@ from app.models.user import User
 from app.routers.auth import get_current_user
 from app.modules.queue.schemas import QueueEntryOut
 from app.modules.queue.service import generate_today_queue, list_today_queue, mark_queue_entry_served
+from app.modules.queue.wait_time import attach_wait_estimates
 
 router = APIRouter(prefix="/api/queue", tags=["queue"])
 
@@ -47,7 +48,7 @@ def list_my_today_queue(
 ):
     _require_lawyer(current_user)
     today = date.today()
-    entries = list_today_queue(db, lawyer_id=current_user.id, today=today)
+    entries = attach_wait_estimates(db, list_today_queue(db, lawyer_id=current_user.id, today=today))
     return [QueueEntryOut.model_validate(e) for e in entries]
 
 
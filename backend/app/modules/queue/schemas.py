@@ -18,5 +18,8 @@ class QueueEntryOut(BaseModel):
     client_id: int
     status: QueueEntryStatus
     served_at: datetime | None
+    # Only set for waiting entries; position 1 is next in line.
+    position: int | None = None
+    estimated_wait_minutes: float | None = None
 
     model_config = ConfigDict(from_attributes=True)
@@ -1,62 +1,192 @@
-from datetime import date, datetime, timezone
+import uuid
+from datetime import date, datetime, timedelta, timezone
 
 import sqlalchemy as sa
 from fastapi import HTTPException, status
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.models.booking import Booking
-from app.modules.queue.models import QueueEntry, QueueEntryStatus
+from app.modules.lawyer_dashboard.cache import mark_dashboard_stale
+from app.modules.notifications.service import notify
+from app.modules.queue.events import publish_queue_event, publish_queue_events, queue_event
+from app.modules.queue.models import QueueEntry, QueueEntryStatus, QueueTokenCounter
+from app.modules.queue.schemas import QueueEntryOut
+from app.modules.queue.wait_time import record_service
 
 
-def generate_today_queue(db: Session, *, lawyer_id: int, today: date) -> list[QueueEntry]:
-    bookings_stmt = (
-        sa.select(Booking)
-        .where(
-            Booking.lawyer_id == lawyer_id,
-            Booking.scheduled_at.is_not(None),
-            sa.func.date(Booking.scheduled_at) == today,
-            Booking.status != "cancelled",
-        )
-        .order_by(Booking.scheduled_at.asc())
+def publish_entry_event(db: Session, entry: QueueEntry, event_type: str) -> None:
+    """Announce a queue entry change to live subscribers once ``db`` commits."""
+    mark_dashboard_stale(db, entry.lawyer_id)
+    publish_queue_event(
+        db,
+        event_type=event_type,
+        lawyer_id=entry.lawyer_id,
+        day=entry.date,
+        entry=QueueEntryOut.model_validate(entry).model_dump(mode="json"),
     )
-    bookings = list(db.execute(bookings_stmt).scalars().all())
 
-    existing_clients_stmt = sa.select(QueueEntry.client_id).where(
-        QueueEntry.date == today,
-        QueueEntry.lawyer_id == lawyer_id,
+
+def _counter_upsert(lawyer_id: int, day: date, increment: int):
+    """INSERT ... ON CONFLICT DO UPDATE on the (lawyer, date) counter row.
+
+    The row lock taken by the upsert serialises concurrent allocators, and
+    since it lives in the caller's transaction a rollback also returns the
+    tokens, so numbering stays gap-free.
+    """
+    return (
+        pg_insert(QueueTokenCounter)
+        .values(lawyer_id=lawyer_id, date=day, last_token=increment)
+        .on_conflict_do_update(
+            index_elements=[QueueTokenCounter.lawyer_id, QueueTokenCounter.date],
+            set_={"last_token": QueueTokenCounter.last_token + increment},
+        )
+        .returning(QueueTokenCounter.last_token)
     )
-    existing_clients = set(db.execute(existing_clients_stmt).scalars().all())
 
-    max_number_stmt = sa.select(sa.func.max(QueueEntry.token_number)).where(
-        QueueEntry.date == today,
-        QueueEntry.lawyer_id == lawyer_id,
+
+def bump_token_counter(db: Session, *, lawyer_id: int, day: date, token_number: int) -> None:
+    """Keep the counter ahead of a manually chosen token number. Caller commits."""
+    stmt = (
+        pg_insert(QueueTokenCounter)
+        .values(lawyer_id=lawyer_id, date=day, last_token=token_number)
+        .on_conflict_do_update(
+            index_elements=[QueueTokenCounter.lawyer_id, QueueTokenCounter.date],
+            set_={"last_token": sa.func.greatest(QueueTokenCounter.last_token, token_number)},
+        )
     )
-    max_number = db.execute(max_number_stmt).scalar_one_or_none() or 0
+    db.execute(stmt)
 
-    next_number = max_number + 1
-    created: list[QueueEntry] = []
 
-    for booking in bookings:
-        if booking.client_id in existing_clients:
-            continue
+def allocate_queue_entry(
+    db: Session,
+    *,
+    lawyer_id: int,
+    client_id: int,
+    day: date,
+    entry_status: QueueEntryStatus = QueueEntryStatus.waiting,
+) -> QueueEntry:
+    """Take the next token and insert the queue entry in a single statement.
 
-        entry = QueueEntry(
-            date=today,
-            token_number=next_number,
-            lawyer_id=lawyer_id,
-            client_id=booking.client_id,
-            status=QueueEntryStatus.waiting,
+    Runs ``WITH counter AS (upsert RETURNING last_token) INSERT INTO token_queue
+    SELECT ... FROM counter RETURNING *``. Caller commits.
+    """
+    counter = _counter_upsert(lawyer_id, day, 1).cte("counter")
+    insert_stmt = (
+        sa.insert(QueueEntry)
+        .from_select(
+            ["id", "date", "token_number", "lawyer_id", "client_id", "status"],
+            sa.select(
+                sa.cast(sa.literal(str(uuid.uuid4())), QueueEntry.id.type),
+                sa.literal(day, sa.Date),
+                counter.c.last_token,
+                sa.literal(lawyer_id, sa.Integer),
+                sa.literal(client_id, sa.Integer),
+                sa.cast(sa.literal(entry_status.value), QueueEntry.status.type),
+            ),
         )
-        db.add(entry)
-        created.append(entry)
-        existing_clients.add(booking.client_id)
-        next_number += 1
+        .returning(*QueueEntry.__table__.c)
+    )
+    entry = db.execute(sa.select(QueueEntry).from_statement(insert_stmt)).scalar_one()
+    publish_entry_event(db, entry, "entry_created")
+    return entry
+
+
+# Clients with a non-cancelled booking on :day and no entry in that day's
+# queue yet, numbered per lawyer by their earliest booking. The counters CTE
+# reserves one block of tokens per lawyer and the INSERT hands them out.
+_GENERATE_QUEUES_SQL = """
+WITH candidates AS (
+    SELECT DISTINCT ON (b.lawyer_id, b.client_id) b.lawyer_id, b.client_id, b.scheduled_at
+    FROM bookings b
+    WHERE CAST(b.scheduled_at AS date) = :day
+      AND b.status <> 'cancelled'
+      {lawyer_filter}
+      AND NOT EXISTS (
+          SELECT 1 FROM token_queue q
+          WHERE q.lawyer_id = b.lawyer_id AND q.date = :day AND q.client_id = b.client_id
+      )
+    ORDER BY b.lawyer_id, b.client_id, b.scheduled_at
+),
+numbered AS (
+    SELECT lawyer_id, client_id,
+           row_number() OVER (PARTITION BY lawyer_id ORDER BY scheduled_at, client_id) AS rn,
+           count(*) OVER (PARTITION BY lawyer_id) AS n
+    FROM candidates
+),
+counters AS (
+    INSERT INTO token_queue_counters (lawyer_id, date, last_token)
+    SELECT lawyer_id, :day, max(n) FROM numbered GROUP BY lawyer_id
+    ON CONFLICT (lawyer_id, date)
+    DO UPDATE SET last_token = token_queue_counters.last_token + EXCLUDED.last_token
+    RETURNING lawyer_id, last_token
+)
+INSERT INTO token_queue (id, date, token_number, lawyer_id, client_id, status)
+SELECT gen_random_uuid(), :day, c.last_token - n.n + n.rn, n.lawyer_id, n.client_id, 'waiting'
+FROM numbered n
+JOIN counters c ON c.lawyer_id = n.lawyer_id
+ON CONFLICT DO NOTHING
+RETURNING token_queue.*
+"""
 
-    if not created:
-        return []
+# Locks the counter row of every lawyer about to be generated. Concurrent
+# generators for the same queue wait here, and the INSERT above then runs
+# with a fresh snapshot that already sees the winner's entries.
+_LOCK_COUNTERS_SQL = """
+INSERT INTO token_queue_counters (lawyer_id, date, last_token)
+SELECT DISTINCT b.lawyer_id, :day, 0
+FROM bookings b
+WHERE CAST(b.scheduled_at AS date) = :day
+  AND b.status <> 'cancelled'
+  {lawyer_filter}
+ORDER BY b.lawyer_id
+ON CONFLICT (lawyer_id, date) DO UPDATE SET last_token = token_queue_counters.last_token
+"""
 
+
+def generate_queues(db: Session, *, day: date, lawyer_id: int | None = None) -> list[QueueEntry]:
+    """Queue every booked client for ``day`` in one set-based INSERT.
+
+    Limited to one lawyer when ``lawyer_id`` is given, otherwise covers every
+    lawyer with bookings that day. Safe to re-run: already queued clients are
+    skipped. Caller commits.
+    """
+    params = {"day": day}
+    lawyer_filter = ""
+    if lawyer_id is not None:
+        lawyer_filter = "AND b.lawyer_id = :lawyer_id"
+        params["lawyer_id"] = lawyer_id
+
+    db.execute(sa.text(_LOCK_COUNTERS_SQL.format(lawyer_filter=lawyer_filter)), params)
+    stmt = sa.select(QueueEntry).from_statement(
+        sa.text(_GENERATE_QUEUES_SQL.format(lawyer_filter=lawyer_filter))
+    )
+    created = list(db.execute(stmt, params).scalars().all())
+    created.sort(key=lambda e: (e.lawyer_id, e.token_number))
+    mark_dashboard_stale(db, *{e.lawyer_id for e in created})
+
+    publish_queue_events(
+        db,
+        [
+            queue_event(
+                event_type="entry_created",
+                lawyer_id=entry.lawyer_id,
+                day=entry.date,
+                entry=QueueEntryOut.model_validate(entry).model_dump(mode="json"),
+            )
+            for entry in created
+        ],
+    )
+    return created
+
+
+def generate_today_queue(db: Session, *, lawyer_id: int, today: date) -> list[QueueEntry]:
     try:
+        created = generate_queues(db, day=today, lawyer_id=lawyer_id)
+        # RETURNING already loaded every column; detach so the commit does
+        # not expire them and trigger one SELECT per entry on serialisation.
+        for entry in created:
+            db.expunge(entry)
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -65,12 +195,14 @@ def generate_today_queue(db: Session, *, lawyer_id: int, today: date) -> list[Qu
             detail="Queue already generated (conflict while assigning queue numbers)",
         )
 
-    for entry in created:
-        db.refresh(entry)
-
     return created
 
 
+def pregenerate_next_day_queues(db: Session) -> None:
+    """Scheduler job: build tomorrow's queue for every lawyer in bulk."""
+    generate_queues(db, day=date.today() + timedelta(days=1))
+
+
 def list_today_queue(db: Session, *, lawyer_id: int, today: date) -> list[QueueEntry]:
     stmt = (
         sa.select(QueueEntry)
@@ -84,6 +216,32 @@ def list_today_queue(db: Session, *, lawyer_id: int, today: date) -> list[QueueE
     return list(db.execute(stmt).scalars().all())
 
 
+def _notify_next_in_line(db: Session, served: QueueEntry) -> None:
+    """Tell the client holding the lowest waiting token of the day that they are up next."""
+    next_entry = (
+        db.query(QueueEntry)
+        .filter(
+            QueueEntry.lawyer_id == served.lawyer_id,
+            QueueEntry.date == served.date,
+            QueueEntry.status == QueueEntryStatus.waiting,
+            # not flushed yet
+            QueueEntry.id != served.id,
+        )
+        .order_by(QueueEntry.token_number)
+        .first()
+    )
+    if next_entry is None:
+        return
+    notify(
+        db,
+        user_ids=[next_entry.client_id],
+        kind="queue.up_next",
+        title="You're next",
+        body=f"Token {next_entry.token_number} is next in line. Please be ready.",
+        data={"entry_id": str(next_entry.id), "token_number": next_entry.token_number, "date": next_entry.date.isoformat()},
+    )
+
+
 def mark_queue_entry_served(db: Session, *, lawyer_id: int, entry_id) -> QueueEntry:
     entry = db.get(QueueEntry, entry_id)
     if entry is None or entry.lawyer_id != lawyer_id:
@@ -92,6 +250,9 @@ def mark_queue_entry_served(db: Session, *, lawyer_id: int, entry_id) -> QueueEn
     if entry.status != QueueEntryStatus.served:
         entry.status = QueueEntryStatus.served
         entry.served_at = datetime.now(timezone.utc)
+        record_service(db, lawyer_id=entry.lawyer_id, served_at=entry.served_at)
+        publish_entry_event(db, entry, "entry_served")
+        _notify_next_in_line(db, entry)
         db.commit()
         db.refresh(entry)
 
@@ -0,0 +1,170 @@
+"""Wait-time estimates for the token queue.
+
+Service time is taken as the gap between consecutive ``served_at`` stamps of
+the same lawyer on the same day. Each new gap updates an EWMA and a decayed
+one-minute histogram on the lawyer's ``queue_service_stats`` row, so both
+recording and reading the estimate are constant-time and never rescan
+token_queue.
+
+The wait shown to a waiting entry is the service time of the entries ahead
+of it: the head of the queue is up next and waits nothing.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.modules.queue.models import QueueEntry, QueueEntryStatus, QueueServiceStats
+
+EWMA_ALPHA = 0.2
+HISTOGRAM_DECAY = 0.98
+BUCKET_SECONDS = 60
+BUCKETS = 121  # last bucket collects everything >= 2h
+MAX_GAP_SECONDS = 4 * 60 * 60  # longer gaps are breaks, not service time
+DEFAULT_SERVICE_SECONDS = 15 * 60
+
+
+@dataclass
+class ServiceEstimate:
+    mean_seconds: float
+    p50_seconds: float
+    p90_seconds: float
+    samples: int
+
+
+DEFAULT_ESTIMATE = ServiceEstimate(
+    mean_seconds=DEFAULT_SERVICE_SECONDS,
+    p50_seconds=DEFAULT_SERVICE_SECONDS,
+    p90_seconds=DEFAULT_SERVICE_SECONDS,
+    samples=0,
+)
+
+
+def _percentile(histogram: list[float], fraction: float) -> float | None:
+    total = sum(histogram)
+    if total <= 0:
+        return None
+    target = total * fraction
+    running = 0.0
+    for index, weight in enumerate(histogram):
+        running += weight
+        if running >= target:
+            return (index + 0.5) * BUCKET_SECONDS
+    return (len(histogram) - 0.5) * BUCKET_SECONDS
+
+
+def _to_estimate(stats: QueueServiceStats | None) -> ServiceEstimate:
+    if stats is None or not stats.samples or stats.ewma_seconds is None:
+        return DEFAULT_ESTIMATE
+    histogram = stats.histogram or []
+    return ServiceEstimate(
+        mean_seconds=stats.ewma_seconds,
+        p50_seconds=_percentile(histogram, 0.5) or stats.ewma_seconds,
+        p90_seconds=_percentile(histogram, 0.9) or stats.ewma_seconds,
+        samples=stats.samples,
+    )
+
+
+def fold_gap(stats: QueueServiceStats, gap: float) -> None:
+    """Add one service time to the EWMA and the decayed histogram."""
+    stats.ewma_seconds = (
+        gap if stats.ewma_seconds is None
+        else EWMA_ALPHA * gap + (1 - EWMA_ALPHA) * stats.ewma_seconds
+    )
+    histogram = [w * HISTOGRAM_DECAY for w in (stats.histogram or [0.0] * BUCKETS)]
+    histogram[min(int(gap // BUCKET_SECONDS), BUCKETS - 1)] += 1.0
+    stats.histogram = histogram
+    stats.samples = (stats.samples or 0) + 1
+
+
+def record_service(db: Session, *, lawyer_id: int, served_at: datetime) -> None:
+    """Fold one served entry into the lawyer's stats. Caller commits."""
+    db.execute(
+        pg_insert(QueueServiceStats)
+        .values(lawyer_id=lawyer_id, samples=0)
+        .on_conflict_do_nothing(index_elements=[QueueServiceStats.lawyer_id])
+    )
+    stats = db.get(QueueServiceStats, lawyer_id, with_for_update=True, populate_existing=True)
+
+    previous = stats.last_served_at
+    if previous is not None and previous.date() == served_at.date():
+        gap = (served_at - previous).total_seconds()
+        if 0 < gap <= MAX_GAP_SECONDS:
+            fold_gap(stats, gap)
+
+    if previous is None or served_at > previous:
+        stats.last_served_at = served_at
+    # The next call reloads the locked row, so push these values now.
+    db.flush()
+
+
+def get_estimate(db: Session, lawyer_id: int) -> ServiceEstimate:
+    return _to_estimate(db.get(QueueServiceStats, lawyer_id))
+
+
+def get_estimates(db: Session, lawyer_ids) -> dict[int, ServiceEstimate]:
+    ids = set(lawyer_ids)
+    if not ids:
+        return {}
+    rows = db.execute(sa.select(QueueServiceStats).where(QueueServiceStats.lawyer_id.in_(ids))).scalars()
+    found = {row.lawyer_id: _to_estimate(row) for row in rows}
+    return {lawyer_id: found.get(lawyer_id, DEFAULT_ESTIMATE) for lawyer_id in ids}
+
+
+def wait_minutes(position: int, estimate: ServiceEstimate) -> float:
+    """Expected wait of the entry at 1-based ``position`` among the waiting ones."""
+    return round((position - 1) * estimate.mean_seconds / 60, 1)
+
+
+def _set_eta(entry: QueueEntry, position: int | None, estimate: ServiceEstimate) -> None:
+    setattr(entry, "position", position)
+    setattr(entry, "estimated_wait_minutes", wait_minutes(position, estimate) if position is not None else None)
+
+
+def attach_wait_estimates(db: Session, entries: list[QueueEntry]) -> list[QueueEntry]:
+    """Set position/estimated_wait_minutes on waiting entries of a listing.
+
+    Positions come from the order of waiting entries per (lawyer, date) in the
+    listing itself, so callers must pass every waiting entry of that queue.
+    """
+    estimates = get_estimates(db, (e.lawyer_id for e in entries))
+    waiting_by_queue: dict[tuple, list[QueueEntry]] = {}
+    for entry in entries:
+        if entry.status == QueueEntryStatus.waiting:
+            waiting_by_queue.setdefault((entry.lawyer_id, entry.date), []).append(entry)
+        else:
+            _set_eta(entry, None, estimates[entry.lawyer_id])
+
+    for (lawyer_id, _), waiting in waiting_by_queue.items():
+        waiting.sort(key=lambda e: e.token_number)
+        for position, entry in enumerate(waiting, start=1):
+            _set_eta(entry, position, estimates[lawyer_id])
+    return entries
+
+
+def attach_wait_estimate(db: Session, entry: QueueEntry) -> QueueEntry:
+    """Single-entry variant.
+
+    The estimate is one primary-key read; the position is a count of the
+    waiting entries ahead, served by ``ix_token_queue_lawyer_id_date_waiting``
+    and so proportional to the day's waiting queue, not to token_queue.
+    """
+    if entry.status != QueueEntryStatus.waiting:
+        _set_eta(entry, None, DEFAULT_ESTIMATE)
+        return entry
+
+    ahead = db.execute(
+        sa.select(sa.func.count())
+        .select_from(QueueEntry)
+        .where(
+            QueueEntry.lawyer_id == entry.lawyer_id,
+            QueueEntry.date == entry.date,
+            QueueEntry.token_number < entry.token_number,
+            QueueEntry.status == QueueEntryStatus.waiting,
+        )
+    ).scalar_one()
+    _set_eta(entry, ahead + 1, get_estimate(db, entry.lawyer_id))
+    return entry
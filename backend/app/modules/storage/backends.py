@@ -0,0 +1,245 @@
+"""Where uploaded files physically live.
+
+Keys are the relative paths already stored in ``documents.file_path`` /
+``case_documents.stored_path`` (e.g. ``uploads/blobs/ab/cd/<sha>.pdf``), so
+switching backends needs no data migration, only a copy of the files.
+
+- ``local`` (default): files under ``LOCAL_STORAGE_ROOT`` (the backend
+  directory), streamed by the authorised routes in ``serving.py``.
+- ``s3``: any S3-compatible bucket (AWS, MinIO, ...). Downloads use
+  presigned GET URLs, so the bytes never pass through the API workers and
+  every API node sees the same files.
+"""
+
+import os
+import shutil
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+from urllib.parse import quote
+
+
+def _url_expiry_seconds() -> int:
+    return int(os.getenv("STORAGE_URL_EXPIRES", "3600"))
+
+
+@dataclass
+class StoredObject:
+    key: str
+    modified_at: datetime
+
+
+class StorageBackend(ABC):
+    """Minimal interface the document services rely on."""
+
+    @abstractmethod
+    def put_file(self, local_path: str, key: str, *, content_type: Optional[str] = None) -> None:
+        """Move a finished local temp file to ``key``; the temp file is consumed."""
+
+    @abstractmethod
+    def copy(self, src_key: str, dest_key: str) -> None:
+        """Copy ``src_key`` to ``dest_key`` inside the backend."""
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        """Open ``key`` for binary reading."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Whether ``key`` is stored."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove ``key``; missing keys are ignored."""
+
+    @abstractmethod
+    def url(self, key: str, *, expires_in: Optional[int] = None, filename: Optional[str] = None) -> str:
+        """A URL the browser can download ``key`` from, as an attachment."""
+
+    @abstractmethod
+    def list_keys(self, prefix: str, *, start_after: Optional[str] = None) -> Iterator[StoredObject]:
+        """Lazily yield the objects under ``prefix`` in a stable order,
+        resuming after ``start_after`` (a key this method yielded before)."""
+
+
+class LocalStorage(StorageBackend):
+    def __init__(self, root: str = ".", url_prefix: str = "/"):
+        self.root = Path(root)
+        self.url_prefix = url_prefix.rstrip("/") + "/"
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def put_file(self, local_path: str, key: str, *, content_type: Optional[str] = None) -> None:
+        dest = self.path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(local_path, dest)
+
+    def copy(self, src_key: str, dest_key: str) -> None:
+        dest = self.path(dest_key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(self.path(src_key), dest)  # same volume: no data copied
+            # a link keeps the old mtime; the copy is new as far as the GC is concerned
+            os.utime(dest)
+        except FileExistsError:
+            pass
+        except OSError:
+            shutil.copyfile(self.path(src_key), dest)
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self.path(key), "rb")
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def url(self, key: str, *, expires_in: Optional[int] = None, filename: Optional[str] = None) -> str:
+        # the key as a root-relative path; nothing serves it publicly, clients
+        # download through the authorised routes (serving.py)
+        return self.url_prefix + key.lstrip("/")
+
+    def list_keys(self, prefix: str, *, start_after: Optional[str] = None) -> Iterator[StoredObject]:
+        # Depth-first with each directory sorted by name, so the order is
+        # stable and subtrees wholly before ``start_after`` are never opened.
+        after = tuple(start_after.split("/")) if start_after else None
+        yield from self._walk(self.path(prefix), tuple(Path(prefix).parts), after)
+
+    def _walk(self, directory: Path, parts: tuple, after: Optional[tuple]) -> Iterator[StoredObject]:
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        for entry in entries:
+            key_parts = parts + (entry.name,)
+            if entry.is_dir(follow_symlinks=False):
+                if after is not None and key_parts < after[: len(key_parts)]:
+                    continue
+                yield from self._walk(Path(entry.path), key_parts, after)
+            elif entry.is_file(follow_symlinks=False):
+                if after is not None and key_parts <= after:
+                    continue
+                modified = datetime.fromtimestamp(entry.stat().st_mtime, timezone.utc)
+                yield StoredObject("/".join(key_parts), modified)
+
+
+class S3Storage(StorageBackend):
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        endpoint_url: Optional[str] = None,
+        region_name: Optional[str] = None,
+        public_endpoint_url: Optional[str] = None,
+        client=None,
+    ):
+        self.bucket = bucket
+        if client is None:
+            try:
+                import boto3
+            except ImportError as e:  # pragma: no cover - depends on deployment
+                raise RuntimeError("STORAGE_BACKEND=s3 requires the boto3 package") from e
+            client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region_name)
+        self.client = client
+
+        # Presigned URLs must use the host the browser can reach, which differs
+        # from the internal endpoint when MinIO runs next to the API.
+        self.url_client = client
+        if public_endpoint_url and public_endpoint_url != endpoint_url:
+            import boto3
+
+            self.url_client = boto3.client("s3", endpoint_url=public_endpoint_url, region_name=region_name)
+
+    def put_file(self, local_path: str, key: str, *, content_type: Optional[str] = None) -> None:
+        extra = {"ContentType": content_type} if content_type else None
+        # upload_file streams from disk and switches to multipart for big files
+        self.client.upload_file(local_path, self.bucket, key, ExtraArgs=extra)
+        os.remove(local_path)
+
+    def copy(self, src_key: str, dest_key: str) -> None:
+        # managed copy: server-side, multipart for objects over 5 GB
+        self.client.copy({"Bucket": self.bucket, "Key": src_key}, self.bucket, dest_key)
+
+    def open(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def url(self, key: str, *, expires_in: Optional[int] = None, filename: Optional[str] = None) -> str:
+        params = {"Bucket": self.bucket, "Key": key}
+        # attachment, never inline: an upload must not render as a page
+        disposition = "attachment"
+        if filename:
+            disposition += f"; filename*=UTF-8''{quote(filename)}"
+        params["ResponseContentDisposition"] = disposition
+        return self.url_client.generate_presigned_url(
+            "get_object",
+            Params=params,
+            ExpiresIn=expires_in or _url_expiry_seconds(),
+        )
+
+    def list_keys(self, prefix: str, *, start_after: Optional[str] = None) -> Iterator[StoredObject]:
+        params = {"Bucket": self.bucket, "Prefix": prefix.rstrip("/") + "/"}
+        if start_after:
+            params["StartAfter"] = start_after
+        for page in self.client.get_paginator("list_objects_v2").paginate(**params):
+            for item in page.get("Contents", []):
+                yield StoredObject(item["Key"], item["LastModified"])
+
+
+def storage_backend_name() -> str:
+    return os.getenv("STORAGE_BACKEND", "local").lower()
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> StorageBackend:
+    name = storage_backend_name()
+    if name == "local":
+        return LocalStorage(root=os.getenv("LOCAL_STORAGE_ROOT", "."))
+    if name == "s3":
+        bucket = os.getenv("S3_BUCKET")
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+        return S3Storage(
+            bucket,
+            endpoint_url=os.getenv("S3_ENDPOINT_URL") or None,
+            region_name=os.getenv("S3_REGION") or None,
+            public_endpoint_url=os.getenv("S3_PUBLIC_ENDPOINT_URL") or None,
+        )
+    raise RuntimeError(f"Unknown STORAGE_BACKEND '{name}'")
+
+
+def local_source(storage: StorageBackend, key: str, workdir: str) -> str:
+    """Path a worker can open: the file itself locally, a temp copy in ``workdir`` otherwise."""
+    if isinstance(storage, LocalStorage):
+        return str(storage.path(key))
+
+    dest = os.path.join(workdir, os.path.basename(key))
+    body = storage.open(key)
+    try:
+        with open(dest, "wb") as out:
+            shutil.copyfileobj(body, out)
+    finally:
+        body.close()
+    return dest
@@ -0,0 +1,204 @@
+"""Content-addressed blob store for uploaded documents.
+
+Blobs are stored under the key ``uploads/blobs/<aa>/<bb>/<sha256><ext>`` in
+the configured storage backend and are shared by every ``documents`` /
+``case_documents`` row with the same content. The ``storage_blobs`` row
+counts those references; a blob is deleted only when the last one is
+released, and its files only once that delete has committed.
+
+New content first lands under ``private/incoming/`` as ``pending_scan``; the
+scan job then moves it to ``uploads/blobs/`` or ``private/quarantine/``.
+Files are only ever served through the authorised routes (see serving.py).
+"""
+
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import sqlalchemy as sa
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.modules.storage.backends import LocalStorage, get_storage
+from app.modules.storage.jobs import SCAN_JOB, enqueue_job
+from app.modules.storage.models import SCAN_AVAILABLE, SCAN_QUARANTINED, StorageBlob
+from app.modules.storage.serving import content_url
+from app.modules.storage.writer import StoredFile, save_upload_file
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIR = Path("uploads") / "blobs"
+PRIVATE_DIR = Path("private")
+INCOMING_DIR = PRIVATE_DIR / "incoming"
+QUARANTINE_DIR = PRIVATE_DIR / "quarantine"
+TMP_DIR = PRIVATE_DIR / "tmp"
+
+# session.info key: storage keys to delete once the session commits
+_PENDING_DELETES = "storage_pending_deletes"
+
+
+def blob_path(sha256: str, ext: str = "", root: Path = BLOB_DIR) -> Path:
+    return root / sha256[:2] / sha256[2:4] / f"{sha256}{ext.lower()}"
+
+
+def store_upload(db: Session, file: UploadFile, *, max_bytes: Optional[int] = None) -> StoredFile:
+    """Stream ``file`` in and take a reference on its blob. Caller commits.
+
+    The upload is written to a local temp file first (its hash is only known
+    at the end) and handed to the storage backend only if the content is new;
+    new content is queued for scanning. A re-upload of known content keeps the
+    existing key and extension, and content already quarantined is refused.
+    The incoming key is unique per upload, so it never collides with the file
+    of a just-released blob that is still waiting for deletion.
+    """
+    ext = os.path.splitext(file.filename or "")[1]
+    token = uuid.uuid4().hex
+    tmp = save_upload_file(file, TMP_DIR / token, max_bytes=max_bytes)
+
+    try:
+        path, created, scan_status = acquire_blob(
+            db, sha256=tmp.sha256, size_bytes=tmp.size_bytes, path=blob_path(tmp.sha256, ext, INCOMING_DIR / token)
+        )
+        if scan_status == SCAN_QUARANTINED:
+            raise HTTPException(status_code=422, detail="File was rejected by the upload scan")
+        if created:
+            get_storage().put_file(tmp.path, path, content_type=file.content_type)
+            enqueue_job(db, kind=SCAN_JOB, blob_sha256=tmp.sha256)
+        else:
+            # Known content: the blob is already stored, nothing to upload.
+            Path(tmp.path).unlink(missing_ok=True)
+    except BaseException:
+        Path(tmp.path).unlink(missing_ok=True)
+        raise
+
+    return StoredFile(path=path, size_bytes=tmp.size_bytes, sha256=tmp.sha256)
+
+
+def acquire_blob(db: Session, *, sha256: str, size_bytes: int, path: Path) -> tuple[str, bool, str]:
+    """Insert the blob row or bump its refcount.
+
+    Returns the blob's key, whether the row was just created (i.e. the
+    caller has to store the bytes) and its scan status. Files of a released
+    blob are deleted only after its row is gone, so an existing row always
+    means the file is there.
+    """
+    stmt = (
+        pg_insert(StorageBlob)
+        .values(sha256=sha256, path=str(path).replace("\\", "/"), size_bytes=size_bytes, ref_count=1)
+        .on_conflict_do_update(
+            index_elements=[StorageBlob.sha256],
+            set_={"ref_count": StorageBlob.ref_count + 1},
+        )
+        .returning(StorageBlob.path, sa.literal_column("xmax = 0"), StorageBlob.scan_status)
+    )
+    path, created, scan_status = db.execute(stmt).one()
+    return path, bool(created), scan_status
+
+
+def delete_after_commit(db: Session, *keys: Optional[str]) -> None:
+    """Delete storage ``keys`` once ``db`` commits; a rollback keeps them."""
+    db.info.setdefault(_PENDING_DELETES, set()).update(k for k in keys if k)
+
+
+@event.listens_for(Session, "after_commit")
+def _delete_committed_keys(session: Session) -> None:
+    keys = session.info.pop(_PENDING_DELETES, None)
+    if not keys:
+        return
+    # the same content may have been uploaded (and scanned) again meanwhile
+    with session.get_bind().connect() as conn:
+        live = {
+            key
+            for row in conn.execute(
+                sa.select(StorageBlob.path, StorageBlob.thumbnail_path, StorageBlob.preview_path).where(
+                    sa.or_(
+                        StorageBlob.path.in_(keys),
+                        StorageBlob.thumbnail_path.in_(keys),
+                        StorageBlob.preview_path.in_(keys),
+                    )
+                )
+            )
+            for key in row
+        }
+    storage = get_storage()
+    for key in keys - live:
+        try:
+            storage.delete(key)
+        except Exception as e:
+            # an unreachable file must not fail the request; the reconcile job removes it later
+            logger.warning("Could not delete %s: %s", key, e)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_pending_keys(session: Session) -> None:
+    session.info.pop(_PENDING_DELETES, None)
+
+
+def release_blob(db: Session, sha256: str) -> None:
+    """Drop one reference; the last one deletes the row. Caller commits.
+
+    The blob's files (original, thumbnail, preview) are deleted after the
+    commit, so a failed or rolled-back delete leaves rows and files intact.
+    """
+    blob = db.execute(
+        sa.select(StorageBlob).where(StorageBlob.sha256 == sha256).with_for_update()
+    ).scalar_one_or_none()
+    if blob is None:
+        return
+
+    blob.ref_count -= 1
+    if blob.ref_count > 0:
+        return
+
+    delete_after_commit(db, blob.path, blob.thumbnail_path, blob.preview_path)
+    # flushed after the referencing row's delete (FK order) on commit
+    db.delete(blob)
+
+
+def attach_file_urls(db: Session, docs: list, *, path_attr: str, filename_attr: str, route: str) -> list:
+    """Set scan_status / download_url / thumbnail_url / preview_url on document rows.
+
+    On the local backend the URLs point at the authorised ``{route}/{id}/content``
+    (``/thumbnail``, ``/preview``) routes, which check access on every request;
+    the object store hands out short-lived presigned URLs instead.
+
+    Rows that already carry a ``storage_blob`` attribute (loaded by the
+    listing query) need no extra query; otherwise one blob query is made.
+    Files that are not (yet) available get no URLs.
+    """
+    storage = get_storage()
+    local = isinstance(storage, LocalStorage)
+    blobs = {}
+    if all(hasattr(d, "storage_blob") for d in docs):
+        blobs = {d.blob_sha256: d.storage_blob for d in docs if d.storage_blob is not None}
+    else:
+        shas = {d.blob_sha256 for d in docs if getattr(d, "blob_sha256", None)}
+        if shas:
+            blobs = {b.sha256: b for b in db.query(StorageBlob).filter(StorageBlob.sha256.in_(shas)).all()}
+
+    for d in docs:
+        blob = blobs.get(getattr(d, "blob_sha256", None))
+        # legacy rows without a blob predate scanning
+        scan_status = blob.scan_status if blob else SCAN_AVAILABLE
+        setattr(d, "scan_status", scan_status)
+        if scan_status != SCAN_AVAILABLE:
+            setattr(d, "download_url", None)
+            setattr(d, "thumbnail_url", None)
+            setattr(d, "preview_url", None)
+            continue
+
+        thumb = blob.thumbnail_path if blob else None
+        preview = blob.preview_path if blob else None
+        if local:
+            setattr(d, "download_url", content_url(route, d.id))
+            setattr(d, "thumbnail_url", content_url(route, d.id, "thumbnail") if thumb else None)
+            setattr(d, "preview_url", content_url(route, d.id, "preview") if preview else None)
+            continue
+        setattr(d, "download_url", storage.url(getattr(d, path_attr), filename=getattr(d, filename_attr)))
+        setattr(d, "thumbnail_url", storage.url(thumb) if thumb else None)
+        setattr(d, "preview_url", storage.url(preview) if preview else None)
+    return docs
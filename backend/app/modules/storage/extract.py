@@ -0,0 +1,48 @@
+"""Plain-text extraction for search, run inside worker processes.
+
+Like ``render``, this stays free of app imports. PDFs go through PyMuPDF's
+text layer (scanned PDFs without one yield nothing); text files are read as
+UTF-8. Output is capped so one huge upload cannot blow past the tsvector
+size limit.
+"""
+
+import mimetypes
+from typing import Optional
+
+MAX_TEXT_CHARS = 500_000
+
+TEXT_TYPES = {"text/plain", "text/csv", "text/markdown", "application/json"}
+
+
+def _clean(text: str) -> str:
+    # PostgreSQL text cannot hold NUL bytes
+    return text.replace("\x00", " ")[:MAX_TEXT_CHARS]
+
+
+def extract_text(src_path: str, mime_type: Optional[str] = None) -> Optional[str]:
+    """Searchable text of ``src_path``, or None when the type has none."""
+    kind = mime_type or mimetypes.guess_type(src_path)[0]
+
+    if kind == "application/pdf":
+        try:
+            import pymupdf
+        except ImportError:
+            return None
+        parts = []
+        size = 0
+        with pymupdf.open(src_path) as pdf:
+            for page in pdf:
+                text = page.get_text()
+                parts.append(text)
+                size += len(text)
+                if size >= MAX_TEXT_CHARS:
+                    break
+        return _clean("\n".join(parts))
+
+    if kind in TEXT_TYPES:
+        with open(src_path, "rb") as f:
+            # 4 bytes per char at most in UTF-8
+            raw = f.read(MAX_TEXT_CHARS * 4)
+        return _clean(raw.decode("utf-8", errors="replace"))
+
+    return None
@@ -0,0 +1,141 @@
+"""DB-backed job queue for per-blob background work.
+
+Jobs are claimed with ``FOR UPDATE SKIP LOCKED``, so several workers can
+drain the table concurrently. Claims are leases (``lease_jobs``): the claim
+commits at once with ``run_after`` pushed ``LEASE_SECONDS`` out, the work
+runs outside any transaction, and the result is written in a second short
+one (``finish_jobs``). A worker that dies mid-job leaves its lease to expire
+and the job is claimed again.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from multiprocessing import get_context
+from typing import Dict, NamedTuple, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.modules.storage.models import StorageBlob, StorageJob
+
+SCAN_JOB = "scan"
+PREVIEW_JOB = "preview"
+EXTRACT_TEXT_JOB = "extract_text"
+# queued for every blob once its scan has passed
+BLOB_JOB_KINDS = (PREVIEW_JOB, EXTRACT_TEXT_JOB)
+
+JOB_PENDING = "pending"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 60
+# longer than the slowest render/extract timeout
+LEASE_SECONDS = 10 * 60
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_worker_pool() -> ProcessPoolExecutor:
+    """Process pool shared by the blob jobs (scanning, rendering, text extraction)."""
+    global _pool
+    if _pool is None:
+        # spawn: the API process runs threads, which fork does not mix well with
+        _pool = ProcessPoolExecutor(
+            max_workers=int(os.getenv("STORAGE_WORKERS", "2")),
+            mp_context=get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_worker_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def enqueue_blob_jobs(db: Session, blob_sha256: str) -> None:
+    for kind in BLOB_JOB_KINDS:
+        enqueue_job(db, kind=kind, blob_sha256=blob_sha256)
+
+
+def enqueue_job(db: Session, *, kind: str, blob_sha256: str) -> None:
+    """Queue ``kind`` work for a blob unless it is already queued. Caller commits."""
+    db.execute(
+        pg_insert(StorageJob)
+        .values(kind=kind, blob_sha256=blob_sha256, status=JOB_PENDING, attempts=0)
+        .on_conflict_do_nothing(constraint="uq_storage_jobs_kind_blob")
+    )
+
+
+class LeasedJob(NamedTuple):
+    id: int
+    blob_sha256: str
+    blob_path: Optional[str]  # None once the blob is gone
+
+
+def lease_jobs(db: Session, *, kind: str, limit: int) -> list[LeasedJob]:
+    """Claim up to ``limit`` due jobs for work outside a transaction. Commits."""
+    due = (
+        sa.select(StorageJob.id)
+        .where(
+            StorageJob.kind == kind,
+            StorageJob.status == JOB_PENDING,
+            StorageJob.run_after <= sa.func.now(),
+        )
+        .order_by(StorageJob.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    leased = db.execute(
+        sa.update(StorageJob)
+        .where(StorageJob.id.in_(due.scalar_subquery()))
+        .values(run_after=sa.func.now() + timedelta(seconds=LEASE_SECONDS))
+        .returning(StorageJob.id, StorageJob.blob_sha256)
+        .execution_options(synchronize_session=False)
+    ).all()
+    paths = {}
+    if leased:
+        paths = dict(
+            db.execute(
+                sa.select(StorageBlob.sha256, StorageBlob.path).where(
+                    StorageBlob.sha256.in_({sha for _, sha in leased})
+                )
+            ).all()
+        )
+    db.commit()
+    return [LeasedJob(job_id, sha, paths.get(sha)) for job_id, sha in sorted(leased)]
+
+
+def finish_jobs(db: Session, errors: Dict[int, Optional[str]]) -> None:
+    """Complete leased jobs (error None) or schedule their retry. Caller commits."""
+    if not errors:
+        return
+    jobs = db.execute(
+        sa.select(StorageJob).where(StorageJob.id.in_(errors)).order_by(StorageJob.id).with_for_update()
+    ).scalars()
+    for job in jobs:
+        error = errors[job.id]
+        if error is None:
+            complete_job(job)
+        else:
+            fail_job(job, error)
+
+
+def complete_job(job: StorageJob) -> None:
+    job.status = JOB_DONE
+    job.last_error = None
+
+
+def fail_job(job: StorageJob, error: str) -> None:
+    """Retry with exponential backoff; give up after MAX_ATTEMPTS."""
+    job.attempts = (job.attempts or 0) + 1
+    job.last_error = error[:2000]
+    if job.attempts >= MAX_ATTEMPTS:
+        job.status = JOB_FAILED
+    else:
+        job.run_after = datetime.now(timezone.utc) + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
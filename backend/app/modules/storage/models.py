@@ -0,0 +1,93 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+# text search configuration shared by every indexed column and query
+SEARCH_CONFIG = "english"
+
+# storage_blobs.scan_status; the worker-side validate module uses the same strings
+SCAN_PENDING = "pending_scan"
+SCAN_AVAILABLE = "available"
+SCAN_QUARANTINED = "quarantined"
+
+
+class StorageBlob(Base):
+    """One stored file per distinct content, shared by every row that uploaded it."""
+
+    __tablename__ = "storage_blobs"
+    __table_args__ = (
+        Index("ix_storage_blobs_content_tsv", "content_tsv", postgresql_using="gin"),
+    )
+
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String(500), nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Upload validation: new blobs wait in a private key until the scan job
+    # publishes them (available) or moves them to quarantine.
+    scan_status = Column(String(16), nullable=False, server_default=SCAN_PENDING)
+    detected_mime = Column(String(100), nullable=True)
+    scan_detail = Column(Text, nullable=True)
+    scanned_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Derived renditions, filled in by the background preview job
+    thumbnail_path = Column(String(500), nullable=True)
+    preview_path = Column(String(500), nullable=True)
+    # Extracted text for search, filled in by the background extract_text job
+    content_tsv = deferred(Column(TSVECTOR, nullable=True))
+
+
+class StorageJob(Base):
+    """Background work on a blob (scan, previews, text extraction), one row per (kind, blob).
+
+    Workers lease pending rows (FOR UPDATE SKIP LOCKED, then ``run_after``
+    pushed past the work) and commit before doing the work, so no lock is held
+    meanwhile; a crashed worker's lease simply runs out and the job is picked
+    up again.
+    """
+
+    __tablename__ = "storage_jobs"
+    __table_args__ = (
+        UniqueConstraint("kind", "blob_sha256", name="uq_storage_jobs_kind_blob"),
+        Index("ix_storage_jobs_pending", "kind", "run_after", "id", postgresql_where=text("status = 'pending'")),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(32), nullable=False)
+    blob_sha256 = Column(
+        String(64),
+        ForeignKey("storage_blobs.sha256", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    status = Column(String(16), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    run_after = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class StorageReconcileState(Base):
+    """Checkpoint of one storage reconciliation phase (``files``, ``documents``, ``case_documents``).
+
+    ``cursor`` is the last storage key / row id checked in the current pass;
+    the counters cover that pass and are copied to ``last_pass`` when it ends.
+    """
+
+    __tablename__ = "storage_reconcile_state"
+
+    name = Column(String(32), primary_key=True)
+    cursor = Column(Text, nullable=True)
+    scanned = Column(BigInteger, nullable=False, default=0)
+    orphans = Column(BigInteger, nullable=False, default=0)
+    removed = Column(BigInteger, nullable=False, default=0)
+    pass_started_at = Column(DateTime(timezone=True), nullable=True)
+    last_completed_at = Column(DateTime(timezone=True), nullable=True)
+    last_pass = Column(JSONB, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -0,0 +1,87 @@
+"""Background thumbnail / preview generation for uploaded blobs.
+
+Blobs get a ``preview`` job once they pass the upload scan. The scheduler
+job below leases a batch, renders it in the storage worker pool (CPU-bound
+work stays off the API threads) and stores ``<blob>.thumb.webp`` /
+``<blob>.preview.webp`` next to the blob in the storage backend.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.modules.storage.backends import get_storage, local_source
+from app.modules.storage.jobs import PREVIEW_JOB, finish_jobs, get_worker_pool, lease_jobs
+from app.modules.storage.models import StorageBlob
+from app.modules.storage.render import render_previews
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 20
+
+
+def rendition_key(blob_key: str, rendition: str) -> str:
+    base, _ = os.path.splitext(blob_key)
+    return f"{base}.{rendition}.webp"
+
+
+def process_preview_jobs(db: Session, limit: int = BATCH_SIZE) -> int:
+    """Scheduler job: render one batch of pending previews. Returns jobs handled.
+
+    The jobs are leased, so no transaction or row lock is held while the
+    sources are fetched and rendered; the new keys and the job outcomes are
+    written in one short transaction at the end.
+    """
+    jobs = lease_jobs(db, kind=PREVIEW_JOB, limit=limit)
+    if not jobs:
+        return 0
+
+    storage = get_storage()
+    errors = {}
+    renditions = {}
+    workdir = tempfile.mkdtemp(prefix="previews-")
+    try:
+        pending = []
+        for job in jobs:
+            if job.blob_path is None:
+                errors[job.id] = None
+                continue
+            try:
+                src = local_source(storage, job.blob_path, workdir)
+            except Exception as e:
+                errors[job.id] = f"fetch failed: {e}"
+                continue
+            thumb = os.path.join(workdir, f"{job.blob_sha256}.thumb.webp")
+            preview = os.path.join(workdir, f"{job.blob_sha256}.preview.webp")
+            future = get_worker_pool().submit(render_previews, src, None, thumb, preview)
+            pending.append((job, future, thumb, preview))
+
+        for job, future, thumb, preview in pending:
+            try:
+                if future.result(timeout=120):
+                    thumb_key = rendition_key(job.blob_path, "thumb")
+                    preview_key = rendition_key(job.blob_path, "preview")
+                    storage.put_file(thumb, thumb_key, content_type="image/webp")
+                    storage.put_file(preview, preview_key, content_type="image/webp")
+                    renditions[job.blob_sha256] = (thumb_key, preview_key)
+                errors[job.id] = None
+            except Exception as e:
+                logger.warning("Preview for blob %s failed: %s", job.blob_sha256, e)
+                errors[job.id] = str(e) or e.__class__.__name__
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    # a blob released meanwhile matches nothing; reconciliation removes its renditions
+    for sha256, (thumb_key, preview_key) in renditions.items():
+        db.execute(
+            sa.update(StorageBlob)
+            .where(StorageBlob.sha256 == sha256)
+            .values(thumbnail_path=thumb_key, preview_path=preview_key)
+        )
+    finish_jobs(db, errors)
+    db.commit()
+    return len(jobs)
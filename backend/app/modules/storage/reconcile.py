@@ -0,0 +1,253 @@
+"""Reconciliation between stored files and the rows that point at them.
+
+Three phases, each an incremental pass with its own checkpoint row in
+``storage_reconcile_state``:
+
+- ``files``: walks ``private/`` and ``uploads/`` in the storage backend and
+  finds files no blob, document or case document references (failed
+  commits after an upload, deletes whose file removal failed).
+- ``documents`` / ``case_documents``: streams the tables by id and finds
+  rows whose file is missing.
+
+Each run handles at most ``RUN_BUDGET`` keys / rows per phase, in batches
+of ``BATCH_SIZE``, and commits the cursor after every batch, so memory stays
+flat and a restart resumes where the last run stopped. A finished pass
+starts again after ``STORAGE_RECONCILE_INTERVAL_HOURS``.
+
+``STORAGE_RECONCILE_MODE=report`` (default) only logs and counts orphans;
+``delete`` removes orphaned files and deletes rows whose file is gone.
+"""
+
+import logging
+import os
+import string
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Callable, Iterator, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.modules.case_files.models import CaseDocument
+from app.modules.case_files.service import CaseDocumentsService
+from app.modules.documents.models import Document
+from app.modules.documents.service import delete_document
+from app.modules.storage.backends import StorageBackend, StoredObject, get_storage
+from app.modules.storage.models import StorageReconcileState
+
+logger = logging.getLogger(__name__)
+
+PHASE_FILES = "files"
+PHASE_DOCUMENTS = "documents"
+PHASE_CASE_DOCUMENTS = "case_documents"
+
+# storage prefixes the app writes to, in listing order
+ROOTS = ("private", "uploads")
+BATCH_SIZE = 1000
+RUN_BUDGET = 20_000
+
+# keys (with the blob hash parsed from the file name, if any) nothing refers to
+_UNREFERENCED_SQL = sa.text(
+    """
+    SELECT t.key
+    FROM unnest(CAST(:keys AS text[]), CAST(:shas AS text[])) AS t(key, sha)
+    WHERE NOT EXISTS (
+            SELECT 1 FROM storage_blobs b
+            WHERE b.sha256 = t.sha AND t.key IN (b.path, b.thumbnail_path, b.preview_path)
+        )
+      AND NOT EXISTS (SELECT 1 FROM documents d WHERE d.file_path = t.key)
+      AND NOT EXISTS (SELECT 1 FROM case_documents c WHERE c.stored_path = t.key)
+    """
+)
+
+
+def reconcile_mode() -> str:
+    return os.getenv("STORAGE_RECONCILE_MODE", "report").lower()
+
+
+def _grace_period() -> timedelta:
+    # files younger than this may belong to an upload that has not committed yet
+    return timedelta(seconds=int(os.getenv("STORAGE_RECONCILE_GRACE_SECONDS", "3600")))
+
+
+def _pass_interval() -> timedelta:
+    return timedelta(hours=float(os.getenv("STORAGE_RECONCILE_INTERVAL_HOURS", "24")))
+
+
+def _blob_sha(key: str) -> Optional[str]:
+    """``<sha256>.pdf`` / ``<sha256>.thumb.webp`` -> the hash; None for other names."""
+    name = key.rsplit("/", 1)[-1]
+    sha = name[:64]
+    if len(sha) == 64 and all(c in string.hexdigits for c in sha) and name[64:65] in ("", "."):
+        return sha.lower()
+    return None
+
+
+def _get_state(db: Session, name: str) -> StorageReconcileState:
+    db.execute(
+        pg_insert(StorageReconcileState)
+        .values(name=name, scanned=0, orphans=0, removed=0)
+        .on_conflict_do_nothing(index_elements=[StorageReconcileState.name])
+    )
+    return db.get(StorageReconcileState, name, populate_existing=True)
+
+
+def _start_pass(state: StorageReconcileState, now: datetime) -> bool:
+    """Begin a pass if none is running and the last one is old enough."""
+    if state.pass_started_at is not None:
+        return True
+    if state.last_completed_at is not None and now - state.last_completed_at < _pass_interval():
+        return False
+    state.pass_started_at = now
+    state.cursor = None
+    state.scanned = state.orphans = state.removed = 0
+    return True
+
+
+def _finish_pass(state: StorageReconcileState, now: datetime) -> None:
+    state.last_pass = {
+        "started_at": state.pass_started_at.isoformat(),
+        "completed_at": now.isoformat(),
+        "scanned": state.scanned,
+        "orphans": state.orphans,
+        "removed": state.removed,
+    }
+    state.last_completed_at = now
+    state.pass_started_at = None
+    state.cursor = None
+    logger.info(
+        "Storage reconcile %s pass done: %s checked, %s orphans, %s removed",
+        state.name, state.scanned, state.orphans, state.removed,
+    )
+
+
+def _iter_objects(storage: StorageBackend, cursor: Optional[str]) -> Iterator[StoredObject]:
+    for root in ROOTS:
+        if cursor and cursor.split("/", 1)[0] > root:
+            continue  # already done in this pass
+        start = cursor if cursor and cursor.startswith(root + "/") else None
+        yield from storage.list_keys(root, start_after=start)
+
+
+def _reconcile_files(db: Session, state: StorageReconcileState, storage: StorageBackend, *, delete: bool) -> bool:
+    """One run of the files phase; True when the pass reached the end."""
+    cutoff = datetime.now(timezone.utc) - _grace_period()
+    objects = _iter_objects(storage, state.cursor)
+    handled = 0
+    while handled < RUN_BUDGET:
+        batch = list(islice(objects, BATCH_SIZE))
+        if not batch:
+            return True
+
+        keys = [o.key for o in batch if o.modified_at < cutoff]
+        orphans = (
+            db.execute(_UNREFERENCED_SQL, {"keys": keys, "shas": [_blob_sha(k) for k in keys]}).scalars().all()
+            if keys
+            else []
+        )
+        for key in orphans:
+            logger.warning("Orphaned file without a row: %s", key)
+            if delete:
+                try:
+                    storage.delete(key)
+                    state.removed += 1
+                except Exception as e:
+                    logger.warning("Could not remove orphaned file %s: %s", key, e)
+
+        state.orphans += len(orphans)
+        state.scanned += len(batch)
+        state.cursor = batch[-1].key
+        handled += len(batch)
+        db.commit()
+    return False
+
+
+def _reconcile_rows(
+    db: Session,
+    state: StorageReconcileState,
+    storage: StorageBackend,
+    *,
+    model,
+    path_column,
+    remove: Optional[Callable[[Session, object], None]],
+) -> bool:
+    """One run of a table phase; True when the pass reached the end."""
+    last_id = int(state.cursor or 0)
+    handled = 0
+    while handled < RUN_BUDGET:
+        rows = db.execute(
+            sa.select(model.id, path_column.label("path"), model.__table__.c.case_id)
+            .where(model.id > last_id)
+            .order_by(model.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return True
+
+        exists: dict[str, bool] = {}  # rows sharing a blob share the check
+        for row in rows:
+            if row.path not in exists:
+                exists[row.path] = storage.exists(row.path)
+            if exists[row.path]:
+                continue
+            # the scan job may have moved the file since the batch was read
+            current = db.execute(sa.select(path_column).where(model.id == row.id)).scalar_one_or_none()
+            if current is None or current != row.path and storage.exists(current):
+                continue
+
+            state.orphans += 1
+            logger.warning("%s %s points at a missing file: %s", model.__tablename__, row.id, row.path)
+            if remove is not None:
+                remove(db, row)
+                state.removed += 1
+
+        state.scanned += len(rows)
+        last_id = rows[-1].id
+        state.cursor = str(last_id)
+        handled += len(rows)
+        db.commit()
+    return False
+
+
+def _remove_document(db: Session, row) -> None:
+    delete_document(db, row.id)
+
+
+def _remove_case_document(db: Session, row) -> None:
+    CaseDocumentsService.delete_document(db, row.case_id, row.id)
+
+
+def reconcile_storage(db: Session) -> None:
+    """Scheduler job: advance each reconciliation phase by one bounded run."""
+    storage = get_storage()
+    delete = reconcile_mode() == "delete"
+    phases = (
+        (PHASE_FILES, lambda state: _reconcile_files(db, state, storage, delete=delete)),
+        (
+            PHASE_DOCUMENTS,
+            lambda state: _reconcile_rows(
+                db, state, storage, model=Document, path_column=Document.file_path,
+                remove=_remove_document if delete else None,
+            ),
+        ),
+        (
+            PHASE_CASE_DOCUMENTS,
+            lambda state: _reconcile_rows(
+                db, state, storage, model=CaseDocument, path_column=CaseDocument.stored_path,
+                remove=_remove_case_document if delete else None,
+            ),
+        ),
+    )
+
+    for name, run in phases:
+        state = _get_state(db, name)
+        now = datetime.now(timezone.utc)
+        if not _start_pass(state, now):
+            db.commit()
+            continue
+        db.commit()
+
+        if run(state):
+            _finish_pass(state, datetime.now(timezone.utc))
+        db.commit()
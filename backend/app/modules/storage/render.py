@@ -0,0 +1,67 @@
+"""Thumbnail / preview rendering, run inside worker processes.
+
+Kept free of app imports so spawned pool processes start quickly. Pillow
+handles images; PyMuPDF renders the first page of PDFs. Either library
+missing just means that type gets no previews.
+"""
+
+import mimetypes
+import os
+from typing import Optional
+
+THUMBNAIL_PX = 256
+PREVIEW_PX = 1024
+WEBP_QUALITY = 70
+
+IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp", "image/bmp", "image/tiff"}
+
+
+def _guess_type(src_path: str, mime_type: Optional[str]) -> Optional[str]:
+    return mime_type or mimetypes.guess_type(src_path)[0]
+
+
+def _first_page_image(src_path: str, mime_type: Optional[str]):
+    from PIL import Image
+
+    kind = _guess_type(src_path, mime_type)
+    if kind == "application/pdf":
+        import pymupdf
+
+        with pymupdf.open(src_path) as pdf:
+            if pdf.page_count == 0:
+                return None
+            page = pdf[0]
+            # render straight at preview size instead of full resolution
+            zoom = PREVIEW_PX / max(page.rect.width, page.rect.height, 1)
+            pix = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+            return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+    if kind in IMAGE_TYPES:
+        image = Image.open(src_path)
+        image.draft("RGB", (PREVIEW_PX, PREVIEW_PX))  # cheap JPEG downscale on decode
+        image.seek(0)
+        return image.convert("RGB")
+
+    return None
+
+
+def render_previews(src_path: str, mime_type: Optional[str], thumb_path: str, preview_path: str) -> bool:
+    """Write a WEBP thumbnail and preview of ``src_path``'s first page.
+
+    Returns False when the file type has no visual preview.
+    """
+    try:
+        image = _first_page_image(src_path, mime_type)
+    except ImportError:
+        return False
+    if image is None:
+        return False
+
+    os.makedirs(os.path.dirname(thumb_path) or ".", exist_ok=True)
+    preview = image.copy()
+    preview.thumbnail((PREVIEW_PX, PREVIEW_PX))
+    preview.save(preview_path, "WEBP", quality=WEBP_QUALITY)
+
+    image.thumbnail((THUMBNAIL_PX, THUMBNAIL_PX))
+    image.save(thumb_path, "WEBP", quality=WEBP_QUALITY)
+    return True
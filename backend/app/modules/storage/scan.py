@@ -0,0 +1,125 @@
+"""Asynchronous upload validation.
+
+Uploads are stored under ``private/incoming/`` and registered as
+``pending_scan`` without waiting for any checks. The scheduler job below
+sniffs and scans them in the storage worker pool, then publishes clean
+blobs to ``uploads/blobs/`` (and queues their previews / text extraction)
+or moves rejected ones to ``private/quarantine/``. Pending and quarantined
+blobs get no download URLs and are refused by the content endpoint.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.modules.case_files.models import CaseDocument
+from app.modules.documents.models import Document
+from app.modules.storage.backends import get_storage, local_source
+from app.modules.storage.blobs import BLOB_DIR, QUARANTINE_DIR, blob_path, delete_after_commit
+from app.modules.storage.jobs import (
+    SCAN_JOB,
+    LeasedJob,
+    enqueue_blob_jobs,
+    finish_jobs,
+    get_worker_pool,
+    lease_jobs,
+)
+from app.modules.storage.models import SCAN_AVAILABLE, SCAN_PENDING, StorageBlob
+from app.modules.storage.validate import Verdict, validate_file
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 20
+
+
+def scanner_config() -> tuple[str, str | None]:
+    return os.getenv("MALWARE_SCANNER", "stub").lower(), os.getenv("CLAMAV_ADDRESS") or None
+
+
+def _move_blob(db: Session, blob: StorageBlob, dest_key: str) -> None:
+    """Copy the blob to ``dest_key`` and repoint it and its rows; the old key goes after commit."""
+    old_key = blob.path
+    get_storage().copy(old_key, dest_key)
+    blob.path = dest_key
+    db.execute(sa.update(Document).where(Document.blob_sha256 == blob.sha256).values(file_path=dest_key))
+    db.execute(
+        sa.update(CaseDocument).where(CaseDocument.blob_sha256 == blob.sha256).values(stored_path=dest_key)
+    )
+    delete_after_commit(db, old_key)
+
+
+def _publish(db: Session, job: LeasedJob, verdict: Verdict) -> None:
+    """Apply one verdict: lock the blob only for the move and the row updates. Commits."""
+    blob = db.get(StorageBlob, job.blob_sha256, with_for_update=True)
+    # released, or already handled by another run while we were scanning
+    if blob is not None and blob.scan_status == SCAN_PENDING and blob.path == job.blob_path:
+        root = BLOB_DIR if verdict.status == SCAN_AVAILABLE else QUARANTINE_DIR
+        _move_blob(db, blob, str(blob_path(blob.sha256, Path(blob.path).suffix, root)))
+        blob.scan_status = verdict.status
+        blob.detected_mime = verdict.mime_type
+        blob.scan_detail = verdict.detail
+        blob.scanned_at = datetime.now(timezone.utc)
+        if verdict.status == SCAN_AVAILABLE:
+            enqueue_blob_jobs(db, blob.sha256)
+        else:
+            logger.warning("Quarantined blob %s: %s", blob.sha256, verdict.detail)
+    finish_jobs(db, {job.id: None})
+    db.commit()
+
+
+def process_scan_jobs(db: Session, limit: int = BATCH_SIZE) -> int:
+    """Scheduler job: validate one batch of pending uploads. Returns jobs handled.
+
+    The jobs are leased, so no transaction or row lock is held while the
+    files are fetched and scanned; uploads and deletes of the same content
+    only wait for the short per-blob move at the end.
+    """
+    jobs = lease_jobs(db, kind=SCAN_JOB, limit=limit)
+    if not jobs:
+        return 0
+
+    storage = get_storage()
+    scanner, address = scanner_config()
+    errors = {}
+    verdicts = []
+    workdir = tempfile.mkdtemp(prefix="scan-")
+    try:
+        pending = []
+        for job in jobs:
+            if job.blob_path is None:
+                errors[job.id] = None
+                continue
+            try:
+                src = local_source(storage, job.blob_path, workdir)
+            except Exception as e:
+                errors[job.id] = f"fetch failed: {e}"
+                continue
+            ext = Path(job.blob_path).suffix
+            pending.append((job, get_worker_pool().submit(validate_file, src, ext, scanner, address)))
+
+        for job, future in pending:
+            try:
+                verdicts.append((job, future.result(timeout=300)))
+            except Exception as e:
+                # scanner down or file unreadable: stay pending and retry
+                logger.warning("Scan of blob %s failed: %s", job.blob_sha256, e)
+                errors[job.id] = str(e) or e.__class__.__name__
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for job, verdict in verdicts:
+        try:
+            _publish(db, job, verdict)
+        except Exception as e:
+            db.rollback()
+            logger.warning("Publishing scanned blob %s failed: %s", job.blob_sha256, e)
+            errors[job.id] = f"publish failed: {e}"
+    finish_jobs(db, errors)
+    db.commit()
+    return len(jobs)
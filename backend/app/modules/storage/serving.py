@@ -0,0 +1,107 @@
+"""Authorised responses for stored uploads.
+
+Routes check access first and then hand the storage key here. There is no
+public mount: on the local backend the file is streamed by ``FileResponse``
+(Range / If-Range, ETag and 304s), on the object store the client is
+redirected to a short-lived presigned URL. Either way the bytes go out as an
+attachment with ``nosniff``, so an upload is never rendered on our origin.
+"""
+
+import mimetypes
+import os
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import FileResponse, RedirectResponse
+from sqlalchemy.orm import Session
+
+from app.modules.storage.backends import LocalStorage, get_storage
+from app.modules.storage.models import SCAN_AVAILABLE, SCAN_PENDING, StorageBlob
+
+# thumbnail / preview routes, by the StorageBlob column they serve
+RENDITIONS = {"thumbnail": "thumbnail_path", "preview": "preview_path"}
+
+
+def content_url(route: str, item_id: int, rendition: Optional[str] = None) -> str:
+    """``{route}/{id}/content``, or ``{route}/{id}/thumbnail`` / ``/preview``."""
+    return f"{route}/{item_id}/{rendition or 'content'}"
+
+
+def ensure_servable(db: Session, sha256: Optional[str]) -> Optional[StorageBlob]:
+    """Only files that passed the upload scan are handed out. Returns the blob, if any."""
+    if not sha256:
+        return None
+    blob = db.get(StorageBlob, sha256)
+    if blob is None or blob.scan_status == SCAN_AVAILABLE:
+        return blob
+    if blob.scan_status == SCAN_PENDING:
+        raise HTTPException(status_code=409, detail="File is still being scanned")
+    raise HTTPException(status_code=403, detail="File was quarantined by the upload scan")
+
+
+def rendition_key(blob: Optional[StorageBlob], rendition: str) -> str:
+    key = getattr(blob, RENDITIONS[rendition], None) if blob is not None else None
+    if not key:
+        raise HTTPException(status_code=404, detail=f"No {rendition} for this file")
+    return key
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return etag in tags or f"W/{etag}" in tags
+
+
+def not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since.timestamp()
+    return False
+
+
+def serve_stored_file(request: Request, key: str, *, filename: str, immutable_tag: Optional[str] = None) -> Response:
+    """Stream (local) or redirect to (object store) ``key`` as an attachment.
+
+    ``immutable_tag`` is a content hash the bytes can never change under; it
+    becomes the ETag and lets clients cache the file for a year.
+    """
+    storage = get_storage()
+    if not isinstance(storage, LocalStorage):
+        # The object store serves the bytes (and ranges) itself.
+        return RedirectResponse(storage.url(key, filename=filename), status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    path = storage.path(key)
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    if immutable_tag:
+        etag = f'"{immutable_tag}"'
+        cache_control = "private, max-age=31536000, immutable"
+    else:
+        etag = f'"{int(stat_result.st_mtime)}-{stat_result.st_size}"'
+        cache_control = "private, no-cache"
+    headers = {"ETag": etag, "Cache-Control": cache_control, "X-Content-Type-Options": "nosniff"}
+
+    if not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return FileResponse(
+        path,
+        media_type=mimetypes.guess_type(filename)[0] or mimetypes.guess_type(str(path))[0],
+        filename=filename,
+        content_disposition_type="attachment",
+        headers=headers,
+        stat_result=stat_result,
+    )
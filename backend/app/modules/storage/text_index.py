@@ -0,0 +1,85 @@
+"""Background full-text indexing of uploaded blobs.
+
+Blobs get an ``extract_text`` job next to their preview job once they
+pass the upload scan. The scheduler job below extracts text in the storage
+worker pool and stores it as ``storage_blobs.content_tsv``; document search
+matches against that, the document titles and the comments on it.
+"""
+
+import logging
+import shutil
+import tempfile
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.modules.storage.backends import get_storage, local_source
+from app.modules.storage.extract import extract_text
+from app.modules.storage.jobs import EXTRACT_TEXT_JOB, finish_jobs, get_worker_pool, lease_jobs
+from app.modules.storage.models import SEARCH_CONFIG, StorageBlob
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 20
+
+
+def _store_tsvector(db: Session, sha256: str, text: str) -> None:
+    # savepoint: a document too big for a tsvector must not roll back the batch
+    with db.begin_nested():
+        db.execute(
+            sa.update(StorageBlob)
+            .where(StorageBlob.sha256 == sha256)
+            .values(content_tsv=sa.func.to_tsvector(SEARCH_CONFIG, text))
+        )
+
+
+def process_text_jobs(db: Session, limit: int = BATCH_SIZE) -> int:
+    """Scheduler job: index one batch of pending blobs. Returns jobs handled.
+
+    The jobs are leased, so no transaction or row lock is held while the
+    sources are fetched and the text extracted; the tsvectors and the job
+    outcomes are written in one short transaction at the end.
+    """
+    jobs = lease_jobs(db, kind=EXTRACT_TEXT_JOB, limit=limit)
+    if not jobs:
+        return 0
+
+    storage = get_storage()
+    errors = {}
+    texts = {}
+    workdir = tempfile.mkdtemp(prefix="extract-")
+    try:
+        pending = []
+        for job in jobs:
+            if job.blob_path is None:
+                errors[job.id] = None
+                continue
+            try:
+                src = local_source(storage, job.blob_path, workdir)
+            except Exception as e:
+                errors[job.id] = f"fetch failed: {e}"
+                continue
+            pending.append((job, get_worker_pool().submit(extract_text, src)))
+
+        for job, future in pending:
+            try:
+                text = future.result(timeout=120)
+                if text and text.strip():
+                    texts[job.id] = (job.blob_sha256, text)
+                errors[job.id] = None
+            except Exception as e:
+                logger.warning("Indexing blob %s failed: %s", job.blob_sha256, e)
+                errors[job.id] = str(e) or e.__class__.__name__
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    # a blob released meanwhile matches nothing
+    for job_id, (sha256, text) in texts.items():
+        try:
+            _store_tsvector(db, sha256, text)
+        except Exception as e:
+            logger.warning("Indexing blob %s failed: %s", sha256, e)
+            errors[job_id] = str(e) or e.__class__.__name__
+    finish_jobs(db, errors)
+    db.commit()
+    return len(jobs)
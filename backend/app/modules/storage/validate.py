@@ -0,0 +1,198 @@
+"""Upload validation (MIME sniffing + malware scan), run inside worker processes.
+
+Like ``render`` this module has no app imports. ``validate_file`` returns a
+verdict for one file; a scanner that cannot be reached raises ``ScanError``
+so the job is retried instead of the file being let through.
+
+Scanners:
+
+- ``stub``: flags the EICAR test signature only; for development and tests.
+- ``clamav``: streams the file to clamd (``INSTREAM``) over
+  ``tcp://host:port`` or ``unix:///path/to/clamd.sock``.
+- ``none``: MIME checks only.
+"""
+
+import socket
+import struct
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlparse
+
+VERDICT_AVAILABLE = "available"
+VERDICT_QUARANTINED = "quarantined"
+
+SNIFF_BYTES = 8192
+SCAN_CHUNK = 64 * 1024
+CLAMAV_TIMEOUT = 60
+
+EICAR_MARKER = b"EICAR-STANDARD-ANTIVIRUS-TEST-FILE"
+
+OLE_TYPE = "application/x-ole-storage"
+ZIP_TYPE = "application/zip"
+EXECUTABLE_TYPES = {"application/x-msdownload", "application/x-executable", "application/x-mach-binary"}
+
+# extension -> content types it may actually contain
+EXTENSION_TYPES = {
+    ".pdf": {"application/pdf"},
+    ".png": {"image/png"},
+    ".jpg": {"image/jpeg"},
+    ".jpeg": {"image/jpeg"},
+    ".gif": {"image/gif"},
+    ".webp": {"image/webp"},
+    ".bmp": {"image/bmp"},
+    ".tif": {"image/tiff"},
+    ".tiff": {"image/tiff"},
+    ".txt": {"text/plain"},
+    ".csv": {"text/plain"},
+    ".md": {"text/plain"},
+    ".json": {"text/plain"},
+    ".doc": {OLE_TYPE},
+    ".xls": {OLE_TYPE},
+    ".ppt": {OLE_TYPE},
+    ".docx": {ZIP_TYPE},
+    ".xlsx": {ZIP_TYPE},
+    ".pptx": {ZIP_TYPE},
+    ".odt": {ZIP_TYPE},
+    ".ods": {ZIP_TYPE},
+}
+ALLOWED_TYPES = set().union(*EXTENSION_TYPES.values())
+
+_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+    (b"BM", "image/bmp"),
+    (b"PK\x03\x04", ZIP_TYPE),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", OLE_TYPE),
+    (b"MZ", "application/x-msdownload"),
+    (b"\x7fELF", "application/x-executable"),
+    (b"\xcf\xfa\xed\xfe", "application/x-mach-binary"),
+    (b"\xfe\xed\xfa\xcf", "application/x-mach-binary"),
+]
+
+
+class ScanError(Exception):
+    """The scanner could not give a verdict (unreachable, protocol error)."""
+
+
+@dataclass
+class Verdict:
+    status: str
+    mime_type: Optional[str]
+    detail: Optional[str] = None
+
+
+def sniff_mime(head: bytes) -> Optional[str]:
+    """Content type from the first bytes of a file, or None if unknown binary."""
+    # readers accept a PDF header anywhere in the first KB
+    if b"%PDF-" in head[:1024]:
+        return "application/pdf"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for magic, mime in _SIGNATURES:
+        if head.startswith(magic):
+            return mime
+    if b"\x00" not in head:
+        try:
+            # a multi-byte character may be cut off at the end of the sample
+            head.decode("utf-8")
+            return "text/plain"
+        except UnicodeDecodeError as e:
+            if e.start >= len(head) - 3:
+                return "text/plain"
+    return None
+
+
+def _scan_stub(path: str) -> Optional[str]:
+    tail = b""
+    with open(path, "rb") as f:
+        while chunk := f.read(SCAN_CHUNK):
+            if EICAR_MARKER in tail + chunk:
+                return "Eicar-Test-Signature"
+            tail = chunk[-len(EICAR_MARKER):]
+    return None
+
+
+def _clamd_connect(address: str) -> socket.socket:
+    url = urlparse(address)
+    if url.scheme == "unix":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        target = url.path
+    elif url.scheme == "tcp":
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        target = (url.hostname, url.port or 3310)
+    else:
+        raise ScanError(f"Unsupported clamd address '{address}'")
+    sock.settimeout(CLAMAV_TIMEOUT)
+    try:
+        sock.connect(target)
+    except OSError as e:
+        sock.close()
+        raise ScanError(f"clamd unreachable at {address}: {e}") from e
+    return sock
+
+
+def _scan_clamav(path: str, address: str) -> Optional[str]:
+    sock = _clamd_connect(address)
+    try:
+        sock.sendall(b"zINSTREAM\x00")
+        with open(path, "rb") as f:
+            while chunk := f.read(SCAN_CHUNK):
+                sock.sendall(struct.pack("!L", len(chunk)) + chunk)
+        sock.sendall(struct.pack("!L", 0))
+
+        reply = b""
+        while not reply.endswith(b"\x00"):
+            data = sock.recv(4096)
+            if not data:
+                break
+            reply += data
+    except OSError as e:
+        raise ScanError(f"clamd scan failed: {e}") from e
+    finally:
+        sock.close()
+
+    # "stream: OK" / "stream: <signature> FOUND" / "... ERROR"
+    answer = reply.rstrip(b"\x00").decode("utf-8", errors="replace").strip()
+    result = answer.partition(": ")[2] or answer
+    if result == "OK":
+        return None
+    if result.endswith(" FOUND"):
+        return result[: -len(" FOUND")]
+    raise ScanError(f"clamd: {answer or 'no reply'}")
+
+
+def scan_file(path: str, scanner: str, address: Optional[str] = None) -> Optional[str]:
+    """Signature name if ``path`` is infected, None if clean."""
+    if scanner == "none":
+        return None
+    if scanner == "stub":
+        return _scan_stub(path)
+    if scanner == "clamav":
+        return _scan_clamav(path, address or "tcp://127.0.0.1:3310")
+    raise ScanError(f"Unknown scanner '{scanner}'")
+
+
+def validate_file(path: str, ext: str, scanner: str, address: Optional[str] = None) -> Verdict:
+    """Scan and type-check one upload; ``ext`` is the extension it was stored with."""
+    with open(path, "rb") as f:
+        mime = sniff_mime(f.read(SNIFF_BYTES))
+
+    signature = scan_file(path, scanner, address)
+    if signature:
+        return Verdict(VERDICT_QUARANTINED, mime, f"Malware detected: {signature}")
+
+    if mime in EXECUTABLE_TYPES:
+        return Verdict(VERDICT_QUARANTINED, mime, "Executable files are not accepted")
+    expected = EXTENSION_TYPES.get(ext.lower())
+    if expected is None:
+        # .html, .svg, .js, ... would otherwise pass as text/plain
+        return Verdict(VERDICT_QUARANTINED, mime, f"Unsupported file extension '{ext.lower()}'")
+    if mime not in expected:
+        return Verdict(VERDICT_QUARANTINED, mime, f"Content does not match the {ext.lower()} extension")
+    if mime not in ALLOWED_TYPES:
+        return Verdict(VERDICT_QUARANTINED, mime, "Unsupported file type")
+    return Verdict(VERDICT_AVAILABLE, mime)
@@ -0,0 +1,78 @@
+"""Streaming writer shared by the upload endpoints.
+
+Uploads are copied to disk in fixed-size chunks while their size and
+SHA-256 are computed on the way through, so a large scanned PDF never has
+to sit in worker memory. The copy goes to a ``.part`` file that is renamed
+into place only once the whole upload has been accepted.
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from fastapi import HTTPException, UploadFile, status
+
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+
+
+def max_upload_bytes() -> int:
+    return int(os.getenv("MAX_UPLOAD_BYTES", str(DEFAULT_MAX_UPLOAD_BYTES)))
+
+
+@dataclass
+class StoredFile:
+    path: str
+    size_bytes: int
+    sha256: str
+
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds the upload limit of {limit} bytes",
+    )
+
+
+def stream_to_file(
+    source: BinaryIO,
+    dest: Path,
+    *,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> StoredFile:
+    """Copy ``source`` to ``dest`` chunk by chunk; 413 once ``max_bytes`` is passed."""
+    limit = max_upload_bytes() if max_bytes is None else max_bytes
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    partial = dest.with_name(dest.name + ".part")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(partial, "wb") as out:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > limit:
+                    raise _too_large(limit)
+                digest.update(chunk)
+                out.write(chunk)
+        os.replace(partial, dest)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+    return StoredFile(path=str(dest).replace("\\", "/"), size_bytes=size, sha256=digest.hexdigest())
+
+
+def save_upload_file(file: UploadFile, dest: Path, *, max_bytes: Optional[int] = None) -> StoredFile:
+    """Stream an ``UploadFile`` to ``dest``, rejecting oversize uploads up front when the size is known."""
+    limit = max_upload_bytes() if max_bytes is None else max_bytes
+    if file.size is not None and file.size > limit:
+        raise _too_large(limit)
+
+    return stream_to_file(file.file, dest, max_bytes=limit)
@@ -0,0 +1,108 @@
+"""Zip archives built while they are being sent.
+
+``zipfile`` writes to any file-like object; when that object cannot seek it
+falls back to data descriptors, so the archive can go straight out in
+chunks without a temp file or the whole zip in memory.
+"""
+
+import logging
+import os
+import zipfile
+from typing import Iterable, Iterator
+
+from app.modules.storage.backends import StorageBackend
+from app.modules.storage.writer import CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# listed at the end of the archive when some entries could not be read
+MISSING_MANIFEST = "MISSING_FILES.txt"
+
+
+class _ChunkSink:
+    """Write-only, non-seekable buffer that hands out what was written so far."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._offset = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # zipfile records offsets for the central directory
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+def _dedupe(name: str, taken: set[str]) -> str:
+    """``name``, or ``name (2)``, ``name (3)``... whichever is free; ``taken`` holds casefolded names."""
+    base, ext = os.path.splitext(name)
+    candidate, n = name, 1
+    while candidate.casefold() in taken:
+        n += 1
+        candidate = f"{base} ({n}){ext}"
+    taken.add(candidate.casefold())
+    return candidate
+
+
+def unique_arcnames(names: Iterable[str]) -> list[str]:
+    """``a.pdf, A.pdf, a (2).pdf`` -> ``a.pdf, A (2).pdf, a (2) (2).pdf``.
+
+    Names are compared casefolded so entries do not shadow each other when the
+    archive is extracted on a case-insensitive filesystem.
+    """
+    taken: set[str] = set()
+    return [_dedupe(os.path.basename(name.replace("\\", "/")) or "file", taken) for name in names]
+
+
+def stream_zip(storage: StorageBackend, entries: list[tuple[str, str]]) -> Iterator[bytes]:
+    """Yield a zip of ``(arcname, storage key)`` entries chunk by chunk.
+
+    Entries are stored, not deflated: scans and PDFs barely compress and
+    this keeps the CPU out of the download path. Entries that cannot be
+    opened are skipped and listed in a ``MISSING_FILES.txt`` entry at the end.
+    """
+    sink = _ChunkSink()
+    missing: list[str] = []
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for arcname, key in entries:
+            try:
+                src = storage.open(key)
+            except Exception:
+                # a missing file should not abort the rest of the bundle
+                logger.warning("Leaving %s out of the zip: cannot open %s", arcname, key, exc_info=True)
+                missing.append(arcname)
+                continue
+            try:
+                with zf.open(arcname, mode="w", force_zip64=True) as dest:
+                    while True:
+                        chunk = src.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        dest.write(chunk)
+                        data = sink.drain()
+                        if data:
+                            yield data
+            finally:
+                src.close()
+        if missing:
+            taken = {name.casefold() for name, _ in entries}
+            zf.writestr(
+                _dedupe(MISSING_MANIFEST, taken),
+                "These files could not be read from storage and are not in this archive:\n"
+                + "".join(f"{name}\n" for name in missing),
+            )
+    # the last data descriptor and the central directory
+    data = sink.drain()
+    if data:
+        yield data
@@ -0,0 +1,21 @@
+"""Opaque keyset cursors for lists ordered by (timestamp, id)."""
+
+import base64
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException
+
+
+def encode_cursor(moment: datetime, row_id: int) -> str:
+    raw = f"{moment.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        moment, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(moment), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -6,6 +7,7 @@ from app.models.booking import Booking
 from app.models.kyc_submission import KYCSubmission
 from app.models.user import User, UserRole
 from app.modules.lawyer_profiles.models import LawyerProfile
+from app.modules.metrics.service import get_totals
 from app.routers.auth import get_current_user
 from app.schemas.admin_overview import AdminOverviewResponse, LawyerOverview, RecentBooking
 
@@ -20,17 +22,15 @@ def _require_admin(current_user: User):
 
 @router.get("/overview", response_model=AdminOverviewResponse)
 def admin_overview(
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     _require_admin(current_user)
 
-    total_users = db.query(User).count()
-    total_lawyers = db.query(User).filter(User.role == UserRole.lawyer).count()
-    total_bookings = db.query(Booking).count()
-
-    pending_kyc = db.query(KYCSubmission).filter(KYCSubmission.status == "pending").count()
-    verified_lawyers = db.query(KYCSubmission).filter(KYCSubmission.status == "approved").count()
+    # Counters come from the trigger-maintained metric totals, not table scans.
+    totals = get_totals(db, ["users", "bookings", "kyc"])
 
     recent_booking_rows = (
         db.query(Booking, User)
@@ -51,42 +51,52 @@ def admin_overview(
         for booking, client in recent_booking_rows
     ]
 
-    # preload profiles
-    profiles = db.query(LawyerProfile).all()
-    profile_map = {p.user_id: p for p in profiles}
-
-    # latest kyc per lawyer (assumes lawyer_id aligns to user_id)
-    latest_kyc_map = {}
-    for sub in db.query(KYCSubmission).order_by(KYCSubmission.submitted_at.desc()).all():
-        if sub.lawyer_id not in latest_kyc_map:
-            latest_kyc_map[sub.lawyer_id] = sub
+    # One page of lawyers with their profile and latest KYC submission
+    # (DISTINCT ON over just that page; assumes lawyer_id aligns to user_id).
+    lawyer_page = (
+        select(User.id, User.full_name)
+        .where(User.role == UserRole.lawyer)
+        .order_by(User.id)
+        .limit(limit)
+        .offset((page - 1) * limit)
+        .cte("lawyer_page")
+    )
+    latest_kyc = (
+        select(KYCSubmission.lawyer_id, KYCSubmission.status)
+        .where(KYCSubmission.lawyer_id.in_(select(lawyer_page.c.id)))
+        .distinct(KYCSubmission.lawyer_id)
+        .order_by(KYCSubmission.lawyer_id, KYCSubmission.submitted_at.desc(), KYCSubmission.id.desc())
+        .subquery("latest_kyc")
+    )
+    lawyer_rows = db.execute(
+        select(lawyer_page.c.id, lawyer_page.c.full_name, LawyerProfile.specialization, latest_kyc.c.status)
+        .select_from(lawyer_page)
+        .outerjoin(LawyerProfile, LawyerProfile.user_id == lawyer_page.c.id)
+        .outerjoin(latest_kyc, latest_kyc.c.lawyer_id == lawyer_page.c.id)
+        .order_by(lawyer_page.c.id)
+    ).all()
 
     lawyers = []
-    lawyer_users = db.query(User).filter(User.role == UserRole.lawyer).all()
-    for user in lawyer_users:
-        profile = profile_map.get(user.id)
-        kyc = latest_kyc_map.get(user.id)
-
-        specialization = profile.specialization if profile and profile.specialization else "General"
-        kyc_status = kyc.status if kyc else "not_submitted"
-        is_verified = kyc_status == "approved"
-
+    for user_id, full_name, specialization, kyc_status in lawyer_rows:
+        kyc_status = kyc_status or "not_submitted"
         lawyers.append(
             LawyerOverview(
-                user_id=user.id,
-                full_name=user.full_name,
-                specialization=specialization,
+                user_id=user_id,
+                full_name=full_name,
+                specialization=specialization or "General",
                 kyc_status=kyc_status,
-                is_verified=is_verified,
+                is_verified=kyc_status == "approved",
             )
         )
 
     return AdminOverviewResponse(
-        total_users=total_users,
-        total_lawyers=total_lawyers,
-        total_bookings=total_bookings,
-        pending_kyc=pending_kyc,
-        verified_lawyers=verified_lawyers,
+        total_users=sum(totals["users"].values()),
+        total_lawyers=totals["users"].get(UserRole.lawyer.name, 0),
+        total_bookings=sum(totals["bookings"].values()),
+        pending_kyc=totals["kyc"].get("pending", 0),
+        verified_lawyers=totals["kyc"].get("approved", 0),
         recent_bookings=recent_bookings,
         lawyers=lawyers,
+        page=page,
+        limit=limit,
     )
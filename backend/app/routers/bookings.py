@@ -9,6 +9,7 @@ from app.schemas.booking import BookingCreate, BookingOut, BookingCancelOut, Boo
 from app.models.user import User
 from app.modules.audit_log.service import log_event
 from app.modules.blackouts.models import BlackoutDay
+from app.modules.notifications.service import notify
 from app.modules.lawyer_profiles.models import LawyerProfile
 from app.models.branch import Branch
 from app.models.service_package import ServicePackage
@@ -62,6 +63,15 @@ def create_booking(
         status="pending",
     )
     db.add(booking)
+    db.flush()
+    notify(
+        db,
+        user_ids=[booking.lawyer_id],
+        kind="booking.requested",
+        title="New booking request",
+        body=f"{current_user.full_name or 'A client'} requested booking #{booking.id}.",
+        data={"booking_id": booking.id, "case_id": booking.case_id},
+    )
     db.commit()
     db.refresh(booking)
     return BookingOut.model_validate(booking)
@@ -226,6 +236,14 @@ def cancel_booking(
         )
 
     booking.status = "cancelled"
+    notify(
+        db,
+        user_ids=[booking.lawyer_id],
+        kind="booking.cancelled",
+        title="Booking cancelled",
+        body=f"Booking #{booking.id} was cancelled by the client.",
+        data={"booking_id": booking.id},
+    )
     db.commit()
     db.refresh(booking)
     log_event(
@@ -304,6 +322,14 @@ def confirm_booking(
         )
 
     booking.status = "confirmed"
+    notify(
+        db,
+        user_ids=[booking.client_id],
+        kind="booking.confirmed",
+        title="Booking confirmed",
+        body=f"Your booking #{booking.id} was confirmed by the lawyer.",
+        data={"booking_id": booking.id},
+    )
     db.commit()
     db.refresh(booking)
     log_event(
@@ -355,6 +381,14 @@ def reject_booking(
         )
 
     booking.status = "rejected"
+    notify(
+        db,
+        user_ids=[booking.client_id],
+        kind="booking.rejected",
+        title="Booking rejected",
+        body=f"Your booking #{booking.id} was rejected by the lawyer.",
+        data={"booking_id": booking.id},
+    )
     db.commit()
     db.refresh(booking)
     log_event(
@@ -10,7 +10,7 @@ from app.database import get_db
 from app.models.user import User, UserRole
 from app.models.lawyer import Lawyer
 from app.models.service_package import ServicePackage
-from app.models.booking import Booking
+from app.models.booking import BUSY_BOOKING_STATUSES, Booking
 from app.modules.lawyer_profiles.models import LawyerProfile
 from app.routers.auth import get_current_user
 from app.modules.cases.models import Case
@@ -203,7 +203,7 @@ def search_lawyers(
                 Booking.lawyer_id.label("lawyer_user_id"),
                 func.count(Booking.id).label("cases_handled"),
             )
-            .filter(func.lower(Booking.status).in_(["confirmed", "completed"]))
+            .filter(Booking.status.in_(BUSY_BOOKING_STATUSES))
             .group_by(Booking.lawyer_id)
             .subquery()
         )
@@ -426,7 +426,7 @@ def get_lawyer_public_profile(lawyer_id: int, db: Session = Depends(get_db)):
         cases_handled = (
             db.query(func.count(Booking.id))
             .filter(Booking.lawyer_id == user.id)
-            .filter(func.lower(Booking.status).in_(["confirmed", "completed"]))
+            .filter(Booking.status.in_(BUSY_BOOKING_STATUSES))
             .scalar()
         )
     elif inspector.has_table("cases"):
@@ -1,16 +1,33 @@
+import asyncio
+import json
 import uuid
 from datetime import date, datetime, timezone
 import logging
 
 import sqlalchemy as sa
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
 from app.models.user import User
+from app.modules.queue.events import broker
 from app.modules.queue.models import QueueEntry, QueueEntryStatus
-from app.schemas.token_queue import TokenQueueCreate, TokenQueueOut, TokenQueueUpdate
+from app.modules.queue.service import (
+    allocate_queue_entry,
+    bump_token_counter,
+    list_today_queue,
+    publish_entry_event,
+)
+from app.modules.queue.wait_time import (
+    attach_wait_estimate,
+    attach_wait_estimates,
+    get_estimate,
+    record_service,
+)
+from app.schemas.token_queue import QueueServiceStatsOut, TokenQueueCreate, TokenQueueOut, TokenQueueUpdate
 
 router = APIRouter(prefix="/token-queue", tags=["Token Queue"])
 logger = logging.getLogger(__name__)
@@ -31,6 +48,9 @@ def create_token_queue_entry(payload: TokenQueueCreate, db: Session = Depends(ge
             detail=f"Client user not found (id={payload.client_id})",
         )
 
+    if payload.token_number is None:
+        return _create_with_allocated_token(payload, db)
+
     logger.info(
         "TokenQueue conflict check values date=%s lawyer_id=%s token_number=%s",
         payload.date,
@@ -65,6 +85,8 @@ def create_token_queue_entry(payload: TokenQueueCreate, db: Session = Depends(ge
 
     db.add(entry)
     try:
+        bump_token_counter(db, lawyer_id=payload.lawyer_id, day=payload.date, token_number=payload.token_number)
+        publish_entry_event(db, entry, "entry_created")
         db.commit()
     except IntegrityError as e:
         db.rollback()
@@ -123,6 +145,34 @@ def create_token_queue_entry(payload: TokenQueueCreate, db: Session = Depends(ge
     db.refresh(entry)
     return TokenQueueOut.model_validate(entry)
 
+
+def _create_with_allocated_token(payload: TokenQueueCreate, db: Session) -> TokenQueueOut:
+    """Walk-in path: the server picks the next gap-free token in one statement."""
+    try:
+        entry = allocate_queue_entry(
+            db,
+            lawyer_id=payload.lawyer_id,
+            client_id=payload.client_id,
+            day=payload.date,
+            entry_status=payload.status or QueueEntryStatus.waiting,
+        )
+        out = TokenQueueOut.model_validate(entry)
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        logger.exception(
+            "TokenQueue allocation failed date=%s lawyer_id=%s client_id=%s",
+            payload.date,
+            payload.lawyer_id,
+            payload.client_id,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error while allocating token number",
+        )
+    return out
+
+
 @router.get("", response_model=list[TokenQueueOut])
 def list_token_queue_entries(
     date: date | None = None,
@@ -143,10 +193,84 @@ def list_token_queue_entries(
 
     stmt = stmt.order_by(QueueEntry.date.desc(), QueueEntry.token_number.asc())
 
-    entries = list(db.execute(stmt).scalars().all())
+    entries = attach_wait_estimates(db, list(db.execute(stmt).scalars().all()))
     return [TokenQueueOut.model_validate(e) for e in entries]
 
 
+@router.get("/stats/{lawyer_id}", response_model=QueueServiceStatsOut)
+def get_queue_service_stats(lawyer_id: int, db: Session = Depends(get_db)):
+    estimate = get_estimate(db, lawyer_id)
+    return QueueServiceStatsOut(
+        lawyer_id=lawyer_id,
+        samples=estimate.samples,
+        mean_minutes=round(estimate.mean_seconds / 60, 1),
+        p50_minutes=round(estimate.p50_seconds / 60, 1),
+        p90_minutes=round(estimate.p90_seconds / 60, 1),
+    )
+
+
+KEEPALIVE_SECONDS = 15
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _waiting_snapshot(lawyer_id: int, day: date) -> list[dict]:
+    db = SessionLocal()
+    try:
+        entries = attach_wait_estimates(db, list_today_queue(db, lawyer_id=lawyer_id, today=day))
+        return [TokenQueueOut.model_validate(e).model_dump(mode="json") for e in entries]
+    finally:
+        db.close()
+
+
+@router.get("/stream")
+async def stream_token_queue(request: Request, lawyer_id: int, date: date):
+    """Server-Sent Events feed for one lawyer's queue on one day.
+
+    Sends a ``snapshot`` of waiting entries first, then ``entry_created`` /
+    ``entry_updated`` / ``entry_served`` events as they are committed, so
+    waiting-room screens no longer need to poll GET /token-queue.
+    """
+    # Subscribe before the snapshot so nothing committed in between is missed;
+    # the generator's finally only runs once streaming starts, so a failed
+    # snapshot has to drop the subscription itself.
+    queue = broker.subscribe(lawyer_id, date)
+    try:
+        snapshot = await run_in_threadpool(_waiting_snapshot, lawyer_id, date)
+    except BaseException:
+        broker.unsubscribe(lawyer_id, date, queue)
+        raise
+
+    async def event_source():
+        try:
+            yield _sse("snapshot", {"lawyer_id": lawyer_id, "date": date.isoformat(), "entries": snapshot})
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(message["type"], message)
+        finally:
+            broker.unsubscribe(lawyer_id, date, queue)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{id}", response_model=TokenQueueOut)
+def get_token_queue_entry(id: uuid.UUID, db: Session = Depends(get_db)):
+    entry = db.get(QueueEntry, id)
+    if entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Token queue entry not found")
+    return TokenQueueOut.model_validate(attach_wait_estimate(db, entry))
+
+
 @router.patch("/{id}", response_model=TokenQueueOut)
 def update_token_queue_entry(
     id: uuid.UUID,
@@ -166,6 +290,11 @@ def update_token_queue_entry(
         if previous_status != QueueEntryStatus.served and payload.status == QueueEntryStatus.served:
             entry.served_at = datetime.now(timezone.utc)
 
+    if previous_status != QueueEntryStatus.served and entry.status == QueueEntryStatus.served and entry.served_at:
+        record_service(db, lawyer_id=entry.lawyer_id, served_at=entry.served_at)
+
+    event_type = "entry_served" if entry.status == QueueEntryStatus.served else "entry_updated"
+    publish_entry_event(db, entry, event_type)
     db.commit()
     db.refresh(entry)
     return TokenQueueOut.model_validate(entry)
@@ -0,0 +1,118 @@
+# backend/app/scheduler.py
+
+"""Tiny in-process periodic job runner.
+
+Jobs are plain ``func(db: Session)`` callables registered with an interval.
+Every run gets its own session and its own thread, so a slow batch (upload
+scans, say) does not hold up the frequent jobs behind it; a job that is
+still running is not started again. A Postgres advisory lock keyed by the
+job name makes sure only one API worker runs a given job at a time.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+JobFunc = Callable[[Session], None]
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    interval_seconds: float
+    func: JobFunc
+    next_run: float = 0.0
+    running: Optional[threading.Thread] = None
+
+
+_jobs: dict[str, ScheduledJob] = {}
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def scheduler_enabled() -> bool:
+    return os.getenv("ENABLE_SCHEDULER", "true").lower() == "true"
+
+
+def register_job(name: str, interval_seconds: float, func: JobFunc, run_immediately: bool = True) -> None:
+    """Register (or replace) a periodic job."""
+    first_run = time.monotonic() if run_immediately else time.monotonic() + interval_seconds
+    _jobs[name] = ScheduledJob(name=name, interval_seconds=interval_seconds, func=func, next_run=first_run)
+
+
+def run_job(name: str) -> bool:
+    """Run one job now. Returns False if another worker holds its lock."""
+    job = _jobs.get(name)
+    if job is None:
+        raise KeyError(f"Unknown job: {name}")
+
+    # The advisory lock belongs to the connection, and a Session hands its
+    # pooled connection back on every commit. Pin one connection for the whole
+    # run so the unlock reaches the backend that took the lock.
+    with engine.connect() as conn:
+        locked = conn.execute(
+            text("SELECT pg_try_advisory_lock(hashtext(:name))"), {"name": f"job:{name}"}
+        ).scalar()
+        conn.commit()
+        if not locked:
+            return False
+        db = SessionLocal(bind=conn)
+        try:
+            job.func(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Scheduled job %s failed", name)
+        finally:
+            db.close()
+            conn.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": f"job:{name}"})
+            conn.commit()
+        return True
+
+
+def _run_logged(name: str) -> None:
+    try:
+        run_job(name)
+    except Exception:
+        logger.exception("Scheduled job %s could not start", name)
+
+
+def _loop(poll_seconds: float) -> None:
+    while not _stop.is_set():
+        now = time.monotonic()
+        for job in list(_jobs.values()):
+            if job.next_run > now or (job.running is not None and job.running.is_alive()):
+                continue
+            job.next_run = now + job.interval_seconds
+            job.running = threading.Thread(
+                target=_run_logged, args=(job.name,), name=f"lexiconnect-job-{job.name}", daemon=True
+            )
+            job.running.start()
+        _stop.wait(poll_seconds)
+
+
+def start_scheduler(poll_seconds: float = 5.0) -> None:
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_loop, args=(poll_seconds,), name="lexiconnect-scheduler", daemon=True)
+    _thread.start()
+
+
+def stop_scheduler() -> None:
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=10)
+    _thread = None
@@ -27,4 +27,7 @@ class AdminOverviewResponse(BaseModel):
     pending_kyc: int
     verified_lawyers: int
     recent_bookings: List[RecentBooking]
+    # one page of lawyers ordered by user id; total_lawyers is the full count
     lawyers: List[LawyerOverview]
+    page: int = 1
+    limit: int = 20
@@ -8,7 +8,8 @@ from app.modules.queue.models import QueueEntryStatus
 
 class TokenQueueCreate(BaseModel):
     date: date
-    token_number: int
+    # Omit to let the server allocate the next token for (lawyer, date).
+    token_number: int | None = None
     lawyer_id: int
     client_id: int
     status: QueueEntryStatus | None = None
@@ -27,5 +28,16 @@ class TokenQueueOut(BaseModel):
     client_id: int
     status: QueueEntryStatus
     served_at: datetime | None
+    # Only set for waiting entries; position 1 is next in line.
+    position: int | None = None
+    estimated_wait_minutes: float | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class QueueServiceStatsOut(BaseModel):
+    lawyer_id: int
+    samples: int
+    mean_minutes: float
+    p50_minutes: float
+    p90_minutes: float
@@ -0,0 +1,95 @@
+"""
+Benchmark the case-to-lawyer matching index on synthetic lawyers.
+
+Builds a LawyerIndex of --lawyers rows (default 50,000), applies a batch of
+incremental updates, then times top-K queries for random cases. No database
+is needed.
+
+Usage:
+    python scripts/bench_matching.py
+    python scripts/bench_matching.py --lawyers 100000 --queries 1000 --k 20
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date
+
+# Add backend directory to path for imports
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from app.modules.matching.engine import HORIZON_DAYS, LawyerFeatures, LawyerIndex, MatchQuery
+
+SPECIALIZATIONS = [f"area {i}" for i in range(40)]
+DISTRICTS = [f"district {i}" for i in range(25)]
+LANGUAGES = ["sinhala", "tamil", "english"]
+
+
+def synthetic_lawyer(rng: random.Random, lawyer_id: int) -> LawyerFeatures:
+    return LawyerFeatures(
+        lawyer_id=lawyer_id,
+        specializations=rng.sample(SPECIALIZATIONS, rng.randint(1, 3)),
+        district=rng.choice(DISTRICTS),
+        languages=rng.sample(LANGUAGES, rng.randint(1, 3)),
+        rating=round(rng.uniform(0, 5), 1),
+        price=None if rng.random() < 0.1 else float(rng.randrange(1000, 20000, 500)),
+        open_days=[d for d in range(HORIZON_DAYS) if rng.random() < 0.4],
+    )
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lawyers", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--updates", type=int, default=500, help="lawyers changed in the incremental batch")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    today = date.today()
+    lawyers = [synthetic_lawyer(rng, i) for i in range(1, args.lawyers + 1)]
+
+    index = LawyerIndex(today)
+    _, build_ms = timed(lambda: index.upsert(lawyers))
+
+    changed = [synthetic_lawyer(rng, rng.randint(1, args.lawyers)) for _ in range(args.updates)]
+    _, update_ms = timed(lambda: index.upsert(changed))
+
+    latencies = []
+    for _ in range(args.queries):
+        query = MatchQuery(
+            category=rng.choice(SPECIALIZATIONS),
+            district=rng.choice(DISTRICTS),
+            languages=rng.sample(LANGUAGES, rng.randint(0, 2)),
+            max_price=rng.choice([None, 5000.0, 10000.0]),
+        )
+        matches, ms = timed(lambda: index.top_k(query, args.k, today))
+        assert len(matches) <= args.k
+        latencies.append(ms)
+
+    latencies.sort()
+
+    def pct(p: int) -> float:
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+
+    print(f"lawyers:            {len(index):,}")
+    print(f"build:              {build_ms:8.1f} ms")
+    print(f"update {args.updates:>5} rows:  {update_ms:8.1f} ms")
+    print(
+        f"top-{args.k} query:       p50 {pct(50):.2f} ms  p95 {pct(95):.2f} ms  "
+        f"p99 {pct(99):.2f} ms  mean {statistics.mean(latencies):.2f} ms  ({args.queries} queries)"
+    )
+
+
+if __name__ == "__main__":
+    main()
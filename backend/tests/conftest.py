@@ -0,0 +1,36 @@
+"""Shared test helpers.
+
+Most tests that touch the database need a real PostgreSQL (DATABASE_URL)
+with migrations applied; ``requires_pg`` skips them cleanly elsewhere.
+"""
+
+from typing import Optional
+
+import pytest
+
+
+def requires_pg(table: Optional[str] = None, column: str = "1"):
+    """Module-scoped fixture that skips unless PostgreSQL with ``table`` is reachable.
+
+    Bind it as the module's ``pg_available``::
+
+        pg_available = requires_pg("disputes")
+
+    ``column`` also checks a column exists (e.g. a generated one added by a
+    later migration).
+    """
+
+    @pytest.fixture(scope="module")
+    def pg_available():
+        from sqlalchemy import text
+
+        from app.database import engine
+
+        probe = f"SELECT {column} FROM {table} LIMIT 1" if table else "SELECT 1"
+        try:
+            with engine.connect() as conn:
+                conn.execute(text(probe))
+        except Exception:
+            pytest.skip(f"PostgreSQL with {table} is not available" if table else "PostgreSQL is not available")
+
+    return pg_available
@@ -0,0 +1,62 @@
+"""Creating a month's partition moves that month's rows out of the default.
+
+Needs a real PostgreSQL (DATABASE_URL) with migrations applied. The month used
+is far in the future, so no real partition or row is touched.
+"""
+
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.main import app  # noqa: F401  (registers every mapper)
+from app.database import SessionLocal
+from app.modules.audit_log.models import AuditLog
+from app.modules.audit_log.partitions import DEFAULT_PARTITION, ensure_partition, list_partitions, partition_name
+from tests.conftest import requires_pg
+
+MONTH = date(2091, 3, 1)
+
+
+pg_available = requires_pg(DEFAULT_PARTITION)
+
+
+@pytest.fixture
+def stray_rows(pg_available):
+    """Two rows for MONTH (in the default partition) and one for the month after."""
+    db = SessionLocal()
+    action = f"test.partition.{uuid.uuid4().hex[:8]}"
+    db.add_all(
+        AuditLog(action=action, description="d", created_at=datetime(2091, month, day, tzinfo=timezone.utc))
+        for month, day in ((3, 1), (3, 31), (4, 1))
+    )
+    db.commit()
+    try:
+        yield db, action
+    finally:
+        db.rollback()
+        db.query(AuditLog).filter(AuditLog.action == action).delete(synchronize_session=False)
+        db.execute(text(f'DROP TABLE IF EXISTS "{partition_name(MONTH)}"'))
+        db.commit()
+        db.close()
+
+
+def _homes(db, action):
+    return db.execute(
+        text("SELECT tableoid::regclass::text, created_at FROM audit_logs WHERE action = :a ORDER BY created_at"),
+        {"a": action},
+    ).all()
+
+
+def test_rows_in_the_default_move_to_the_new_partition(stray_rows):
+    db, action = stray_rows
+    assert {table for table, _ in _homes(db, action)} == {DEFAULT_PARTITION}
+
+    assert ensure_partition(db, MONTH) is True
+    db.commit()
+
+    name = partition_name(MONTH)
+    assert [table for table, _ in _homes(db, action)] == [name, name, DEFAULT_PARTITION]
+    assert {name, DEFAULT_PARTITION} <= set(list_partitions(db))
+    assert ensure_partition(db, MONTH) is False
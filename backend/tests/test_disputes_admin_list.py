@@ -0,0 +1,151 @@
+"""Admin disputes: keyset paging, per-status counts and resolve notifications.
+
+Needs a real PostgreSQL (DATABASE_URL) with migrations applied. Every query is
+filtered on the fixture's client, so existing disputes do not matter.
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.database import SessionLocal
+from app.models.booking import Booking
+from app.models.user import User, UserRole
+from app.modules.audit_log.models import AuditLog
+from app.modules.disputes.models import Dispute
+from app.modules.disputes.service import list_disputes_for_admin
+from app.modules.notifications.models import NotificationOutbox
+from app.routers.auth import create_access_token
+from tests.conftest import requires_pg
+
+STATUSES = ["PENDING", "RESOLVED", "PENDING", "REJECTED", "PENDING"]
+
+
+pg_available = requires_pg("disputes")
+
+
+@pytest.fixture
+def disputes(pg_available):
+    """A client with one booking and five disputes (three pending), plus an admin."""
+    db = SessionLocal()
+    suffix = uuid.uuid4().hex[:8]
+    client = User(full_name="Dispute Client", email=f"dispute-client-{suffix}@test.local",
+                  hashed_password="x", role=UserRole.client)
+    lawyer = User(full_name="Dispute Lawyer", email=f"dispute-lawyer-{suffix}@test.local",
+                  hashed_password="x", role=UserRole.lawyer)
+    admin = User(full_name="Dispute Admin", email=f"dispute-admin-{suffix}@test.local",
+                 hashed_password="x", role=UserRole.admin)
+    db.add_all([client, lawyer, admin])
+    db.flush()
+    booking = Booking(client_id=client.id, lawyer_id=lawyer.id, status="confirmed")
+    db.add(booking)
+    db.flush()
+    rows = [
+        Dispute(booking_id=booking.id, client_id=client.id, title=f"Dispute {i}", description="d", status=status)
+        for i, status in enumerate(STATUSES)
+    ]
+    db.add_all(rows)
+    db.commit()
+    try:
+        yield db, client, admin, [d.id for d in rows]
+    finally:
+        db.rollback()
+        db.query(AuditLog).filter(AuditLog.user_id == admin.id).delete(synchronize_session=False)
+        db.query(NotificationOutbox).filter(NotificationOutbox.user_id == client.id).delete(synchronize_session=False)
+        db.query(Dispute).filter(Dispute.client_id == client.id).delete(synchronize_session=False)
+        db.query(Booking).filter(Booking.id == booking.id).delete(synchronize_session=False)
+        db.query(User).filter(User.id.in_([client.id, lawyer.id, admin.id])).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+def test_cursor_walks_every_page_newest_first(disputes):
+    db, client, _, ids = disputes
+    seen, cursor, pages = [], None, 0
+    while True:
+        rows, cursor, _ = list_disputes_for_admin(db, client_id=client.id, cursor=cursor, limit=2)
+        seen += [r.id for r in rows]
+        pages += 1
+        if cursor is None:
+            break
+        assert cursor == rows[-1].id
+
+    assert seen == sorted(ids, reverse=True)
+    assert pages == 3
+
+
+def test_last_full_page_has_no_cursor(disputes):
+    db, client, _, _ = disputes
+    rows, cursor, _ = list_disputes_for_admin(db, client_id=client.id, limit=len(STATUSES))
+    assert len(rows) == len(STATUSES)
+    assert cursor is None
+
+
+def test_counts_ignore_the_status_filter(disputes):
+    db, client, _, ids = disputes
+    rows, cursor, counts = list_disputes_for_admin(db, status="PENDING", client_id=client.id, limit=2)
+
+    assert counts == {"PENDING": 3, "RESOLVED": 1, "REJECTED": 1}
+    assert [r.status for r in rows] == ["PENDING", "PENDING"]
+    assert cursor is not None
+    rest, cursor, again = list_disputes_for_admin(db, status="PENDING", client_id=client.id, cursor=cursor, limit=2)
+    assert [r.id for r in rows + rest] == [i for i, s in sorted(zip(ids, STATUSES), reverse=True) if s == "PENDING"]
+    assert cursor is None
+    assert again == counts
+
+
+def test_rows_carry_client_booking_and_lawyer_columns(disputes):
+    db, client, _, _ = disputes
+    row = list_disputes_for_admin(db, client_id=client.id, limit=1)[0][0]
+    assert row.client_email == client.email
+    assert row.booking_status == "confirmed"
+    assert row.lawyer_name == "Dispute Lawyer"
+
+
+def test_endpoint_pages_and_counts(disputes):
+    _, client, admin, ids = disputes
+    http = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id)})}"}
+    params = {"client_id": client.id, "status": "pending", "limit": 2}
+
+    first = http.get("/api/admin/disputes", headers=headers, params=params)
+    assert first.status_code == 200
+    body = first.json()
+    assert body["counts"] == {"PENDING": 3, "RESOLVED": 1, "REJECTED": 1}
+    assert len(body["items"]) == 2
+
+    second = http.get("/api/admin/disputes", headers=headers, params={**params, "cursor": body["next_cursor"]}).json()
+    assert len(second["items"]) == 1
+    assert second["next_cursor"] is None
+
+    bad = http.get("/api/admin/disputes", headers=headers, params={"status": "open"})
+    assert bad.status_code == 400
+    forbidden = http.get("/api/admin/disputes", params=params,
+                         headers={"Authorization": f"Bearer {create_access_token({'sub': str(client.id)})}"})
+    assert forbidden.status_code == 403
+
+
+def test_resolve_notifies_only_on_a_real_change(disputes):
+    db, client, admin, ids = disputes
+    http = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id)})}"}
+    url = f"/api/admin/disputes/{ids[0]}/resolve"
+
+    def queued():
+        db.expire_all()
+        return [r.body for r in db.query(NotificationOutbox).filter(NotificationOutbox.user_id == client.id)
+                .order_by(NotificationOutbox.id)]
+
+    assert http.patch(url, headers=headers, json={"status": "PENDING"}).status_code == 200
+    assert queued() == []
+
+    assert http.patch(url, headers=headers, json={"status": "RESOLVED"}).status_code == 200
+    assert len(queued()) == 1
+
+    http.patch(url, headers=headers, json={"status": "RESOLVED", "admin_note": "Refunded"})
+    assert len(queued()) == 2 and "Refunded" in queued()[-1]
+    # same status and note again: nothing new for the client
+    http.patch(url, headers=headers, json={"status": "RESOLVED", "admin_note": "Refunded"})
+    assert len(queued()) == 2
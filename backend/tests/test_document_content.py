@@ -0,0 +1,110 @@
+"""Downloads go through the authorised content route; there is no public mount.
+
+Needs a real PostgreSQL (DATABASE_URL) with migrations applied and the local
+storage backend.
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.database import SessionLocal
+from app.models.user import User, UserRole
+from app.modules.documents.models import Document
+from app.modules.storage.backends import LocalStorage, get_storage
+from app.modules.storage.blobs import attach_file_urls
+from app.modules.storage.models import SCAN_PENDING, StorageBlob
+from app.routers.auth import create_access_token
+from tests.conftest import requires_pg
+
+
+pg_available = requires_pg("documents")
+
+
+@pytest.fixture(scope="module")
+def local_storage(pg_available):
+    if not isinstance(get_storage(), LocalStorage):
+        pytest.skip("needs the local storage backend")
+
+
+@pytest.fixture
+def stored(local_storage):
+    """A legacy document (no blob) owned by one client, a pending-scan one, and another client."""
+    db = SessionLocal()
+    storage = get_storage()
+    suffix = uuid.uuid4().hex[:10]
+    owner = User(full_name="Owner", email=f"content-owner-{suffix}@test.local", hashed_password="x",
+                 role=UserRole.client)
+    other = User(full_name="Other", email=f"content-other-{suffix}@test.local", hashed_password="x",
+                 role=UserRole.client)
+    db.add_all([owner, other])
+    db.flush()
+
+    key = f"uploads/test-{suffix}.txt"
+    path = storage.path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"<script>alert(1)</script>")
+    sha = uuid.uuid4().hex * 2
+    db.add(StorageBlob(sha256=sha, path=f"private/incoming/{sha}.pdf", size_bytes=1, ref_count=1,
+                       scan_status=SCAN_PENDING))
+    db.flush()
+    legacy = Document(uploaded_by_user_id=owner.id, title="note", original_filename="note.html", file_path=key)
+    pending = Document(uploaded_by_user_id=owner.id, title="scan", file_path=f"private/incoming/{sha}.pdf",
+                       blob_sha256=sha)
+    db.add_all([legacy, pending])
+    db.commit()
+    try:
+        yield db, owner, other, legacy, pending, key
+    finally:
+        db.rollback()
+        db.query(Document).filter(Document.uploaded_by_user_id == owner.id).delete(synchronize_session=False)
+        db.query(StorageBlob).filter(StorageBlob.sha256 == sha).delete(synchronize_session=False)
+        db.query(User).filter(User.id.in_([owner.id, other.id])).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+        path.unlink(missing_ok=True)
+
+
+def _auth(user):
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+
+def test_urls_point_at_the_authorised_route(stored):
+    db, _, _, legacy, pending, _ = stored
+    attach_file_urls(db, [legacy, pending], path_attr="file_path", filename_attr="original_filename",
+                     route="/api/documents")
+    assert legacy.download_url == f"/api/documents/{legacy.id}/content"
+    assert legacy.thumbnail_url is None
+    assert pending.download_url is None
+
+
+def test_owner_downloads_as_attachment_others_are_refused(stored):
+    _, owner, other, legacy, _, _ = stored
+    http = TestClient(app)
+    url = f"/api/documents/{legacy.id}/content"
+
+    response = http.get(url, headers=_auth(owner))
+    assert response.status_code == 200
+    assert response.content == b"<script>alert(1)</script>"
+    assert response.headers["content-disposition"].startswith("attachment")
+    assert response.headers["x-content-type-options"] == "nosniff"
+
+    cached = http.get(url, headers={**_auth(owner), "If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+    assert http.get(url, headers=_auth(other)).status_code == 403
+    assert http.get(url).status_code == 401
+
+
+def test_no_public_uploads_mount(stored):
+    _, _, _, _, _, key = stored
+    assert TestClient(app).get(f"/{key}").status_code == 404
+
+
+def test_unscanned_files_and_missing_renditions_are_not_served(stored):
+    _, owner, _, legacy, pending, _ = stored
+    http = TestClient(app)
+    assert http.get(f"/api/documents/{pending.id}/content", headers=_auth(owner)).status_code == 409
+    assert http.get(f"/api/documents/{legacy.id}/thumbnail", headers=_auth(owner)).status_code == 404
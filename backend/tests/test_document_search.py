@@ -0,0 +1,66 @@
+"""Document search hides files that have not cleared the upload scan.
+
+Needs a real PostgreSQL (DATABASE_URL) with migrations applied; matching runs
+on the generated ``search_tsv`` column.
+"""
+
+import uuid
+
+import pytest
+
+from app.main import app  # noqa: F401  (registers every mapper)
+from app.database import SessionLocal
+from app.models.user import User, UserRole
+from app.modules.documents.models import Document
+from app.modules.documents.service import search_documents
+from app.modules.storage.models import SCAN_AVAILABLE, SCAN_PENDING, SCAN_QUARANTINED, StorageBlob
+from tests.conftest import requires_pg
+
+
+pg_available = requires_pg("documents", column="search_tsv")
+
+
+@pytest.fixture
+def documents(pg_available):
+    """One document per scan status (plus a legacy one without a blob), all titled with ``word``."""
+    db = SessionLocal()
+    word = f"zq{uuid.uuid4().hex[:10]}"
+    owner = User(full_name="Search Owner", email=f"search-owner-{word}@test.local", hashed_password="x",
+                 role=UserRole.client)
+    admin = User(full_name="Search Admin", email=f"search-admin-{word}@test.local", hashed_password="x",
+                 role=UserRole.admin)
+    db.add_all([owner, admin])
+    db.flush()
+    shas, docs = [], {}
+    for scan_status in (SCAN_AVAILABLE, SCAN_PENDING, SCAN_QUARANTINED, None):
+        sha = None
+        if scan_status is not None:
+            sha = uuid.uuid4().hex * 2
+            shas.append(sha)
+            db.add(StorageBlob(sha256=sha, path=f"uploads/blobs/test/{sha}.pdf", size_bytes=1, ref_count=1,
+                               scan_status=scan_status))
+            db.flush()
+        doc = Document(uploaded_by_user_id=owner.id, uploaded_by_role="client", title=f"{word} {scan_status}",
+                       file_path=f"uploads/blobs/test/{sha}.pdf", blob_sha256=sha)
+        db.add(doc)
+        docs[scan_status] = doc
+    db.commit()
+    try:
+        yield db, word, owner, admin, {status: d.id for status, d in docs.items()}
+    finally:
+        db.rollback()
+        db.query(Document).filter(Document.uploaded_by_user_id == owner.id).delete(synchronize_session=False)
+        db.query(StorageBlob).filter(StorageBlob.sha256.in_(shas)).delete(synchronize_session=False)
+        db.query(User).filter(User.id.in_([owner.id, admin.id])).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+def test_uploader_finds_files_still_in_the_scan(documents):
+    db, word, owner, _, ids = documents
+    assert {d.id for d in search_documents(db, owner, word)} == set(ids.values())
+
+
+def test_others_only_find_cleared_and_legacy_files(documents):
+    db, word, _, admin, ids = documents
+    assert {d.id for d in search_documents(db, admin, word)} == {ids[SCAN_AVAILABLE], ids[None]}
@@ -0,0 +1,102 @@
+"""Bulk KYC decisions: status updates, the profile's verified flag and audit rows.
+
+Needs a real PostgreSQL (DATABASE_URL) with migrations applied; the decision
+runs UPDATE ... RETURNING over a FOR UPDATE subquery.
+"""
+
+import uuid
+
+import pytest
+
+from app.main import app  # noqa: F401  (registers every mapper)
+from app.database import SessionLocal
+from app.models.kyc_submission import KYCSubmission
+from app.models.lawyer import Lawyer
+from app.models.user import User, UserRole
+from app.modules.audit_log.models import AuditLog
+from app.modules.kyc.service import decide_submissions, review_queue
+from app.modules.lawyer_profiles.models import LawyerProfile
+from tests.conftest import requires_pg
+
+
+pg_available = requires_pg("kyc_submissions")
+
+
+@pytest.fixture
+def kyc(pg_available):
+    """A lawyer (user, lawyers row, profile) with two pending submissions, and an admin."""
+    db = SessionLocal()
+    suffix = uuid.uuid4().hex[:8]
+    email = f"kyc-lawyer-{suffix}@test.local"
+    user = User(full_name="KYC Lawyer", email=email, hashed_password="x", role=UserRole.lawyer)
+    admin = User(full_name="KYC Admin", email=f"kyc-admin-{suffix}@test.local", hashed_password="x",
+                 role=UserRole.admin)
+    lawyer = Lawyer(name="KYC Lawyer", email=email)
+    db.add_all([user, admin, lawyer])
+    db.flush()
+    db.add(LawyerProfile(user_id=user.id))
+    submissions = [
+        KYCSubmission(lawyer_id=lawyer.id, full_name="KYC Lawyer", nic_number=f"NIC{i}", bar_council_id="B",
+                      address="A", contact_number="0", status="pending")
+        for i in range(2)
+    ]
+    db.add_all(submissions)
+    db.commit()
+    try:
+        yield db, user, admin, [s.id for s in submissions]
+    finally:
+        db.rollback()
+        ids = [s.id for s in submissions]
+        db.query(AuditLog).filter(AuditLog.user_id == admin.id).delete(synchronize_session=False)
+        db.query(KYCSubmission).filter(KYCSubmission.id.in_(ids)).delete(synchronize_session=False)
+        db.query(LawyerProfile).filter(LawyerProfile.user_id == user.id).delete(synchronize_session=False)
+        db.query(Lawyer).filter(Lawyer.id == lawyer.id).delete(synchronize_session=False)
+        db.query(User).filter(User.id.in_([user.id, admin.id])).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+def _verified(db, user_id):
+    db.expire_all()
+    return db.query(LawyerProfile.is_verified).filter(LawyerProfile.user_id == user_id).scalar()
+
+
+def _statuses(db, ids):
+    db.expire_all()
+    return [db.get(KYCSubmission, i).status for i in ids]
+
+
+def test_bulk_approve_verifies_and_audits_only_changed_rows(kyc):
+    db, user, admin, ids = kyc
+
+    assert decide_submissions(db, submission_ids=ids + [0], decision="approve", admin=admin) == ids
+    assert _statuses(db, ids) == ["approved", "approved"]
+    assert _verified(db, user.id) is True
+    assert db.query(AuditLog).filter(AuditLog.user_id == admin.id, AuditLog.action == "KYC_APPROVED").count() == 2
+
+    # already approved: nothing changes, no new audit rows
+    assert decide_submissions(db, submission_ids=ids, decision="approve", admin=admin) == []
+    assert db.query(AuditLog).filter(AuditLog.user_id == admin.id).count() == 2
+
+
+def test_reject_keeps_lawyer_verified_while_another_submission_is_approved(kyc):
+    db, user, admin, (first, second) = kyc
+    decide_submissions(db, submission_ids=[first, second], decision="approve", admin=admin)
+
+    assert decide_submissions(db, submission_ids=[first], decision="reject", admin=admin) == [first]
+    assert _statuses(db, [first, second]) == ["rejected", "approved"]
+    assert _verified(db, user.id) is True
+
+    assert decide_submissions(db, submission_ids=[second], decision="reject", admin=admin) == [second]
+    assert _verified(db, user.id) is False
+
+
+def test_review_queue_pages_through_pending_submissions(kyc):
+    db, _, _, ids = kyc
+    seen, cursor = [], None
+    while True:
+        rows, cursor = review_queue(db, status="pending", limit=1, cursor=cursor)
+        seen += [r.id for r in rows]
+        if cursor is None:
+            break
+    assert [i for i in seen if i in ids] == ids
@@ -0,0 +1,183 @@
+"""Lawyer analytics facts: the fill job, live days, invalidation and the endpoint.
+
+Needs a real PostgreSQL (DATABASE_URL) with migrations applied; the facts are
+built by one set-based statement over bookings and service packages.
+"""
+
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect, text
+
+from app.main import app
+from app.database import SessionLocal, engine
+from app.models.booking import Booking
+from app.models.lawyer_availability import WeekDay, WeeklyAvailability
+from app.models.lawyer import Lawyer
+from app.models.service_package import ServicePackage
+from app.models.user import User, UserRole
+from app.modules.blackouts.models import BlackoutDay
+from app.modules.lawyer_dashboard.analytics import fill_daily_facts, get_lawyer_analytics
+from app.modules.lawyer_dashboard.models import LawyerDailyFact
+from app.routers.auth import create_access_token
+from tests.conftest import requires_pg
+
+TODAY = date.today()
+PAST = TODAY - timedelta(days=5)
+START = TODAY - timedelta(days=9)
+
+
+def _noon(day: date) -> datetime:
+    return datetime.combine(day, time(12), tzinfo=timezone.utc)
+
+
+pg_available = requires_pg("lawyer_daily_facts")
+
+
+def _package_owner_table() -> str:
+    """Older databases key service_packages.lawyer_id to users, newer ones to lawyers."""
+    for fk in inspect(engine).get_foreign_keys("service_packages"):
+        if fk["constrained_columns"] == ["lawyer_id"]:
+            return fk["referred_table"]
+    return "lawyers"
+
+
+@pytest.fixture
+def lawyer(pg_available, monkeypatch):
+    """A lawyer with a 1000 / 60 min package, two requests on PAST (one confirmed) and one confirmed today."""
+    monkeypatch.setenv("LAWYER_ANALYTICS_CACHE_SECONDS", "0")
+    db = SessionLocal()
+    suffix = uuid.uuid4().hex[:8]
+    email = f"analytics-lawyer-{suffix}@test.local"
+    user = User(full_name="Analytics Lawyer", email=email, hashed_password="x", role=UserRole.lawyer)
+    client = User(full_name="Analytics Client", email=f"analytics-client-{suffix}@test.local",
+                  hashed_password="x", role=UserRole.client)
+    lawyer_row = Lawyer(name="Analytics Lawyer", email=email)
+    db.add_all([user, client, lawyer_row])
+    db.flush()
+    owner_id = user.id if _package_owner_table() == "users" else lawyer_row.id
+    package = ServicePackage(lawyer_id=owner_id, name="Consult", description="", price=1000, duration=60)
+    db.add(package)
+    db.flush()
+    booking = dict(client_id=client.id, lawyer_id=user.id, service_package_id=package.id)
+    bookings = [
+        Booking(**booking, status="confirmed", scheduled_at=_noon(PAST), created_at=_noon(PAST)),
+        Booking(**booking, status="pending", created_at=_noon(PAST)),
+        Booking(**booking, status="confirmed", scheduled_at=_noon(TODAY), created_at=_noon(TODAY)),
+    ]
+    db.add_all(bookings)
+    db.commit()
+    try:
+        yield db, user, bookings
+    finally:
+        db.rollback()
+        db.query(LawyerDailyFact).filter(LawyerDailyFact.lawyer_id == user.id).delete(synchronize_session=False)
+        db.query(Booking).filter(Booking.lawyer_id == user.id).delete(synchronize_session=False)
+        db.query(ServicePackage).filter(ServicePackage.id == package.id).delete(synchronize_session=False)
+        db.query(Lawyer).filter(Lawyer.id == lawyer_row.id).delete(synchronize_session=False)
+        db.query(User).filter(User.id.in_([user.id, client.id])).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+def _stored(db, lawyer_id):
+    return {f.day: f for f in db.query(LawyerDailyFact).filter(LawyerDailyFact.lawyer_id == lawyer_id)}
+
+
+def _by_day(rows):
+    return {r.bucket: r for r in rows}
+
+
+def test_reads_compute_unstored_days_live_without_writing(lawyer):
+    db, user, _ = lawyer
+    rows = get_lawyer_analytics(db, user.id, START, TODAY)
+
+    assert _stored(db, user.id) == {}
+    assert len(rows) == (TODAY - START).days + 1
+    totals = rows[0]
+    assert (totals.total_requests, totals.total_confirmed) == (3, 2)
+    assert (totals.total_booked_minutes, totals.total_revenue) == (120, 2000)
+    past = _by_day(rows)[PAST]
+    assert (past.requests, past.confirmed, past.revenue) == (2, 1, 1000)
+    assert past.conversion == 0.5
+
+
+def test_fill_stores_finished_days_and_reads_agree(lawyer):
+    db, user, _ = lawyer
+    live = get_lawyer_analytics(db, user.id, START, TODAY)
+
+    fill_daily_facts(db, user.id, START, TODAY)
+    db.commit()
+
+    stored = _stored(db, user.id)
+    assert set(stored) == {START + timedelta(days=i) for i in range((TODAY - START).days)}
+    assert (stored[PAST].requests, stored[PAST].confirmed, stored[PAST].revenue) == (2, 1, 1000)
+    assert get_lawyer_analytics(db, user.id, START, TODAY) == live
+
+
+def test_booking_change_drops_the_stored_day(lawyer):
+    db, user, (_, pending, _) = lawyer
+    fill_daily_facts(db, user.id, START, TODAY)
+    db.commit()
+
+    pending.status = "confirmed"
+    db.commit()
+
+    assert PAST not in _stored(db, user.id)
+    assert _by_day(get_lawyer_analytics(db, user.id, START, TODAY))[PAST].confirmed == 2
+
+
+def test_endpoint_returns_totals_and_series(lawyer):
+    db, user, _ = lawyer
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    response = TestClient(app).get(
+        "/api/lawyer/analytics",
+        headers=headers,
+        params={"start": START.isoformat(), "end": TODAY.isoformat(), "granularity": "month"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["totals"]["requests"] == 3
+    assert body["totals"]["conversion"] == pytest.approx(2 / 3)
+    assert float(body["totals"]["revenue"]) == 2000
+    assert sum(float(b["revenue"]) for b in body["series"]) == 2000
+    assert _stored(db, user.id) == {}
+
+
+def test_availability_and_blackout_writes_drop_the_cached_analytics(lawyer, monkeypatch):
+    db, user, _ = lawyer
+    monkeypatch.setenv("LAWYER_ANALYTICS_CACHE_SECONDS", "300")
+    profile = db.query(Lawyer).filter(Lawyer.email == user.email).one()
+    # core columns only: older databases lack branches.is_active
+    branch_id = db.execute(
+        text(
+            "INSERT INTO branches (lawyer_id, name, district, city, address) "
+            "VALUES (:lawyer_id, 'Main', 'Colombo', 'Colombo', '1 Main St') RETURNING id"
+        ),
+        {"lawyer_id": profile.id},
+    ).scalar_one()
+    db.commit()
+
+    def available_today():
+        return get_lawyer_analytics(db, user.id, TODAY, TODAY)[0].available_minutes
+
+    try:
+        assert available_today() == 0
+        db.add(WeeklyAvailability(lawyer_id=profile.id, branch_id=branch_id,
+                                  day_of_week=WeekDay[TODAY.strftime("%A").upper()],
+                                  start_time=time(9), end_time=time(11)))
+        db.commit()
+        assert available_today() == 120
+
+        db.add(BlackoutDay(lawyer_id=user.id, date=TODAY))
+        db.commit()
+        assert available_today() == 0
+    finally:
+        db.rollback()
+        db.query(BlackoutDay).filter(BlackoutDay.lawyer_id == user.id).delete(synchronize_session=False)
+        db.query(WeeklyAvailability).filter(WeeklyAvailability.branch_id == branch_id).delete(synchronize_session=False)
+        db.execute(text("DELETE FROM branches WHERE id = :id"), {"id": branch_id})
+        db.commit()
@@ -0,0 +1,30 @@
+from datetime import date
+
+from app.modules.lawyer_dashboard.cache import LawyerCache
+from app.modules.lawyer_dashboard.summary import DashboardSummary
+
+SUMMARY = DashboardSummary(pending_requests=1, incoming_bookings=2, token_queue_today=3, kyc_status="approved")
+
+
+def test_cached_value_is_per_key_and_dropped_on_invalidate():
+    cache = LawyerCache()
+    key = ("summary", date(2026, 3, 4))
+    cache.put(7, key, SUMMARY, cache.generation(7), ttl=60)
+    cache.put(8, key, SUMMARY, cache.generation(8), ttl=60)
+
+    assert cache.get(7, key) == SUMMARY
+    assert cache.get(7, ("summary", date(2026, 3, 5))) is None
+
+    cache.invalidate([7])
+    assert cache.get(7, key) is None
+    assert cache.get(8, key) == SUMMARY
+
+
+def test_read_that_raced_an_invalidation_is_not_stored():
+    cache = LawyerCache()
+    key = ("summary", date(2026, 3, 4))
+    generation = cache.generation(7)
+    cache.invalidate([7])  # a write committed while the value was being read
+
+    cache.put(7, key, SUMMARY, generation, ttl=60)
+    assert cache.get(7, key) is None
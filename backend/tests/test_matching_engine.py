@@ -0,0 +1,84 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.modules.matching.engine import LawyerFeatures, LawyerIndex, MatchQuery, specialization_terms
+
+TODAY = date(2026, 3, 2)
+
+
+def _index(*features):
+    index = LawyerIndex(TODAY, capacity=2)
+    index.upsert(features)
+    return index
+
+
+def test_specialization_terms_split_and_drop_law_suffix():
+    assert specialization_terms("Family Law, Property & Land / Criminal law") == [
+        "family",
+        "property",
+        "land",
+        "criminal",
+    ]
+    assert specialization_terms(None) == []
+
+
+def test_top_k_prefers_specialization_then_district():
+    index = _index(
+        LawyerFeatures(1, ["criminal"], "Kandy", rating=5),
+        LawyerFeatures(2, ["family"], "Colombo"),
+        LawyerFeatures(3, ["family"], "Kandy"),
+    )
+
+    matches = index.top_k(MatchQuery(category="Family Law", district="kandy"), k=2, today=TODAY)
+
+    assert [m.lawyer_id for m in matches] == [3, 2]
+    assert matches[0].components["specialization"] == 1.0
+    assert matches[0].components["district"] == 1.0
+
+
+def test_languages_price_and_availability_components():
+    index = _index(
+        LawyerFeatures(1, ["family"], languages=["Sinhala", "English"], price=1000, open_days=[3]),
+        LawyerFeatures(2, ["family"], languages=["Tamil"], price=5000),
+    )
+
+    best = index.top_k(MatchQuery(category="family", languages=["english", "tamil"]), k=1, today=TODAY)[0]
+
+    assert best.lawyer_id == 1
+    assert best.components["languages"] == 0.5
+    assert best.available_in_days == 3
+    assert best.price == 1000
+
+
+def test_max_price_and_exclude_filter_lawyers():
+    index = _index(
+        LawyerFeatures(1, ["family"], price=9000),
+        LawyerFeatures(2, ["family"], price=1000),
+        LawyerFeatures(3, ["family"]),
+    )
+
+    matches = index.top_k(MatchQuery(category="family", max_price=5000, exclude=[3]), k=5, today=TODAY)
+
+    assert [m.lawyer_id for m in matches] == [2]
+
+
+def test_upsert_replaces_row_and_remove_recycles_it():
+    index = _index(LawyerFeatures(1, ["family"]), LawyerFeatures(2, ["criminal"]))
+
+    index.upsert([LawyerFeatures(1, ["tax"]), LawyerFeatures(3, ["tax"], "Galle")])
+    index.remove([2])
+    index.upsert([LawyerFeatures(4, ["tax"])])
+
+    assert len(index) == 3 and 2 not in index
+    assert [m.lawyer_id for m in index.top_k(MatchQuery(category="tax", district="Galle"), 3, TODAY)] == [3, 1, 4]
+    assert index.top_k(MatchQuery(category="family"), 3, TODAY)[0].components["specialization"] == 0.0
+
+
+def test_availability_counts_from_today_and_index_expires():
+    index = _index(LawyerFeatures(1, ["family"], open_days=[1, 5]))
+
+    assert index.top_k(MatchQuery(category="family"), 1, TODAY + timedelta(days=2))[0].available_in_days == 3
+    assert index.needs_rebuild(TODAY + timedelta(days=8))
+    with pytest.raises(ValueError):
+        index.top_k(MatchQuery(category="family"), 1, TODAY + timedelta(days=8))
@@ -0,0 +1,14 @@
+from datetime import datetime, timedelta, timezone
+
+from app.modules.metrics.service import bucket_start
+
+
+def test_bucket_start_floors_to_utc_hour_and_day():
+    moment = datetime(2026, 3, 4, 1, 45, 12, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+
+    assert bucket_start(moment, "hour") == datetime(2026, 3, 3, 20, 0, tzinfo=timezone.utc)
+    assert bucket_start(moment, "day") == datetime(2026, 3, 3, tzinfo=timezone.utc)
+
+
+def test_bucket_start_treats_naive_times_as_utc():
+    assert bucket_start(datetime(2026, 3, 4, 9, 30), "hour") == datetime(2026, 3, 4, 9, 0, tzinfo=timezone.utc)
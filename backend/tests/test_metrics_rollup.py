@@ -0,0 +1,113 @@
+"""Metric triggers, the rollup job and the reads built on them.
+
+Needs a real PostgreSQL (DATABASE_URL) with migrations applied; the counters
+are maintained by the ``metrics_track`` triggers and drained by
+``DELETE ... RETURNING``, so SQLite cannot stand in. Assertions compare
+before/after values, so existing rows in the database do not matter.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.database import SessionLocal
+from app.models.booking import Booking
+from app.models.user import User, UserRole
+from app.modules.metrics.models import MetricEvent, MetricRollupHourly
+from app.modules.metrics.service import bucket_start, get_series, get_totals, rollup_metrics
+from app.routers.auth import create_access_token
+from tests.conftest import requires_pg
+
+
+pg_available = requires_pg("metric_events")
+
+
+@pytest.fixture
+def db(pg_available):
+    session = SessionLocal()
+    created = []
+
+    def make_user(role: UserRole) -> User:
+        user = User(full_name="Metrics Test", email=f"metrics-{uuid.uuid4().hex[:10]}@test.local",
+                    hashed_password="x", role=role)
+        session.add(user)
+        session.commit()
+        created.append(user.id)
+        return user
+
+    session.make_user = make_user
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.query(Booking).filter(Booking.client_id.in_(created)).delete(synchronize_session=False)
+        session.query(User).filter(User.id.in_(created)).delete(synchronize_session=False)
+        session.commit()
+        session.close()
+
+
+def _value(totals, metric, dimension):
+    return totals[metric].get(dimension, 0)
+
+
+def test_triggers_track_inserts_transitions_and_deletes(db):
+    metrics = ["users", "signups", "bookings", "booking_transitions"]
+    before = get_totals(db, metrics)
+
+    client = db.make_user(UserRole.client)
+    lawyer = db.make_user(UserRole.lawyer)
+    booking = Booking(client_id=client.id, lawyer_id=lawyer.id, status="pending")
+    db.add(booking)
+    db.commit()
+    booking.status = "confirmed"
+    db.commit()
+
+    after = get_totals(db, metrics)
+    assert _value(after, "users", "lawyer") == _value(before, "users", "lawyer") + 1
+    assert _value(after, "users", "client") == _value(before, "users", "client") + 1
+    assert _value(after, "signups", "lawyer") == _value(before, "signups", "lawyer") + 1
+    assert _value(after, "bookings", "pending") == _value(before, "bookings", "pending")
+    assert _value(after, "bookings", "confirmed") == _value(before, "bookings", "confirmed") + 1
+    assert _value(after, "booking_transitions", "confirmed") == _value(before, "booking_transitions", "confirmed") + 1
+
+    db.delete(booking)
+    db.commit()
+    gone = get_totals(db, ["bookings"])
+    assert _value(gone, "bookings", "confirmed") == _value(before, "bookings", "confirmed")
+
+
+def test_rollup_drains_events_without_changing_reads(db):
+    db.make_user(UserRole.lawyer)
+    start = bucket_start(datetime.now(timezone.utc), "hour")
+    end = start + timedelta(hours=1)
+
+    totals = get_totals(db)
+    series = get_series(db, "signups", "hour", start, end, dimension="lawyer")
+    assert db.query(MetricEvent).count() > 0
+
+    assert rollup_metrics(db) > 0
+    assert db.query(MetricEvent).count() == 0
+    assert get_totals(db) == totals
+    assert get_series(db, "signups", "hour", start, end, dimension="lawyer") == series
+
+    rolled = db.get(MetricRollupHourly, ("signups", "lawyer", start))
+    assert rolled is not None and rolled.value == series[0].value
+
+
+def test_admin_overview_counts_come_from_the_totals(db):
+    admin = db.make_user(UserRole.admin)
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id)})}"}
+
+    first = client.get("/api/admin/overview", headers=headers, params={"limit": 1})
+    assert first.status_code == 200
+    db.make_user(UserRole.lawyer)
+    second = client.get("/api/admin/overview", headers=headers, params={"limit": 1}).json()
+
+    totals = get_totals(db, ["users"])
+    assert second["total_users"] == sum(totals["users"].values()) == first.json()["total_users"] + 1
+    assert second["total_lawyers"] == totals["users"]["lawyer"]
+    assert len(second["lawyers"]) == 1
@@ -0,0 +1,112 @@
+"""Outbox claiming and the dispatcher against a real PostgreSQL.
+
+Needs DATABASE_URL with migrations applied. Claims are narrowed to this
+test's users, so other due rows in the database are locked at most and
+never delivered or changed.
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.main import app  # noqa: F401  (registers every mapper)
+from app.database import SessionLocal
+from app.models.user import User, UserRole
+from app.modules.notifications import channels, service
+from app.modules.notifications.models import Notification, NotificationOutbox
+from app.modules.notifications.service import PENDING, claim_outbox, dispatch_notifications, notify
+from tests.conftest import requires_pg
+
+
+class FlakyChannel:
+    """Fails every delivery, so the dispatcher has to back off."""
+
+    def deliver(self, db, batch):
+        return {d.id: "flaky: unreachable" for d in batch}
+
+
+pg_available = requires_pg("notification_outbox")
+
+
+@pytest.fixture
+def outbox(pg_available, monkeypatch):
+    """Two users with one ``in_app`` and one ``flaky`` outbox row each."""
+    monkeypatch.setitem(channels.CHANNELS, "flaky", FlakyChannel())
+    monkeypatch.setenv("NOTIFICATION_CHANNELS", "in_app,flaky")
+    db = SessionLocal()
+    users = [
+        User(full_name="Outbox User", email=f"outbox-{uuid.uuid4().hex[:10]}@test.local",
+             hashed_password="x", role=UserRole.client)
+        for _ in range(2)
+    ]
+    db.add_all(users)
+    db.flush()
+    ids = [u.id for u in users]
+    notify(db, user_ids=ids + [None, ids[0]], kind="test.kind", title="Hello", body="World", data={"n": 1})
+    db.commit()
+
+    real_claim = service.claim_outbox
+    monkeypatch.setattr(
+        service, "claim_outbox", lambda session, limit: [r for r in real_claim(session, 1000) if r.user_id in ids]
+    )
+    try:
+        yield db, ids
+    finally:
+        db.rollback()
+        db.query(Notification).filter(Notification.user_id.in_(ids)).delete(synchronize_session=False)
+        db.query(NotificationOutbox).filter(NotificationOutbox.user_id.in_(ids)).delete(synchronize_session=False)
+        db.query(User).filter(User.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+def _rows(db, ids):
+    db.expire_all()
+    return db.query(NotificationOutbox).filter(NotificationOutbox.user_id.in_(ids)).all()
+
+
+def test_notify_adds_one_row_per_user_and_channel(outbox):
+    db, ids = outbox
+    rows = _rows(db, ids)
+    assert sorted((r.user_id, r.channel) for r in rows) == sorted(
+        (u, c) for u in ids for c in ("in_app", "flaky")
+    )
+    assert all(r.status == PENDING and r.attempts == 0 for r in rows)
+
+
+def test_claim_skips_rows_locked_by_another_worker(outbox):
+    _, ids = outbox
+    first, second = SessionLocal(), SessionLocal()
+    try:
+        claimed = [r for r in claim_outbox(first, 1000) if r.user_id in ids]
+        assert len(claimed) == 4
+        assert [r for r in claim_outbox(second, 1000) if r.user_id in ids] == []
+
+        first.rollback()
+        assert len([r for r in claim_outbox(second, 1000) if r.user_id in ids]) == 4
+    finally:
+        first.close()
+        second.close()
+
+
+def test_dispatch_delivers_deletes_and_backs_off(outbox):
+    db, ids = outbox
+    before = datetime.now(timezone.utc)
+
+    assert dispatch_notifications(db) == 4
+
+    rows = _rows(db, ids)
+    assert {r.channel for r in rows} == {"flaky"}
+    for row in rows:
+        assert row.status == PENDING
+        assert row.attempts == 1
+        assert row.last_error == "flaky: unreachable"
+        assert row.run_after >= before + service.retry_delay(1)
+
+    delivered = db.query(Notification).filter(Notification.user_id.in_(ids)).all()
+    assert sorted(n.user_id for n in delivered) == sorted(ids)
+    assert all((n.kind, n.title, n.body, n.data) == ("test.kind", "Hello", "World", {"n": 1}) for n in delivered)
+
+    # the failed rows are not due again until their backoff runs out
+    assert dispatch_notifications(db) == 0
@@ -0,0 +1,54 @@
+import hashlib
+import hmac
+from datetime import datetime, timezone
+
+from app.main import app  # noqa: F401  (registers every mapper)
+from app.modules.notifications import channels
+from app.modules.notifications.models import NotificationOutbox
+from app.modules.notifications.service import FAILED, MAX_ATTEMPTS, PENDING, fail_delivery, retry_delay
+
+
+def test_fail_delivery_backs_off_exponentially_then_gives_up():
+    row = NotificationOutbox(status=PENDING, attempts=0)
+    before = datetime.now(timezone.utc)
+
+    fail_delivery(row, "timeout")
+    assert row.status == PENDING and row.attempts == 1
+    assert row.run_after >= before + retry_delay(1)
+    assert retry_delay(2) == 2 * retry_delay(1)
+    assert retry_delay(3) == 4 * retry_delay(1)
+
+    for _ in range(MAX_ATTEMPTS - 1):
+        fail_delivery(row, "x" * 5000)
+    assert row.status == FAILED
+    assert len(row.last_error) == 2000
+
+
+def test_enabled_channels_ignores_unknown_and_duplicates(monkeypatch):
+    monkeypatch.setenv("NOTIFICATION_CHANNELS", "email, in_app,sms,email")
+    assert channels.enabled_channels() == ["email", "in_app"]
+
+    monkeypatch.delenv("NOTIFICATION_CHANNELS")
+    assert channels.enabled_channels() == ["in_app"]
+
+
+def test_registered_channel_can_be_enabled(monkeypatch):
+    class SmsChannel:
+        def deliver(self, db, batch):
+            return {}
+
+    monkeypatch.setitem(channels.CHANNELS, "sms", SmsChannel())
+    monkeypatch.setenv("NOTIFICATION_CHANNELS", "sms")
+    assert channels.enabled_channels() == ["sms"]
+
+
+def test_webhook_signature_is_hmac_sha256_of_body():
+    body = b'{"notifications": []}'
+    expected = hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+    assert channels.sign_payload("secret", body) == f"sha256={expected}"
+
+
+def test_email_channel_skips_users_without_address():
+    delivery = channels.Delivery(id=1, user_id=1, email=None, full_name=None, kind="k", title="t", body="b")
+    # nothing to send, so no SMTP connection is opened
+    assert channels.EmailChannel().deliver(None, [delivery]) == {}
@@ -0,0 +1,19 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_sort_key():
+    submitted_at = datetime(2026, 3, 4, 9, 30, 15, 123456, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+
+    assert decode_cursor(encode_cursor(submitted_at, 42)) == (submitted_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["zzz", "bm90LWEtY3Vyc29y", ""])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
@@ -0,0 +1,60 @@
+import pytest
+
+from app.modules.queue.models import QueueServiceStats
+from app.modules.queue.wait_time import (
+    BUCKETS,
+    DEFAULT_ESTIMATE,
+    EWMA_ALPHA,
+    HISTOGRAM_DECAY,
+    ServiceEstimate,
+    _to_estimate,
+    fold_gap,
+    wait_minutes,
+)
+
+
+def _stats() -> QueueServiceStats:
+    return QueueServiceStats(lawyer_id=1, samples=0)
+
+
+def test_fold_gap_seeds_then_smooths_the_ewma():
+    stats = _stats()
+    fold_gap(stats, 600)
+    assert stats.ewma_seconds == 600
+    fold_gap(stats, 1200)
+    assert stats.ewma_seconds == pytest.approx(EWMA_ALPHA * 1200 + (1 - EWMA_ALPHA) * 600)
+    assert stats.samples == 2
+
+
+def test_fold_gap_decays_old_buckets_and_clamps_long_gaps():
+    stats = _stats()
+    fold_gap(stats, 10 * 60 + 30)  # bucket 10
+    fold_gap(stats, 10 * 60 * 60)  # beyond the last bucket
+
+    assert len(stats.histogram) == BUCKETS
+    assert stats.histogram[10] == pytest.approx(HISTOGRAM_DECAY)
+    assert stats.histogram[-1] == 1.0
+    assert sum(stats.histogram) == pytest.approx(1 + HISTOGRAM_DECAY)
+
+
+def test_estimate_percentiles_come_from_the_histogram():
+    stats = _stats()
+    for minutes in [5] * 8 + [30] * 2:
+        fold_gap(stats, minutes * 60)
+    estimate = _to_estimate(stats)
+
+    assert estimate.samples == 10
+    assert estimate.p50_seconds == 5.5 * 60
+    assert estimate.p90_seconds == 30.5 * 60
+
+
+def test_no_samples_falls_back_to_the_default():
+    assert _to_estimate(None) == DEFAULT_ESTIMATE
+    assert _to_estimate(_stats()) == DEFAULT_ESTIMATE
+
+
+def test_wait_counts_only_the_entries_ahead():
+    estimate = ServiceEstimate(mean_seconds=12 * 60, p50_seconds=0, p90_seconds=0, samples=3)
+    assert wait_minutes(1, estimate) == 0
+    assert wait_minutes(2, estimate) == 12
+    assert wait_minutes(4, estimate) == 36
@@ -0,0 +1,44 @@
+"""The per-job advisory lock is held for the whole run and released after it.
+
+Needs a real PostgreSQL (DATABASE_URL).
+"""
+
+import uuid
+
+from sqlalchemy import text
+
+from app import scheduler
+from app.database import engine
+from tests.conftest import requires_pg
+
+
+pg_available = requires_pg()
+
+
+def _try_lock(name):
+    """Whether another connection could take the job's lock right now (released again at once)."""
+    with engine.connect() as conn:
+        key = {"name": f"job:{name}"}
+        got = conn.execute(text("SELECT pg_try_advisory_lock(hashtext(:name))"), key).scalar()
+        if got:
+            conn.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), key)
+        conn.commit()
+        return got
+
+
+def test_lock_survives_commits_inside_the_job_and_is_released(pg_available, monkeypatch):
+    name = f"test-{uuid.uuid4().hex[:8]}"
+    seen = []
+
+    def job(db):
+        for _ in range(3):
+            db.execute(text("SELECT 1"))
+            db.commit()
+            seen.append(_try_lock(name))
+
+    monkeypatch.setattr(scheduler, "_jobs", {})
+    scheduler.register_job(name, 60, job)
+
+    assert scheduler.run_job(name) is True
+    assert seen == [False, False, False]
+    assert _try_lock(name) is True
@@ -0,0 +1,203 @@
+"""Leased storage jobs: claim commits up front, results land in a second transaction.
+
+The scan and text-index tests use the local storage backend.
+
+Needs a real PostgreSQL (DATABASE_URL) with migrations applied.
+"""
+
+import uuid
+from concurrent.futures import Future
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.main import app  # noqa: F401  (registers every mapper)
+from app.database import SessionLocal
+from app.modules.storage import scan, text_index
+from app.modules.storage.backends import get_storage
+from app.modules.storage.jobs import (
+    EXTRACT_TEXT_JOB,
+    JOB_DONE,
+    JOB_PENDING,
+    PREVIEW_JOB,
+    SCAN_JOB,
+    enqueue_job,
+    finish_jobs,
+    lease_jobs,
+)
+from app.modules.storage.models import SCAN_AVAILABLE, SCAN_PENDING, SEARCH_CONFIG, StorageBlob, StorageJob
+from tests.conftest import requires_pg
+
+
+pg_available = requires_pg("storage_jobs")
+
+
+@pytest.fixture
+def blobs(pg_available):
+    db = SessionLocal()
+    shas = [uuid.uuid4().hex * 2 for _ in range(2)]
+    for sha in shas:
+        db.add(StorageBlob(sha256=sha, path=f"uploads/blobs/test/{sha}.png", size_bytes=1, ref_count=1))
+    db.flush()
+    for sha in shas:
+        enqueue_job(db, kind=PREVIEW_JOB, blob_sha256=sha)
+    db.commit()
+    try:
+        yield shas
+    finally:
+        db.query(StorageJob).filter(StorageJob.blob_sha256.in_(shas)).delete(synchronize_session=False)
+        db.query(StorageBlob).filter(StorageBlob.sha256.in_(shas)).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+def _ours(jobs, shas):
+    return [j for j in jobs if j.blob_sha256 in shas]
+
+
+def test_lease_commits_and_hides_jobs_until_it_expires(blobs):
+    db = SessionLocal()
+    try:
+        leased = _ours(lease_jobs(db, kind=PREVIEW_JOB, limit=1000), blobs)
+        assert {j.blob_sha256 for j in leased} == set(blobs)
+        assert all(j.blob_path.endswith(".png") for j in leased)
+        # the claim is committed: no transaction is left open for the slow part
+        assert not db.in_transaction()
+
+        other = SessionLocal()
+        try:
+            assert _ours(lease_jobs(other, kind=PREVIEW_JOB, limit=1000), blobs) == []
+        finally:
+            other.close()
+
+        ok, broken = leased
+        finish_jobs(db, {ok.id: None, broken.id: "render failed"})
+        db.commit()
+
+        done = db.get(StorageJob, ok.id)
+        retry = db.get(StorageJob, broken.id)
+        assert done.status == JOB_DONE
+        assert retry.status == JOB_PENDING
+        assert retry.attempts == 1
+        assert retry.last_error == "render failed"
+        assert retry.run_after > datetime.now(timezone.utc)
+    finally:
+        db.close()
+
+
+class _InlinePool:
+    """Runs the work in-process and records whether the blob and its jobs were locked meanwhile."""
+
+    def __init__(self, sha256):
+        self.sha256 = sha256
+        self.rows_were_locked = None
+
+    def submit(self, fn, *args):
+        probe = SessionLocal()
+        try:
+            for table, column in (("storage_blobs", "sha256"), ("storage_jobs", "blob_sha256")):
+                probe.execute(
+                    text(f"SELECT 1 FROM {table} WHERE {column} = :s FOR UPDATE NOWAIT"), {"s": self.sha256}
+                )
+            self.rows_were_locked = False
+        except OperationalError:
+            self.rows_were_locked = True
+        finally:
+            probe.rollback()
+            probe.close()
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def _stored_blob(key, scan_status, job_kind):
+    """A .txt blob stored under ``key`` with one queued job; yields (sha, key) and cleans up."""
+    db = SessionLocal()
+    storage = get_storage()
+    sha = uuid.uuid4().hex * 2
+    key = key.format(sha=sha)
+    path = storage.path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"plain text evidence")
+    db.add(StorageBlob(sha256=sha, path=key, size_bytes=19, ref_count=1, scan_status=scan_status))
+    db.flush()
+    enqueue_job(db, kind=job_kind, blob_sha256=sha)
+    db.commit()
+    try:
+        yield sha, key
+    finally:
+        db.rollback()
+        blob = db.get(StorageBlob, sha)
+        keys = {key, blob.path if blob else key}
+        db.query(StorageJob).filter(StorageJob.blob_sha256 == sha).delete(synchronize_session=False)
+        db.query(StorageBlob).filter(StorageBlob.sha256 == sha).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+        for k in keys:
+            storage.path(k).unlink(missing_ok=True)
+
+
+@pytest.fixture
+def incoming(pg_available):
+    """A pending blob whose file sits under private/incoming/, queued for its scan."""
+    yield from _stored_blob("private/incoming/test/{sha}.txt", SCAN_PENDING, SCAN_JOB)
+
+
+@pytest.fixture
+def published(pg_available):
+    """A blob that passed the scan, queued for text extraction."""
+    yield from _stored_blob("uploads/blobs/test/{sha}.txt", SCAN_AVAILABLE, EXTRACT_TEXT_JOB)
+
+
+def _run_only(module, sha, monkeypatch):
+    """Point ``module``'s worker pool at an _InlinePool and narrow its leases to ``sha``."""
+    pool = _InlinePool(sha)
+    real_lease = module.lease_jobs
+    monkeypatch.setattr(module, "get_worker_pool", lambda: pool)
+    monkeypatch.setattr(
+        module, "lease_jobs", lambda db, **kw: [j for j in real_lease(db, **{**kw, "limit": 1000}) if j.blob_sha256 == sha]
+    )
+    return pool
+
+
+def test_scan_runs_without_locking_the_blob_then_publishes_it(incoming, monkeypatch):
+    sha, key = incoming
+    pool = _run_only(scan, sha, monkeypatch)
+
+    db = SessionLocal()
+    try:
+        assert scan.process_scan_jobs(db) == 1
+        assert pool.rows_were_locked is False
+
+        db.expire_all()
+        blob = db.get(StorageBlob, sha)
+        assert blob.scan_status == SCAN_AVAILABLE
+        assert blob.path.startswith("uploads/blobs/") and blob.path.endswith(".txt")
+        assert get_storage().exists(blob.path)
+        assert not get_storage().exists(key)  # removed once the move committed
+        jobs = {j.kind: j.status for j in db.query(StorageJob).filter(StorageJob.blob_sha256 == sha)}
+        assert jobs == {SCAN_JOB: JOB_DONE, PREVIEW_JOB: JOB_PENDING, EXTRACT_TEXT_JOB: JOB_PENDING}
+    finally:
+        db.close()
+
+
+def test_text_is_extracted_without_locks_then_stored(published, monkeypatch):
+    sha, _ = published
+    pool = _run_only(text_index, sha, monkeypatch)
+
+    db = SessionLocal()
+    try:
+        assert text_index.process_text_jobs(db) == 1
+        assert pool.rows_were_locked is False
+
+        matched = db.execute(
+            text("SELECT content_tsv @@ plainto_tsquery(:config, 'evidence') FROM storage_blobs WHERE sha256 = :s"),
+            {"config": SEARCH_CONFIG, "s": sha},
+        ).scalar()
+        assert matched is True
+        job = db.query(StorageJob).filter(StorageJob.blob_sha256 == sha).one()
+        assert job.status == JOB_DONE
+    finally:
+        db.close()
@@ -0,0 +1,196 @@
+"""Server-side token allocation: concurrent walk-ins and bulk queue generation.
+
+Needs a real PostgreSQL (DATABASE_URL) with migrations applied; the counter
+upsert relies on row locks and ON CONFLICT, so SQLite cannot stand in.
+"""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.main import app  # noqa: F401  (registers every mapper)
+from app.database import SessionLocal
+from app.models.booking import Booking
+from app.models.user import User, UserRole
+from app.modules.queue import service
+from app.modules.queue.models import QueueEntry, QueueTokenCounter
+from app.modules.queue.service import allocate_queue_entry, generate_queues, pregenerate_next_day_queues
+from tests.conftest import requires_pg
+
+WALK_INS = 60
+WORKERS = 16
+# far enough out that no real bookings share the day
+BOOKED_DAY = date(2091, 5, 7)
+
+
+pg_available = requires_pg("token_queue_counters")
+
+
+@pytest.fixture
+def queue_users(pg_available):
+    db = SessionLocal()
+    suffix = uuid.uuid4().hex[:8]
+    lawyer = User(full_name="Stress Lawyer", email=f"stress-lawyer-{suffix}@test.local",
+                  hashed_password="x", role=UserRole.lawyer)
+    client = User(full_name="Stress Client", email=f"stress-client-{suffix}@test.local",
+                  hashed_password="x", role=UserRole.client)
+    db.add_all([lawyer, client])
+    db.commit()
+    ids = (lawyer.id, client.id)
+    try:
+        yield ids
+    finally:
+        db.query(QueueEntry).filter(QueueEntry.lawyer_id == ids[0]).delete()
+        db.query(QueueTokenCounter).filter(QueueTokenCounter.lawyer_id == ids[0]).delete()
+        db.query(User).filter(User.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+def _walk_in(lawyer_id: int, client_id: int, day: date) -> int:
+    db = SessionLocal()
+    try:
+        for _ in range(5):
+            try:
+                entry = allocate_queue_entry(db, lawyer_id=lawyer_id, client_id=client_id, day=day)
+                token = entry.token_number
+                db.commit()
+                return token
+            except OperationalError:
+                # deadlock/serialization hiccups are retried; the token is returned on rollback
+                db.rollback()
+        raise RuntimeError("allocation kept failing")
+    finally:
+        db.close()
+
+
+def test_concurrent_walk_ins_get_gap_free_tokens(queue_users):
+    lawyer_id, client_id = queue_users
+    day = date.today()
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        tokens = list(pool.map(lambda _: _walk_in(lawyer_id, client_id, day), range(WALK_INS)))
+
+    assert sorted(tokens) == list(range(1, WALK_INS + 1))
+
+    db = SessionLocal()
+    try:
+        counter = db.get(QueueTokenCounter, (lawyer_id, day))
+        assert counter.last_token == WALK_INS
+    finally:
+        db.close()
+
+
+def test_rolled_back_allocation_leaves_no_gap(queue_users):
+    lawyer_id, client_id = queue_users
+    day = date(2030, 1, 2)
+
+    db = SessionLocal()
+    try:
+        allocate_queue_entry(db, lawyer_id=lawyer_id, client_id=client_id, day=day)
+        db.rollback()
+    finally:
+        db.close()
+
+    assert _walk_in(lawyer_id, client_id, day) == 1
+
+
+def _at(hour: int) -> datetime:
+    return datetime.combine(BOOKED_DAY, time(hour), tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def booked_day(pg_available):
+    """Two lawyers with bookings on BOOKED_DAY; lawyer B already has client 3 queued as a walk-in.
+
+    Lawyer A: client 2 at 09:00 (and again at 11:00), client 1 at 10:00,
+    client 3 cancelled. Lawyer B: client 1 at 09:00, client 3 at 10:00.
+    """
+    db = SessionLocal()
+    suffix = uuid.uuid4().hex[:8]
+    users = [
+        User(full_name=name, email=f"gen-{name.lower().replace(' ', '-')}-{suffix}@test.local",
+             hashed_password="x", role=role)
+        for name, role in (("Lawyer A", UserRole.lawyer), ("Lawyer B", UserRole.lawyer),
+                           ("Client 1", UserRole.client), ("Client 2", UserRole.client),
+                           ("Client 3", UserRole.client))
+    ]
+    db.add_all(users)
+    db.flush()
+    a, b, c1, c2, c3 = (u.id for u in users)
+    db.add_all([
+        Booking(lawyer_id=a, client_id=c2, scheduled_at=_at(9), status="confirmed"),
+        Booking(lawyer_id=a, client_id=c2, scheduled_at=_at(11), status="pending"),
+        Booking(lawyer_id=a, client_id=c1, scheduled_at=_at(10), status="confirmed"),
+        Booking(lawyer_id=a, client_id=c3, scheduled_at=_at(8), status="cancelled"),
+        Booking(lawyer_id=b, client_id=c1, scheduled_at=_at(9), status="confirmed"),
+        Booking(lawyer_id=b, client_id=c3, scheduled_at=_at(10), status="confirmed"),
+    ])
+    allocate_queue_entry(db, lawyer_id=b, client_id=c3, day=BOOKED_DAY)
+    db.commit()
+    ids = [u.id for u in users]
+    try:
+        yield db, (a, b, c1, c2, c3)
+    finally:
+        db.rollback()
+        db.query(QueueEntry).filter(QueueEntry.lawyer_id.in_([a, b])).delete(synchronize_session=False)
+        db.query(QueueTokenCounter).filter(QueueTokenCounter.lawyer_id.in_([a, b])).delete(synchronize_session=False)
+        db.query(Booking).filter(Booking.lawyer_id.in_([a, b])).delete(synchronize_session=False)
+        db.query(User).filter(User.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+def _queues(db, lawyers):
+    db.expire_all()
+    entries = (
+        db.query(QueueEntry)
+        .filter(QueueEntry.date == BOOKED_DAY, QueueEntry.lawyer_id.in_(lawyers))
+        .order_by(QueueEntry.lawyer_id, QueueEntry.token_number)
+    )
+    counters = {
+        lawyer_id: db.get(QueueTokenCounter, (lawyer_id, BOOKED_DAY)).last_token for lawyer_id in lawyers
+    }
+    return [(e.lawyer_id, e.token_number, e.client_id) for e in entries], counters
+
+
+def test_pregeneration_numbers_each_lawyer_contiguously_once(booked_day, monkeypatch):
+    db, (a, b, c1, c2, c3) = booked_day
+
+    class _DayBefore(date):
+        @classmethod
+        def today(cls):
+            return BOOKED_DAY - timedelta(days=1)
+
+    monkeypatch.setattr(service, "date", _DayBefore)
+    pregenerate_next_day_queues(db)
+    db.commit()
+
+    entries, counters = _queues(db, [a, b])
+    # earliest booking first; B's walk-in keeps token 1 and is not queued twice
+    assert entries == [(a, 1, c2), (a, 2, c1), (b, 1, c3), (b, 2, c1)]
+    assert counters == {a: 2, b: 2}
+
+    assert generate_queues(db, day=BOOKED_DAY) == []
+    assert generate_queues(db, day=BOOKED_DAY, lawyer_id=a) == []
+    db.commit()
+    assert _queues(db, [a, b]) == (entries, counters)
+
+
+def test_later_bookings_continue_the_numbering(booked_day):
+    db, (a, b, c1, c2, c3) = booked_day
+    generate_queues(db, day=BOOKED_DAY, lawyer_id=a)
+    db.commit()
+
+    db.add(Booking(lawyer_id=a, client_id=c3, scheduled_at=_at(7), status="confirmed"))
+    db.commit()
+    created = generate_queues(db, day=BOOKED_DAY, lawyer_id=a)
+    db.commit()
+
+    assert [(e.token_number, e.client_id) for e in created] == [(3, c3)]
+    entries, counters = _queues(db, [a])
+    assert [token for _, token, _ in entries] == [1, 2, 3]
+    assert counters == {a: 3}
@@ -0,0 +1,22 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.modules.queue.events import broker
+from app.routers import token_queue
+
+
+def test_failed_snapshot_drops_the_subscription(monkeypatch):
+    def broken_snapshot(lawyer_id, day):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(token_queue, "_waiting_snapshot", broken_snapshot)
+    day = date(2091, 1, 2)
+
+    response = TestClient(app, raise_server_exceptions=False).get(
+        "/token-queue/stream", params={"lawyer_id": 987654, "date": day.isoformat()}
+    )
+
+    assert response.status_code == 500
+    assert broker.subscriber_count(987654, day) == 0
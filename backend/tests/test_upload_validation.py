@@ -0,0 +1,117 @@
+"""Upload validation verdicts: MIME sniffing, the stub scanner and the clamd
+INSTREAM client (against a minimal in-process clamd)."""
+
+import os
+import socket
+import struct
+import threading
+
+import pytest
+
+from app.modules.storage.validate import (
+    VERDICT_AVAILABLE,
+    VERDICT_QUARANTINED,
+    ScanError,
+    sniff_mime,
+    validate_file,
+)
+
+EICAR = rb"X5O!P%@AP[4\PZX54(P^)7CC)7}$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*"
+
+
+def _file(tmp_path, name: str, data: bytes) -> str:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "head, mime",
+    [
+        (b"%PDF-1.7\n", "application/pdf"),
+        (b"\x89PNG\r\n\x1a\n....", "image/png"),
+        (b"RIFF\x10\x00\x00\x00WEBPVP8 ", "image/webp"),
+        (b"PK\x03\x04\x14\x00", "application/zip"),
+        (b"MZ\x90\x00", "application/x-msdownload"),
+        ("Übereinkunft".encode("utf-8"), "text/plain"),
+        (b"\x00\x01\x02\x03", None),
+    ],
+)
+def test_sniff_mime(head, mime):
+    assert sniff_mime(head) == mime
+
+
+def test_clean_pdf_is_available(tmp_path):
+    verdict = validate_file(_file(tmp_path, "a.pdf", b"%PDF-1.4 body"), ".pdf", "stub")
+    assert verdict.status == VERDICT_AVAILABLE
+    assert verdict.mime_type == "application/pdf"
+
+
+def test_extension_mismatch_is_quarantined(tmp_path):
+    verdict = validate_file(_file(tmp_path, "a.pdf", b"\x89PNG\r\n\x1a\nxxxx"), ".pdf", "stub")
+    assert verdict.status == VERDICT_QUARANTINED
+    assert ".pdf" in verdict.detail
+
+
+def test_executable_is_quarantined_whatever_the_extension(tmp_path):
+    verdict = validate_file(_file(tmp_path, "a.bin", b"MZ\x90\x00" + bytes(64)), ".bin", "none")
+    assert verdict.status == VERDICT_QUARANTINED
+
+
+@pytest.mark.parametrize("name", ["a.html", "a.svg", "a.js", "noext"])
+def test_unknown_extension_is_quarantined_even_as_plain_text(tmp_path, name):
+    ext = os.path.splitext(name)[1]
+    verdict = validate_file(_file(tmp_path, name, b"<script>alert(1)</script>"), ext, "none")
+    assert verdict.status == VERDICT_QUARANTINED
+
+
+def test_stub_scanner_flags_eicar_across_chunks(tmp_path):
+    # marker straddles the 64 KiB read boundary
+    data = b"a" * (64 * 1024 - 20) + EICAR
+    verdict = validate_file(_file(tmp_path, "a.txt", data), ".txt", "stub")
+    assert verdict.status == VERDICT_QUARANTINED
+    assert "Eicar" in verdict.detail
+
+
+@pytest.fixture
+def clamd():
+    """Accepts one INSTREAM session per connection; flags streams containing EICAR."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                f = conn.makefile("rb")
+                assert f.read(10) == b"zINSTREAM\x00"
+                body = b""
+                while size := struct.unpack("!L", f.read(4))[0]:
+                    body += f.read(size)
+                reply = b"stream: Eicar-Test-Signature FOUND\x00" if b"EICAR" in body else b"stream: OK\x00"
+                conn.sendall(reply)
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield f"tcp://127.0.0.1:{server.getsockname()[1]}"
+    server.close()
+
+
+def test_clamav_clean_and_infected(tmp_path, clamd):
+    clean = validate_file(_file(tmp_path, "a.txt", b"hello"), ".txt", "clamav", clamd)
+    infected = validate_file(_file(tmp_path, "b.txt", EICAR), ".txt", "clamav", clamd)
+
+    assert clean.status == VERDICT_AVAILABLE
+    assert infected.status == VERDICT_QUARANTINED
+    assert infected.detail == "Malware detected: Eicar-Test-Signature"
+
+
+def test_clamav_unreachable_raises(tmp_path):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]  # nothing listens here once closed
+    with pytest.raises(ScanError):
+        validate_file(_file(tmp_path, "a.txt", b"hello"), ".txt", "clamav", f"tcp://127.0.0.1:{port}")
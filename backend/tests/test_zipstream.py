@@ -0,0 +1,33 @@
+import io
+import zipfile
+
+from app.modules.storage.backends import LocalStorage
+from app.modules.storage.zipstream import MISSING_MANIFEST, stream_zip, unique_arcnames
+
+
+def test_arcnames_are_unique_ignoring_case():
+    names = unique_arcnames(["a.pdf", "A.pdf", "a (2).pdf", "dir/b.txt", "B.TXT", ""])
+    assert names == ["a.pdf", "A (2).pdf", "a (2) (2).pdf", "b.txt", "B (2).TXT", "file"]
+    assert len({n.casefold() for n in names}) == len(names)
+
+
+def test_missing_files_are_listed_in_a_manifest(tmp_path, caplog):
+    storage = LocalStorage(root=str(tmp_path))
+    (tmp_path / "here.txt").write_bytes(b"hello")
+    entries = [("here.txt", "here.txt"), ("gone.pdf", "gone.pdf"), ("missing_files.TXT", "also-gone")]
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(stream_zip(storage, entries))))
+
+    assert archive.read("here.txt") == b"hello"
+    manifest = [n for n in archive.namelist() if n.startswith("MISSING_FILES")]
+    assert manifest == [MISSING_MANIFEST.replace(".txt", " (2).txt")]
+    assert archive.read(manifest[0]).decode().splitlines()[1:] == ["gone.pdf", "missing_files.TXT"]
+    assert "gone.pdf" in caplog.text
+
+
+def test_no_manifest_when_everything_is_there(tmp_path):
+    storage = LocalStorage(root=str(tmp_path))
+    (tmp_path / "a").write_bytes(b"1")
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(stream_zip(storage, [("a.pdf", "a")]))))
+    assert archive.namelist() == ["a.pdf"]
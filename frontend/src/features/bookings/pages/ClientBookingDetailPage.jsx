@@ -5,7 +5,7 @@ import {
   getLawyerIdByUser,
   getLawyerServicePackages,
 } from "../../../services/bookings";
-import { listDocuments } from "../../documents/services/documents.service";
+import { listDocuments, openFile } from "../../documents/services/documents.service";
 import { getIntakeByBooking, getIntakeByCase } from "../../intake/services/intake.service";
 import api from "../../../services/api";
 
@@ -18,8 +18,6 @@ const statusStyles = {
   rejected: "bg-red-900/30 text-red-200 border border-red-700/60",
 };
 
-const API_BASE = import.meta.env.VITE_API_BASE_URL || "http://127.0.0.1:8000";
-
 const formatDateTime = (value) => {
   if (!value) return "-";
   try {
@@ -338,7 +336,6 @@ export default function ClientBookingDetailPage() {
 
       <div className="grid grid-cols-1 md:grid-cols-2 gap-3">
         {docs.slice(0, 4).map((doc) => {
-          const fileUrl = `${API_BASE}${doc.file_path?.startsWith("/") ? "" : "/"}${doc.file_path || ""}`;
           const fileName = doc.file_path?.split("/").pop() || doc.original_name || doc.original_filename || "file";
 
           return (
@@ -351,14 +348,14 @@ export default function ClientBookingDetailPage() {
                 <div className="text-xs text-slate-400 truncate">{fileName} • #{doc.id}</div>
               </div>
 
-              <a
-                href={fileUrl}
-                target="_blank"
-                rel="noreferrer"
-                className="shrink-0 px-3 py-1.5 rounded-lg bg-emerald-600 hover:bg-emerald-700 text-white text-sm font-medium"
+              <button
+                type="button"
+                onClick={() => openFile(doc.download_url).catch(() => {})}
+                disabled={!doc.download_url}
+                className="shrink-0 px-3 py-1.5 rounded-lg bg-emerald-600 hover:bg-emerald-700 disabled:opacity-50 text-white text-sm font-medium"
               >
                 Open
-              </a>
+              </button>
             </div>
           );
         })}
@@ -8,6 +8,8 @@ import {
 
 export default function LawyerCaseFeedPage() {
   const [cases, setCases] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [requestsLoading, setRequestsLoading] = useState(true);
   const [error, setError] = useState("");
@@ -20,24 +22,30 @@ export default function LawyerCaseFeedPage() {
 
   const normalizeStatus = (value) => String(value || "").toUpperCase();
 
-  const loadCases = async () => {
-    setLoading(true);
+  // The feed already leaves out cases this lawyer has requested.
+  const loadCases = async (cursor = null) => {
+    if (cursor) setLoadingMore(true);
+    else setLoading(true);
     setError("");
     try {
       const data = await getCaseFeed({
         district: filters.district || undefined,
         category: filters.category || undefined,
+        cursor: cursor || undefined,
       });
-      setCases(data || []);
+      const items = data?.items || [];
+      setCases((prev) => (cursor ? [...prev, ...items] : items));
+      setNextCursor(data?.next_cursor ?? null);
     } catch (err) {
       const message =
         err?.response?.data?.detail ||
         err?.response?.data?.message ||
         "Failed to load cases.";
       setError(message);
-      setCases([]);
+      if (!cursor) setCases([]);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -246,6 +254,16 @@ export default function LawyerCaseFeedPage() {
             ))}
           </div>
         )}
+
+        {!loading && nextCursor && (
+          <button
+            onClick={() => loadCases(nextCursor)}
+            disabled={loadingMore}
+            className="px-4 py-2 rounded-lg bg-slate-800 border border-slate-700 hover:bg-slate-700 text-sm font-semibold"
+          >
+            {loadingMore ? "Loading…" : "Load more"}
+          </button>
+        )}
       </div>
     </div>
   );
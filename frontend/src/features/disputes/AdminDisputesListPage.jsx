@@ -5,16 +5,21 @@ import { adminListDisputes } from "../../services/disputes";
 export default function AdminDisputesListPage() {
   const [status, setStatus] = useState("PENDING");
   const [items, setItems] = useState([]);
+  const [counts, setCounts] = useState({});
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [err, setErr] = useState("");
   const navigate = useNavigate();
 
-  const load = async () => {
+  const load = async (cursor = null) => {
     setLoading(true);
     setErr("");
     try {
-      const res = await adminListDisputes(status);
-      setItems(res.data || []);
+      const res = await adminListDisputes(status, cursor ? { cursor } : {});
+      const page = res.data || {};
+      setItems((prev) => (cursor ? [...prev, ...(page.items || [])] : page.items || []));
+      setCounts(page.counts || {});
+      setNextCursor(page.next_cursor ?? null);
     } catch (e) {
       setErr(e?.response?.data?.detail || e.message || "Failed to load disputes");
     } finally {
@@ -36,20 +41,20 @@ export default function AdminDisputesListPage() {
           className={`px-3 py-2 rounded ${status === "PENDING" ? "bg-white/10" : "bg-transparent border border-white/10"}`}
           onClick={() => setStatus("PENDING")}
         >
-          Pending
+          Pending{counts.PENDING != null ? ` (${counts.PENDING})` : ""}
         </button>
         <button
           className={`px-3 py-2 rounded ${status === "RESOLVED" ? "bg-white/10" : "bg-transparent border border-white/10"}`}
           onClick={() => setStatus("RESOLVED")}
         >
-          Resolved
+          Resolved{counts.RESOLVED != null ? ` (${counts.RESOLVED})` : ""}
         </button>
-        <button className="px-3 py-2 rounded border border-white/10" onClick={load}>
+        <button className="px-3 py-2 rounded border border-white/10" onClick={() => load()}>
           Refresh
         </button>
       </div>
 
-      {loading && <div className="opacity-70">Loading…</div>}
+      {loading && items.length === 0 && <div className="opacity-70">Loading…</div>}
       {err && <div className="p-3 rounded bg-red-500/10 border border-red-500/30 text-red-200">{err}</div>}
 
       {!loading && !err && items.length === 0 && (
@@ -70,9 +75,24 @@ export default function AdminDisputesListPage() {
               <div className="text-xs px-2 py-1 rounded bg-white/10">{d.status}</div>
             </div>
             <div className="text-sm opacity-70 mt-1 line-clamp-2">{d.description}</div>
+            <div className="text-xs opacity-60 mt-2">
+              {d.client_name || `Client #${d.client_id}`}
+              {d.booking_id ? ` · Booking #${d.booking_id}` : ""}
+              {d.lawyer_name ? ` · ${d.lawyer_name}` : ""}
+            </div>
           </button>
         ))}
       </div>
+
+      {nextCursor && (
+        <button
+          className="mt-4 px-3 py-2 rounded border border-white/10"
+          disabled={loading}
+          onClick={() => load(nextCursor)}
+        >
+          {loading ? "Loading…" : "Load more"}
+        </button>
+      )}
     </div>
   );
 }
@@ -4,13 +4,13 @@ import { Link, useLocation, useParams } from "react-router-dom";
 import {
   createDocumentComment,
   deleteDocument,
+  fetchFileUrl,
   listDocumentComments,
   listDocuments,
+  openFile,
 } from "../services/documents.service";
 import { getRole } from "../../../services/auth";
 
-const API_BASE = import.meta.env.VITE_API_BASE_URL || "http://127.0.0.1:8000";
-
 const formatDateTime = (value) => {
   if (!value) return "-";
   try {
@@ -62,6 +62,7 @@ export default function DocumentsList() {
   const [commentLoading, setCommentLoading] = useState(false);
   const [commentError, setCommentError] = useState("");
   const [commentSaving, setCommentSaving] = useState(false);
+  const [selectedFileUrl, setSelectedFileUrl] = useState("");
 
   const role = useMemo(
     () => (getRole() || localStorage.getItem("role") || "").toLowerCase(),
@@ -109,6 +110,26 @@ export default function DocumentsList() {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [bookingIdNum]);
 
+  // files come from an authorised route, so the preview is an object URL
+  useEffect(() => {
+    let url = "";
+    let cancelled = false;
+    setSelectedFileUrl("");
+    if (selectedDoc?.download_url) {
+      fetchFileUrl(selectedDoc.download_url)
+        .then((u) => {
+          url = u;
+          if (cancelled) URL.revokeObjectURL(u);
+          else setSelectedFileUrl(u);
+        })
+        .catch(() => {});
+    }
+    return () => {
+      cancelled = true;
+      if (url.startsWith("blob:")) URL.revokeObjectURL(url);
+    };
+  }, [selectedDoc?.id, selectedDoc?.download_url]);
+
   useEffect(() => {
     const fetchComments = async () => {
       if (!selectedDoc?.id) return;
@@ -202,8 +223,6 @@ export default function DocumentsList() {
   };
 
   const renderDocCard = (doc) => {
-    const fileUrl = `${API_BASE}${doc.file_path?.startsWith("/") ? "" : "/"}${doc.file_path || ""}`;
-
     const statusKey = doc.latest_comment?.comment_text
       ? getStatusFromComment(doc.latest_comment.comment_text)
       : "new";
@@ -256,25 +275,29 @@ export default function DocumentsList() {
         </div>
 
         <div className="mt-3 flex items-center gap-3 text-sm">
-          <a
-            href={fileUrl}
-            onClick={(e) => e.stopPropagation()}
-            target="_blank"
-            rel="noreferrer"
-            className="text-amber-300 hover:text-amber-200"
-          >
-            Open file
-          </a>
+          {doc.download_url ? (
+            <a
+              href={doc.download_url}
+              onClick={(e) => {
+                e.preventDefault();
+                e.stopPropagation();
+                openFile(doc.download_url).catch(() => {});
+              }}
+              className="text-amber-300 hover:text-amber-200"
+            >
+              Open file
+            </a>
+          ) : (
+            <span className="text-slate-500">
+              {doc.scan_status === "quarantined" ? "File quarantined" : "Scanning file…"}
+            </span>
+          )}
           <span className="text-slate-500">ID #{doc.id}</span>
         </div>
       </button>
     );
   };
 
-  const selectedFileUrl = selectedDoc
-    ? `${API_BASE}${selectedDoc.file_path?.startsWith("/") ? "" : "/"}${selectedDoc.file_path || ""}`
-    : "";
-
   return (
     <div className="min-h-screen bg-slate-950 text-white">
       <div className="max-w-6xl mx-auto px-4 py-8 space-y-6">
@@ -55,3 +55,26 @@ export const createDocumentComment = (docId, commentText) => {
     comment_text: (commentText || "").trim(),
   });
 };
+
+// FILES: download_url points at an authorised route, so fetch it with the auth
+// header and hand back an object URL (revoke it when done). Presigned object
+// store URLs are absolute and already carry their own signature.
+export const fetchFileUrl = async (downloadUrl) => {
+  if (!downloadUrl) return "";
+  if (/^https?:\/\//i.test(downloadUrl)) return downloadUrl;
+  const res = await api.get(downloadUrl, { responseType: "blob" });
+  return URL.createObjectURL(res.data);
+};
+
+// Open a file in a new tab; the tab is opened first so popup blockers allow it.
+export const openFile = async (downloadUrl) => {
+  const tab = window.open("", "_blank");
+  try {
+    const url = await fetchFileUrl(downloadUrl);
+    if (tab) tab.location.href = url;
+    if (url.startsWith("blob:")) setTimeout(() => URL.revokeObjectURL(url), 60_000);
+  } catch (e) {
+    if (tab) tab.close();
+    throw e;
+  }
+};
@@ -3,9 +3,12 @@ import { useNavigate } from "react-router-dom";
 import api from "../../services/api";
 import "./AdminDashboard.css";
 
+const LAWYERS_PER_PAGE = 20;
+
 export default function AdminDashboard() {
   const navigate = useNavigate();
   const [data, setData] = useState(null);
+  const [page, setPage] = useState(1);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
 
@@ -13,7 +16,9 @@ export default function AdminDashboard() {
     setLoading(true);
     setError("");
     try {
-      const res = await api.get("/api/admin/overview");
+      const res = await api.get("/api/admin/overview", {
+        params: { page, limit: LAWYERS_PER_PAGE },
+      });
       setData(res.data);
     } catch (err) {
       const status = err?.response?.status;
@@ -33,7 +38,7 @@ export default function AdminDashboard() {
   useEffect(() => {
     load();
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []);
+  }, [page]);
 
   const metrics = useMemo(() => {
     if (!data) {
@@ -56,6 +61,7 @@ export default function AdminDashboard() {
 
   const recentBookings = data?.recent_bookings || [];
   const lawyers = data?.lawyers || [];
+  const lawyerPages = Math.max(1, Math.ceil((data?.total_lawyers || 0) / LAWYERS_PER_PAGE));
 
   return (
     <div className="admin-dashboard-page">
@@ -193,6 +199,29 @@ export default function AdminDashboard() {
                       )}
                     </div>
                   ))}
+                {lawyerPages > 1 && (
+                  <div className="lawyers-pager">
+                    <button
+                      type="button"
+                      className="btn btn-secondary"
+                      disabled={loading || page <= 1}
+                      onClick={() => setPage((p) => p - 1)}
+                    >
+                      ← Previous
+                    </button>
+                    <span className="lawyers-pager-label">
+                      Page {page} of {lawyerPages}
+                    </span>
+                    <button
+                      type="button"
+                      className="btn btn-secondary"
+                      disabled={loading || page >= lawyerPages}
+                      onClick={() => setPage((p) => p + 1)}
+                    >
+                      Next →
+                    </button>
+                  </div>
+                )}
               </div>
             </div>
           </section>
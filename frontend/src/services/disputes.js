@@ -16,9 +16,10 @@ export const getDisputeById = (id) => api.get(`/api/disputes/${id}`);
 // Update dispute
 export const updateDispute = (id, payload) => api.patch(`/api/disputes/${id}`, payload);
 
-// Admin: List disputes with optional status filter
-export const adminListDisputes = (status = "PENDING") =>
-  api.get("/api/admin/disputes", { params: { status } });
+// Admin: One page of disputes ({ items, next_cursor, counts }).
+// params: status, client_id, created_from, created_to, cursor, limit
+export const adminListDisputes = (status = "PENDING", params = {}) =>
+  api.get("/api/admin/disputes", { params: { status, ...params } });
 
 // Admin: Resolve/update dispute (admin version)
 export const adminUpdateDispute = (id, payload) =>